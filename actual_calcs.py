@@ -72,3 +72,17 @@ med_int_no_overpay['Total Interest'] + 299
 med_int_with_overpay['Total Interest'] + 299
 
 
+
+# +
+# Both products crossed with both payment levels, with the fees added to the interest
+from money_tools.scenarios import evaluate_grid
+
+options = evaluate_grid(270_000,
+                        rates=[0.0163, 0.0179],
+                        monthly_payments=[1167.02, 1367.02],
+                        fees=[999, 299],
+                        start_date='2019-07-01',
+                        end_date='2022-06-30',
+                        payment_day=7
+                       )
+options[['Rate', 'Fee', 'Monthly Payment', 'Total Interest', 'Total Interest And Fees']]
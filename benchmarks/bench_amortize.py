@@ -0,0 +1,56 @@
+"""
+Single rate amortization, through each engine and each public entry point.
+"""
+import time
+
+from money_tools import Rate, amortize_table
+from money_tools.engine import amortize_arrays, amortize_totals
+
+from .common import START_BALANCE, START_DATE, TERMS, end_date, monthly_payment
+
+
+class Amortize:
+    params = (TERMS, ['exact', 'closed_form', 'pence'])
+    param_names = ['term', 'engine']
+
+    def setup(self, term, engine):
+        self.args = (START_BALANCE, 0.03, monthly_payment(term), START_DATE, end_date(term))
+
+    def time_amortize_arrays(self, term, engine):
+        amortize_arrays(*self.args, engine=engine)
+
+    def time_amortize_totals(self, term, engine):
+        amortize_totals(*self.args, engine=engine)
+
+    def time_amortize_records(self, term, engine):
+        amortize_table(*self.args, engine=engine, as_array=True)
+
+    def time_amortize_table(self, term, engine):
+        amortize_table(*self.args, engine=engine)
+
+    def peakmem_amortize_table(self, term, engine):
+        amortize_table(*self.args, engine=engine)
+
+    def track_days_per_second(self, term, engine):
+        start = time.perf_counter()
+        days, _ = amortize_arrays(*self.args, engine=engine)
+        return len(days) / (time.perf_counter() - start)
+    track_days_per_second.unit = 'days/s'
+
+
+class RateInit:
+    params = TERMS
+    param_names = ['term']
+
+    def setup(self, term):
+        self.args = (START_BALANCE, 0.03, monthly_payment(term))
+        self.kwargs = dict(start_date=START_DATE, end_date=end_date(term))
+
+    def time_rate_init(self, term):
+        Rate(*self.args, **self.kwargs)
+
+    def time_rate_totals(self, term):
+        Rate(*self.args, **self.kwargs).totals
+
+    def time_rate_schedule(self, term):
+        Rate(*self.args, **self.kwargs).schedule
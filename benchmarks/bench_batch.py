@@ -0,0 +1,59 @@
+"""
+Many loans at once, through the batch engines and the portfolio engine.
+"""
+import time
+
+import numpy as np
+
+from money_tools.calendar_index import day_range, payment_mask
+from money_tools.engine import amortize_batch
+from money_tools.portfolio import Portfolio
+
+from .common import BATCH_SIZES, START_BALANCE, START_DATE, end_date, monthly_payment
+
+TERM = 5
+
+
+class Batch:
+    params = (BATCH_SIZES, ['exact', 'closed_form', 'pence'])
+    param_names = ['n_loans', 'engine']
+
+    def setup(self, n_loans, engine):
+        rng = np.random.default_rng(0)
+        self.principal = START_BALANCE * rng.uniform(0.5, 1.5, n_loans)
+        self.rates = rng.uniform(0.01, 0.06, n_loans)
+        self.payments = monthly_payment(TERM) * rng.uniform(0.8, 1.2, n_loans)
+        self.is_payment = payment_mask(day_range(START_DATE, end_date(TERM)), 1)
+
+    def time_amortize_batch(self, n_loans, engine):
+        amortize_batch(self.principal, self.rates, self.payments, self.is_payment, engine=engine)
+
+    def peakmem_amortize_batch(self, n_loans, engine):
+        amortize_batch(self.principal, self.rates, self.payments, self.is_payment, engine=engine)
+
+    def track_loans_per_second(self, n_loans, engine):
+        start = time.perf_counter()
+        amortize_batch(self.principal, self.rates, self.payments, self.is_payment, engine=engine)
+        return n_loans / (time.perf_counter() - start)
+    track_loans_per_second.unit = 'loans/s'
+
+
+class PortfolioBook:
+    params = BATCH_SIZES
+    param_names = ['n_loans']
+
+    def setup(self, n_loans):
+        rng = np.random.default_rng(0)
+        switch = np.datetime64(end_date(2)) + 1
+        self.args = (START_BALANCE * rng.uniform(0.5, 1.5, n_loans),
+                     np.column_stack([rng.uniform(0.01, 0.03, n_loans), rng.uniform(0.03, 0.06, n_loans)]),
+                     monthly_payment(TERM),
+                     np.array([START_DATE, switch], dtype='datetime64[D]'),
+                     np.array([switch - 1, end_date(TERM)], dtype='datetime64[D]'),
+                     rng.integers(1, 29, (n_loans, 2)))
+
+    def time_portfolio(self, n_loans):
+        Portfolio(*self.args).calc_results()
+
+    def peakmem_portfolio(self, n_loans):
+        Portfolio(*self.args).calc_results()
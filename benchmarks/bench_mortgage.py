@@ -0,0 +1,55 @@
+"""
+Mortgage construction, aggregation and payment summaries over terms and numbers of rates.
+"""
+import time
+
+from money_tools import Mortgage
+
+from .common import N_RATES, START_BALANCE, START_DATE, TERMS, rates_configs
+
+
+class MortgageInit:
+    params = (TERMS, N_RATES)
+    param_names = ['term', 'n_rates']
+
+    def setup(self, term, n_rates):
+        self.rates_configs = rates_configs(term, n_rates)
+
+    def time_mortgage_init(self, term, n_rates):
+        Mortgage(START_BALANCE, self.rates_configs, rate_cache=None)
+
+    def time_mortgage_schedule(self, term, n_rates):
+        Mortgage(START_BALANCE, self.rates_configs, rate_cache=None).schedule
+
+    def peakmem_mortgage_schedule(self, term, n_rates):
+        Mortgage(START_BALANCE, self.rates_configs, rate_cache=None).schedule
+
+
+class Aggregation:
+    params = (TERMS, N_RATES)
+    param_names = ['term', 'n_rates']
+
+    def setup(self, term, n_rates):
+        self.mortgage = Mortgage(START_BALANCE, rates_configs(term, n_rates), rate_cache=None)
+        self.mortgage.schedule
+        self.mortgage._summary_index
+        self.years = [(START_DATE.replace(year=START_DATE.year + i), START_DATE.replace(year=START_DATE.year + i + 1))
+                      for i in range(term)]
+
+    def time_schedule_monthly(self, term, n_rates):
+        self.mortgage.calc_schedule_monthly()
+
+    def time_schedule_yearly(self, term, n_rates):
+        self.mortgage.calc_schedule_yearly()
+
+    def time_payment_summary(self, term, n_rates):
+        self.mortgage.payment_summary()
+
+    def time_payment_summaries(self, term, n_rates):
+        self.mortgage.payment_summaries(self.years)
+
+    def track_summaries_per_second(self, term, n_rates):
+        start = time.perf_counter()
+        self.mortgage.payment_summaries(self.years)
+        return len(self.years) / (time.perf_counter() - start)
+    track_summaries_per_second.unit = 'summaries/s'
@@ -0,0 +1,41 @@
+"""
+Loans shared by the benchmarks.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+START_DATE = date(2020, 1, 1)
+START_BALANCE = 250_000
+
+# Parameter grids, kept the same across commits so results stay comparable
+TERMS = [1, 5, 25, 40]
+N_RATES = [1, 3, 50, 300]
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000]
+
+
+def end_date(term: int) -> date:
+    """Last day of a term of whole years from START_DATE"""
+    return START_DATE.replace(year=START_DATE.year + term) - timedelta(days=1)
+
+
+def monthly_payment(term: int, annual_interest_rate: float=0.03) -> float:
+    """Annuity payment clearing START_BALANCE over the term"""
+    r = annual_interest_rate / 12
+    n = 12 * term
+    return round(START_BALANCE * r / (1 - (1 + r) ** -n), 2)
+
+
+def rates_configs(term: int, n_rates: int) -> list:
+    """Rates of a mortgage over the term, split into n_rates rates of near equal length"""
+    n_days = (end_date(term) - START_DATE).days + 1
+    bounds = np.linspace(0, n_days, n_rates + 1).round().astype(int)
+    payment = monthly_payment(term)
+    return [{
+        "rate": 0.02 + 0.01 * (i % 3),
+        "monthly_payment": payment,
+        "start_date": START_DATE + timedelta(days=int(first)),
+        "term": None,
+        "end_date": START_DATE + timedelta(days=int(last) - 1),
+        "payment_day": 1,
+    } for i, (first, last) in enumerate(zip(bounds[:-1], bounds[1:]))]
@@ -1,6 +1,29 @@
 """
 Money tools
+
+``Rate``, ``Mortgage`` and ``amortize_table`` are imported on first use, so the array
+engines in ``money_tools.engine`` can be used without importing pandas.
 """
+import importlib
+
+__version__ = '0.1dev'
+
+__all__ = ['Rate', 'amortize_table', 'Mortgage']
+
+_LAZY_ATTRIBUTES = {
+    'Rate': '.rate',
+    'amortize_table': '.rate',
+    'Mortgage': '.mortgage',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
-from .rate import Rate, amortize_table
-from .mortgage import Mortgage
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
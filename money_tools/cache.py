@@ -0,0 +1,117 @@
+"""
+Least recently used cache of computed Rates.
+"""
+import threading
+from collections import OrderedDict
+
+from .rate import Rate, _parse_date_range
+
+
+def _events_key(events) -> tuple:
+    """Hashable form of a list of event dicts"""
+    return tuple(tuple(sorted((key, str(value)) for key, value in event.items())) for event in events or ())
+
+
+class RateCache(object):
+    """
+    Bounded LRU cache of Rate objects, keyed by the inputs that determine their schedules.
+
+    Cached rates are shared between every Mortgage that asks for the same inputs, so
+    their schedules should be treated as read-only. Lookups and updates hold a lock, so
+    a cache can be shared between threads.
+    """
+
+    def __init__(self, maxsize: int=128):
+        """Create an empty cache.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum number of rates kept, the least recently used rate is evicted
+            when it is exceeded, by default 128. 0 disables caching.
+        """
+        self._rates = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return 'RateCache(maxsize={}, size={}, hits={}, misses={})'\
+            .format(self.maxsize, len(self), self.hits, self.misses)
+
+    def __len__(self):
+        return len(self._rates)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int):
+        if maxsize < 0:
+            raise ValueError('maxsize cannot be negative')
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def _evict(self):
+        """Drop the least recently used rates past maxsize, with the lock held"""
+        while len(self._rates) > self._maxsize:
+            self._rates.popitem(last=False)
+            self.evictions += 1
+
+    def get_rate(self, start_balance, annual_interest_rate, monthly_payment, start_date, term=None,
+                 end_date=None, payment_day=1, engine='exact', interest_calculated='daily', events=None,
+                 day_count='ACT/365F') -> Rate:
+        """Return the cached Rate for these inputs, constructing and caching it on a miss.
+
+        Takes the same arguments as ``Rate``.
+        """
+        start, end = _parse_date_range(start_date, term, end_date)
+        key = (start_balance, annual_interest_rate, monthly_payment, start.toordinal(), end.toordinal(),
+               payment_day, engine, interest_calculated, _events_key(events), day_count)
+
+        with self._lock:
+            rate = self._rates.get(key)
+            if rate is not None:
+                self.hits += 1
+                self._rates.move_to_end(key)
+                return rate
+            self.misses += 1
+
+        # Built outside the lock, a thread racing to build the same rate only costs a duplicate
+        rate = Rate(start_balance, annual_interest_rate, monthly_payment, start_date=start_date, term=term,
+                    end_date=end_date, payment_day=payment_day, engine=engine,
+                    interest_calculated=interest_calculated, events=events, day_count=day_count)
+        with self._lock:
+            if self._maxsize:
+                rate = self._rates.setdefault(key, rate)
+                self._rates.move_to_end(key)
+                self._evict()
+        return rate
+
+    def stats(self) -> dict:
+        """Hit, miss and eviction counts, with the current and maximum size"""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self), 'maxsize': self.maxsize}
+
+    def clear(self):
+        """Remove every cached rate and reset the statistics"""
+        with self._lock:
+            self._rates.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+# Shared by every Mortgage unless given a different cache
+default_rate_cache = RateCache()
@@ -0,0 +1,251 @@
+"""
+Calendar of days with their month and year boundaries, shared by every rate.
+
+A process-wide ``CalendarIndex`` of whole calendar years is built the first time a
+span of days is needed, and only rebuilt when a span reaches outside it. Its lookup
+tables, the day of the month, the month ends, the payment days and the day counts,
+are each computed once and then sliced for every rate, mortgage and scenario, so
+none of them are recalculated per schedule.
+"""
+import threading
+import numpy as np
+from functools import cached_property
+
+
+# Day count conventions, the share of a year each day accrues interest for
+DAY_COUNTS = ('ACT/365F', 'ACT/ACT', '30/360')
+
+# Payment days past the end of a short month are either skipped, or taken on its last day
+SHORT_MONTHS = ('skip', 'last_day')
+
+
+def day_range(start_date, end_date) -> np.ndarray:
+    """Array of datetime64[D] days between start_date and end_date inclusive."""
+    start = np.datetime64(start_date, 'D')
+    end = np.datetime64(end_date, 'D')
+    return np.arange(start, end + np.timedelta64(1, 'D'), dtype='datetime64[D]')
+
+
+def day_of_month(days: np.ndarray) -> np.ndarray:
+    """Day of the month (1-31) of each datetime64[D] day."""
+    return (days - days.astype('datetime64[M]')).astype(np.int64) + 1
+
+
+def is_month_end(days: np.ndarray) -> np.ndarray:
+    """Boolean array flagging the days that are the last day of their month."""
+    return (days + np.timedelta64(1, 'D')).astype('datetime64[M]') != days.astype('datetime64[M]')
+
+
+def days_in_month(days: np.ndarray) -> np.ndarray:
+    """Number of days in the month of each datetime64[D] day."""
+    months = days.astype('datetime64[M]')
+    return ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(np.int64)
+
+
+def days_in_year(days: np.ndarray) -> np.ndarray:
+    """Number of days, 365 or 366, in the year of each datetime64[D] day."""
+    years = days.astype('datetime64[Y]')
+    return ((years + 1).astype('datetime64[D]') - years.astype('datetime64[D]')).astype(np.int64)
+
+
+def years_out(days: np.ndarray, start_day) -> np.ndarray:
+    """Whole years from start_day to each day, as ``relativedelta(day, start_day).years``.
+
+    Anniversaries of the 29th-31st fall on the last day of shorter months.
+    """
+    start_day = np.datetime64(start_day, 'D')
+    start_month = start_day.astype('datetime64[M]')
+    start_dom = (start_day - start_month.astype('datetime64[D]')).astype(np.int64)
+    month_of_year = start_month.astype(np.int64) % 12
+
+    years = days.astype('datetime64[Y]').astype(np.int64)
+    anniversary_month = (years * 12 + month_of_year).astype('datetime64[M]')
+    month_length = ((anniversary_month + 1).astype('datetime64[D]')
+                    - anniversary_month.astype('datetime64[D]')).astype(np.int64)
+    anniversary = anniversary_month.astype('datetime64[D]') + np.minimum(start_dom, month_length - 1)
+
+    elapsed = years - start_day.astype('datetime64[Y]').astype(np.int64)
+    return elapsed - (days < anniversary)
+
+
+def payment_mask(days: np.ndarray, payment_day: int, short_months: str='skip') -> np.ndarray:
+    """Boolean array flagging the days on which the monthly payment is taken.
+
+    With ``short_months='skip'`` a payment day of the 29th-31st is not taken in months
+    without that day, as a ``running_date.day == payment_day`` check gives. With
+    ``'last_day'`` it is taken on the last day of those months instead.
+    """
+    if short_months not in SHORT_MONTHS:
+        raise ValueError(f'Unknown short_months {short_months!r}, expected one of {SHORT_MONTHS}')
+    dom = day_of_month(days)
+    if short_months == 'skip':
+        return dom == payment_day
+    return dom == np.minimum(payment_day, days_in_month(days))
+
+
+def day_count_fractions(days: np.ndarray, convention: str='ACT/365F') -> tuple:
+    """Accrual days and year basis of each day under a day count convention.
+
+    Each day accrues ``accrual / basis`` of a year's interest: one day in 365 for
+    ``ACT/365F``, one in the length of its year for ``ACT/ACT``, and for ``30/360``
+    the days a 30 day month gives it out of 360, so the 31st accrues nothing and the
+    last day of February makes up the month to 30.
+    """
+    if convention not in DAY_COUNTS:
+        raise ValueError(f'Unknown day_count {convention!r}, expected one of {DAY_COUNTS}')
+    if convention == 'ACT/365F':
+        return np.ones(len(days)), np.full(len(days), 365.0)
+    if convention == 'ACT/ACT':
+        return np.ones(len(days)), days_in_year(days).astype(np.float64)
+
+    # Every month counts as 30 days, a day each up to the 30th with short months made up on their last day
+    month_length = days_in_month(days)
+    accrual = (day_of_month(days) <= 30) + np.where(is_month_end(days), np.maximum(30 - month_length, 0), 0)
+    return accrual.astype(np.float64), np.full(len(days), 360.0)
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+class CalendarIndex(object):
+    """
+    Days of whole calendar years with lookup tables computed once on first use.
+
+    Tables are read-only, as they are shared by every window onto the index.
+    """
+
+    def __init__(self, first_year: int, last_year: int):
+        self.first_year = first_year
+        self.last_year = last_year
+        self.days = _read_only(day_range(f'{first_year:04d}-01-01', f'{last_year:04d}-12-31'))
+        self._payment_masks = {}
+        self._day_counts = {}
+
+    def __repr__(self):
+        return 'CalendarIndex(first_year={}, last_year={})'.format(self.first_year, self.last_year)
+
+    def __len__(self):
+        return len(self.days)
+
+    def covers(self, start_date, end_date) -> bool:
+        """Whether every day from start_date to end_date is in the index"""
+        return self.days[0] <= np.datetime64(start_date, 'D') and np.datetime64(end_date, 'D') <= self.days[-1]
+
+    @cached_property
+    def day_of_month(self) -> np.ndarray:
+        return _read_only(day_of_month(self.days))
+
+    @cached_property
+    def month_end(self) -> np.ndarray:
+        return _read_only(is_month_end(self.days))
+
+    @cached_property
+    def days_in_month(self) -> np.ndarray:
+        return _read_only(days_in_month(self.days))
+
+    def payment_mask(self, payment_day: int, short_months: str='skip') -> np.ndarray:
+        """Payment days of every day in the index, see ``payment_mask``"""
+        key = (payment_day, short_months)
+        mask = self._payment_masks.get(key)
+        if mask is None:
+            mask = self._payment_masks.setdefault(key, _read_only(payment_mask(self.days, payment_day,
+                                                                               short_months)))
+        return mask
+
+    def day_count(self, convention: str='ACT/365F') -> tuple:
+        """Accrual days and year basis of every day in the index, see ``day_count_fractions``"""
+        table = self._day_counts.get(convention)
+        if table is None:
+            table = self._day_counts.setdefault(
+                convention, tuple(_read_only(values) for values in day_count_fractions(self.days, convention)))
+        return table
+
+    def window(self, start_date, end_date) -> 'CalendarWindow':
+        """Window onto the days from start_date to end_date inclusive, which the index must cover"""
+        start = int((np.datetime64(start_date, 'D') - self.days[0]).astype(np.int64))
+        stop = int((np.datetime64(end_date, 'D') - self.days[0]).astype(np.int64)) + 1
+        return CalendarWindow(self, start, max(start, stop))
+
+
+class CalendarWindow(object):
+    """
+    Span of days in a ``CalendarIndex``, whose tables are views of the index's tables.
+    """
+
+    def __init__(self, index: CalendarIndex, start: int, stop: int):
+        self.index = index
+        self.start = start
+        self.stop = stop
+
+    def __repr__(self):
+        return 'CalendarWindow(start_date=\'{}\', days={})'.format(self.index.days[self.start], len(self))
+
+    def __len__(self):
+        return self.stop - self.start
+
+    @property
+    def days(self) -> np.ndarray:
+        return self.index.days[self.start:self.stop]
+
+    @property
+    def day_of_month(self) -> np.ndarray:
+        return self.index.day_of_month[self.start:self.stop]
+
+    @property
+    def month_end(self) -> np.ndarray:
+        return self.index.month_end[self.start:self.stop]
+
+    @property
+    def month_end_offsets(self) -> np.ndarray:
+        """Positions of the month end days within the window"""
+        return np.flatnonzero(self.month_end)
+
+    def payment_mask(self, payment_day: int, short_months: str='skip') -> np.ndarray:
+        return self.index.payment_mask(payment_day, short_months)[self.start:self.stop]
+
+    def payment_offsets(self, payment_day: int, short_months: str='skip') -> np.ndarray:
+        """Positions of the payment days within the window"""
+        return np.flatnonzero(self.payment_mask(payment_day, short_months))
+
+    def day_count(self, convention: str='ACT/365F') -> tuple:
+        return tuple(values[self.start:self.stop] for values in self.index.day_count(convention))
+
+    def years_out(self, start_day=None) -> np.ndarray:
+        """Whole years from start_day, by default the first day, to each day, see ``years_out``"""
+        return years_out(self.days, self.days[0] if start_day is None else start_day)
+
+    def anniversary_offsets(self, start_day=None) -> np.ndarray:
+        """Positions of the days that start each year after start_day, by default the first day"""
+        return np.flatnonzero(np.diff(self.years_out(start_day))) + 1
+
+    def positions(self, days: np.ndarray) -> np.ndarray:
+        """Positions within the window of days it covers, to look up any of its tables"""
+        return (np.asarray(days, dtype='datetime64[D]') - self.index.days[self.start]).astype(np.int64)
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def calendar_window(start_date, end_date) -> CalendarWindow:
+    """Window onto the process-wide calendar index from start_date to end_date inclusive.
+
+    The index is extended to whole calendar years covering the span the first time it
+    reaches outside it, keeping the years it already covered.
+    """
+    global _index
+    index = _index
+    last_day = max(np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D'))
+    if index is None or not index.covers(start_date, last_day):
+        with _lock:
+            index = _index
+            if index is None or not index.covers(start_date, last_day):
+                first_year = int(str(np.datetime64(start_date, 'Y')))
+                last_year = int(str(last_day.astype('datetime64[Y]')))
+                if index is not None:
+                    first_year = min(first_year, index.first_year)
+                    last_year = max(last_year, index.last_year)
+                index = _index = CalendarIndex(first_year, last_year)
+    return index.window(start_date, end_date)
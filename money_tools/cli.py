@@ -0,0 +1,125 @@
+"""
+``money-tools`` command line: quote JSON-lines mortgage requests in a batch, or serve them.
+
+    money-tools run requests.jsonl > quotes.jsonl
+    money-tools serve --port 8765
+
+See ``money_tools.service`` for the request and quote formats.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+
+from .engine import ENGINES
+from .parallel import bounded_map
+from .service import QuoteServer, parse_request, quote_batch, respond
+
+
+def _quote_lines(numbered_lines: list) -> list:
+    """Worker task, the JSON response of each ``(index, line)``, with the line's index added"""
+    parsed = [(index, *parse_request(line)) for index, line in numbered_lines]
+    valid = [(index, request) for index, request, error in parsed if error is None]
+    results = dict(zip((index for index, _ in valid), quote_batch([request for _, request in valid])))
+
+    responses = []
+    for index, request, error in parsed:
+        response = respond(request, (None, error) if error else results[index])
+        responses.append(dict(response, index=index))
+    return responses
+
+
+def run(lines, output, workers: int=None, chunksize: int=64, ordered: bool=True, engine: str=None) -> int:
+    """Write a JSON-lines response for each JSON-lines request, returning the number of failures.
+
+    Requests are read ``chunksize`` lines at a time and quoted across a bounded pool of
+    ``workers`` processes, so input is only read as fast as responses are written.
+    ``workers=1`` quotes in this process.
+    """
+    if chunksize < 1:
+        raise ValueError('chunksize must be at least 1')
+
+    numbered = ((index, line) for index, line in enumerate(lines) if line.strip())
+    if engine is not None:
+        numbered = ((index, _with_engine(line, engine)) for index, line in numbered)
+    chunks = iter(lambda: list(itertools.islice(numbered, chunksize)), [])
+
+    if workers == 1:
+        results = map(_quote_lines, chunks)
+    else:
+        results = bounded_map(_quote_lines, chunks, workers=workers, ordered=ordered)
+    failures = 0
+    for responses in results:
+        for response in responses:
+            failures += response['error'] is not None
+            output.write(json.dumps(response) + '\n')
+        output.flush()
+    return failures
+
+
+def _with_engine(line: str, engine: str) -> str:
+    """Request line with its engine defaulted to engine"""
+    request, error = parse_request(line)
+    if error or not isinstance(request, dict) or 'engine' in request:
+        return line
+    return json.dumps(dict(request, engine=engine))
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='money-tools', description='Quote mortgages from JSON-lines requests')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='quote requests from a file or stdin, writing JSON lines to stdout')
+    run_parser.add_argument('input', nargs='?', default='-', help='JSON-lines requests, - for stdin (default)')
+    run_parser.add_argument('-o', '--output', default='-', help='file to write, - for stdout (default)')
+    run_parser.add_argument('-w', '--workers', type=int, default=None,
+                            help='worker processes, 1 to quote in this process (default one per CPU)')
+    run_parser.add_argument('--chunksize', type=int, default=64, help='requests per worker task (default 64)')
+    run_parser.add_argument('--unordered', action='store_true', help='write responses as soon as they are ready')
+    run_parser.add_argument('--engine', choices=ENGINES, default=None,
+                            help='engine of requests that do not give one (default exact)')
+
+    serve_parser = commands.add_parser('serve', help='answer JSON-lines requests on a local socket')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default 127.0.0.1)')
+    serve_parser.add_argument('--port', type=int, default=8765, help='TCP port (default 8765)')
+    serve_parser.add_argument('--unix', default=None, help='unix socket path to listen on instead of TCP')
+    serve_parser.add_argument('--batch-window', type=float, default=0.005,
+                              help='seconds requests wait to batch with others (default 0.005)')
+    serve_parser.add_argument('--max-batch', type=int, default=1024, help='most requests per batch (default 1024)')
+    serve_parser.add_argument('-w', '--workers', type=int, default=None,
+                              help='worker processes batches are quoted in (default a thread)')
+    serve_parser.add_argument('--max-line', type=int, default=2 ** 23,
+                              help='longest request line in bytes (default 8 MiB)')
+    return parser
+
+
+def main(argv=None) -> int:
+    """Entry point of ``money-tools``, the exit status is 1 when any request of a run fails"""
+    args = _parser().parse_args(argv)
+
+    if args.command == 'run':
+        source = sys.stdin if args.input == '-' else open(args.input)
+        output = sys.stdout if args.output == '-' else open(args.output, 'w')
+        try:
+            failures = run(source, output, workers=args.workers, chunksize=args.chunksize,
+                           ordered=not args.unordered, engine=args.engine)
+        finally:
+            for f in (source, output):
+                if f not in (sys.stdin, sys.stdout):
+                    f.close()
+        return 1 if failures else 0
+
+    server = QuoteServer(batch_window=args.batch_window, max_batch=args.max_batch, workers=args.workers,
+                         max_line=args.max_line)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Compact in-memory form of a daily schedule, for holding many loans' schedules at once.
+"""
+import numpy as np
+
+from .engine import AMOUNT_COLUMNS, BEGIN, END, to_pence
+
+
+# Compact amount storage, and the dtype each holds the amounts as
+COMPACT_AMOUNTS = {
+    'pence': np.int64,
+    'float32': np.float32,
+}
+
+
+def validate_compact(compact: str):
+    """Check compact is None, for full schedules, or one of ``COMPACT_AMOUNTS``"""
+    if compact is not None and compact not in COMPACT_AMOUNTS:
+        raise ValueError(f'Unknown compact {compact!r}, expected None or one of {tuple(COMPACT_AMOUNTS)}')
+
+
+class CompactSchedule(object):
+    """
+    Daily schedule held as int32 day offsets and int64 pence or float32 amounts.
+
+    Of the ``schedule_arrays`` only what cannot be derived is kept. The dates are day
+    offsets from the first day, the Period restarts are kept in place of the Period
+    column, and the Begin Balance is only kept on the rows where it is not the previous
+    row's End Balance, as at the start of each rate. ``'pence'`` rounds every amount to
+    the penny, ``'float32'`` keeps about 7 significant figures.
+    """
+
+    def __init__(self, start_day, offsets: np.ndarray, amounts: np.ndarray, period_starts: np.ndarray,
+                 first_periods: np.ndarray, begin_rows: np.ndarray, begin_amounts: np.ndarray):
+        self.start_day = np.datetime64(start_day, 'D')
+        self.offsets = offsets
+        self.amounts = amounts
+        self.period_starts = period_starts
+        self.first_periods = first_periods
+        self.begin_rows = begin_rows
+        self.begin_amounts = begin_amounts
+
+    @classmethod
+    def from_arrays(cls, days: np.ndarray, periods: np.ndarray, amounts: np.ndarray, compact: str='pence'):
+        """Compact the ``(days, periods, amounts)`` arrays of ``Mortgage.schedule_arrays``"""
+        validate_compact(compact)
+        days = np.asarray(days).astype('datetime64[D]')
+        periods = np.asarray(periods)
+        start_day = days[0] if len(days) else np.datetime64(0, 'D')
+
+        if compact == 'pence':
+            stored = to_pence(np.asarray(amounts))
+        else:
+            stored = np.asarray(amounts).astype(COMPACT_AMOUNTS[compact])
+
+        # Rows starting a run of periods, and rows whose Begin Balance is not carried over
+        period_starts = np.flatnonzero(np.append(True, periods[1:] != periods[:-1] + 1)) if len(days) else \
+            np.empty(0, dtype=np.int64)
+        begin_rows = np.flatnonzero(np.append(True, stored[1:, BEGIN] != stored[:-1, END])) if len(days) else \
+            np.empty(0, dtype=np.int64)
+
+        return cls(start_day,
+                   (days - start_day).astype(np.int32),
+                   np.ascontiguousarray(np.delete(stored, BEGIN, axis=1)),
+                   period_starts.astype(np.int32),
+                   periods[period_starts].astype(np.int32),
+                   begin_rows.astype(np.int32),
+                   stored[begin_rows, BEGIN])
+
+    def __repr__(self):
+        return 'CompactSchedule(rows={}, dtype={}, nbytes={})'.format(len(self), self.amounts.dtype, self.nbytes)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays"""
+        return sum(array.nbytes for array in (self.offsets, self.amounts, self.period_starts, self.first_periods,
+                                              self.begin_rows, self.begin_amounts))
+
+    @property
+    def days(self) -> np.ndarray:
+        return self.start_day + self.offsets.astype('timedelta64[D]')
+
+    @property
+    def periods(self) -> np.ndarray:
+        rows = np.arange(len(self), dtype=np.int32)
+        run = np.searchsorted(self.period_starts, rows, side='right') - 1
+        return self.first_periods[run] + rows - self.period_starts[run]
+
+    @property
+    def amounts_float(self) -> np.ndarray:
+        """``(n_days, 5)`` float64 amounts, with the Begin Balance filled back in"""
+        amounts = np.empty((len(self), len(AMOUNT_COLUMNS)), dtype=np.float64)
+        amounts[:, BEGIN + 1:] = self.amounts
+        amounts[1:, BEGIN] = amounts[:-1, END]
+        amounts[self.begin_rows, BEGIN] = self.begin_amounts
+        if self.amounts.dtype == np.int64:
+            amounts /= 100
+        return amounts
+
+    def arrays(self) -> tuple:
+        """``(days, periods, amounts)`` arrays, as ``Mortgage.schedule_arrays`` gives them"""
+        return self.days, self.periods, self.amounts_float
@@ -0,0 +1,847 @@
+"""
+Array engines that amortize a single rate.
+
+The ``exact`` engine reproduces the original day by day calculation, with the
+daily interest and payments rounded to 2 decimal places. The ``closed_form``
+engine carries unrounded balances and compounds the daily interest between
+payment dates in closed form, so no Python level loop over days is needed.
+The ``pence`` engines keep every amount as a whole number of pence and the rate
+as a whole number of ``RATE_SCALE`` units, so each day is integer arithmetic with
+the daily interest rounded to the penny by the engine's rounding mode.
+"""
+import numpy as np
+from functools import partial
+from itertools import repeat
+
+from .calendar_index import DAY_COUNTS, calendar_window, days_in_month, is_month_end, payment_mask
+
+# Days in a year of the default ACT/365F day count, the others are looked up per day from the
+# calendar index, see ``money_tools.calendar_index.DAY_COUNTS``
+ANNUAL_PAYMENTS = 365
+
+# Annual interest rates are held as whole multiples of 1 / RATE_SCALE by the pence engines
+RATE_SCALE = 10 ** 9
+
+# Pence engines, with the rounding of the daily interest to the penny each one uses
+PENCE_ENGINES = {
+    'pence': 'half_even',
+    'pence_half_up': 'half_up',
+    'pence_floor': 'floor',
+    'pence_ceiling': 'ceiling',
+}
+
+ENGINES = ('exact', 'closed_form') + tuple(PENCE_ENGINES)
+
+# Periods interest is calculated over, and the engines the monthly periods are available for
+INTEREST_CALCULATED = ('daily', 'monthly')
+MONTHLY_ENGINES = ('exact', 'closed_form')
+
+# Dated events a rate can apply, with the fields each needs besides its date, and their engines
+EVENT_FIELDS = {
+    'lump_sum': ('amount',),
+    'payment': ('amount',),
+    'holiday': ('end_date',),
+    'rate': ('rate',),
+}
+EVENT_ENGINES = ('exact', 'closed_form')
+
+SCHEDULE_COLUMNS = ('Date', 'Period', 'Begin Balance', 'Payment', 'Interest', 'Additional_Payment', 'End Balance')
+AMOUNT_COLUMNS = SCHEDULE_COLUMNS[2:]
+BEGIN, PAYMENT, INTEREST, ADDL, END = range(len(AMOUNT_COLUMNS))
+
+SCHEDULE_DTYPE = np.dtype([('Date', 'datetime64[D]'), ('Period', np.int32)]
+                          + [(name, np.float64) for name in AMOUNT_COLUMNS])
+
+TOTALS = ('Periods', 'Total Payments', 'Total Interest', 'Total Additional Payments', 'End Balance')
+
+
+def validate_engine(engine: str, interest_calculated: str='daily', day_count: str='ACT/365F'):
+    """Check the engine name is one of the supported engines, for the interest period and day count."""
+    if engine not in ENGINES:
+        raise ValueError(f'Unknown engine {engine!r}, expected one of {ENGINES}')
+    if interest_calculated not in INTEREST_CALCULATED:
+        raise ValueError(f'Unknown interest_calculated {interest_calculated!r}, expected one of '
+                         f'{INTEREST_CALCULATED}')
+    if interest_calculated == 'monthly' and engine not in MONTHLY_ENGINES:
+        raise ValueError(f'Monthly interest is only calculated by the {MONTHLY_ENGINES} engines')
+    if day_count not in DAY_COUNTS:
+        raise ValueError(f'Unknown day_count {day_count!r}, expected one of {DAY_COUNTS}')
+    if day_count != 'ACT/365F' and (engine not in EVENT_ENGINES or interest_calculated != 'daily'):
+        raise ValueError(f'The {day_count} day count is only applied by the {EVENT_ENGINES} engines with daily '
+                         'interest')
+
+
+def validate_events(events, engine: str='exact', interest_calculated: str='daily'):
+    """Check each event has a known type and its fields, for an engine that applies events.
+
+    Events are dicts with a ``date`` and a ``type``, one of ``EVENT_FIELDS``::
+
+        {"date": '2019-06-01', "type": "lump_sum", "amount": 5000}
+        {"date": '2019-06-01', "type": "payment", "amount": 1200}
+        {"date": '2019-06-01', "type": "holiday", "end_date": '2019-08-31'}
+        {"date": '2019-06-01', "type": "rate", "rate": 0.02}
+    """
+    if not events:
+        return
+    if engine not in EVENT_ENGINES or interest_calculated != 'daily':
+        raise ValueError(f'Events are only applied by the {EVENT_ENGINES} engines with daily interest')
+    for event in events:
+        if not isinstance(event, dict):
+            raise ValueError(f'Event must be dict object. Recieved an event of type {type(event)}')
+        if event.get('type') not in EVENT_FIELDS:
+            raise ValueError(f'Unknown event type {event.get("type")!r}, expected one of {tuple(EVENT_FIELDS)}')
+        missing = {'date', *EVENT_FIELDS[event['type']]} - set(event)
+        if missing:
+            raise ValueError(f'{event["type"]} event is missing {sorted(missing)}')
+
+
+def events_within(events, start_date, end_date) -> list:
+    """The events dated from start_date to end_date, and the holidays overlapping them."""
+    start = np.datetime64(start_date, 'D')
+    end = np.datetime64(end_date, 'D')
+    return [event for event in events or ()
+            if np.datetime64(event['date'], 'D') <= end
+            and np.datetime64(event['end_date'] if event['type'] == 'holiday' else event['date'], 'D') >= start]
+
+
+def month_periods(days: np.ndarray, payment_day: int):
+    """Split days into calendar month periods for monthly interest.
+
+    Returns the index of the last day of each period, the fraction of its month each
+    period covers, and whether the payment day falls within it. The first and last
+    periods are part months when the days start or end part way through a month.
+    """
+    period_end = is_month_end(days)
+    period_end[-1:] = True
+    ends = np.flatnonzero(period_end)
+    starts = np.append(0, ends[:-1] + 1)
+    fraction = (ends - starts + 1) / days_in_month(days[ends])
+    is_payment = np.logical_or.reduceat(payment_mask(days, payment_day), starts) if len(days) else ends > 0
+    return ends, fraction, is_payment
+
+
+def event_arrays(calendar, interest_rate: float, monthly_pmt: float, payment_day: int, addl_principal: float,
+                 events=None, day_count: str='ACT/365F') -> tuple:
+    """Daily rate, payment and additional payment arrays with the events applied, in date order.
+
+    ``calendar`` is the ``CalendarWindow`` of the days. Payment and rate changes hold
+    from their date to the last day, a holiday takes no monthly or additional payments
+    from its date to its end date inclusive, and lump sums are additional payments on
+    their date. Events outside the days are ignored, except holidays that overlap them.
+    The annual rates are turned into daily rates by the day count's accrual of each day.
+    """
+    days = calendar.days
+    n = len(days)
+    rates = np.full(n, float(interest_rate))
+    pmt = np.full(n, round(float(monthly_pmt), 2))
+    lump = np.zeros(n)
+    holiday = np.zeros(n, dtype=bool)
+
+    for event in sorted(events or (), key=lambda event: np.datetime64(event['date'], 'D')):
+        i = np.searchsorted(days, np.datetime64(event['date'], 'D'))
+        if event['type'] == 'holiday':
+            holiday[i:np.searchsorted(days, np.datetime64(event['end_date'], 'D'), side='right')] = True
+        elif i == n or days[i] != np.datetime64(event['date'], 'D'):
+            continue
+        elif event['type'] == 'lump_sum':
+            lump[i] += round(float(event['amount']), 2)
+        elif event['type'] == 'payment':
+            pmt[i:] = round(float(event['amount']), 2)
+        elif event['type'] == 'rate':
+            rates[i:] = event['rate']
+
+    is_payment = calendar.payment_mask(payment_day) & ~holiday
+    pmt = np.where(is_payment, pmt, 0.0)
+    addl = round2(np.where(is_payment, round(float(addl_principal), 2), 0.0) + lump)
+    accrual, basis = calendar.day_count(day_count)
+    return rates * accrual / basis, pmt, addl
+
+
+def _exact_steps(beg_balance: float, is_payment: list, daily_rates, pmts, addls, totals_only: bool=False):
+    """Day by day loop of the exact engines, rounding the daily interest and payments to 2dp.
+
+    Every exact engine runs these steps, so their balances agree to the bit. The daily
+    rates, payments due and additional payments due are iterables of one value per
+    day, or ``itertools.repeat`` of a constant. Returns the ``(n_days, 5)`` amounts,
+    truncated at the day the loan is paid off, or with ``totals_only`` just the
+    ``TOTALS`` values, without keeping the rows.
+    """
+    interest = []
+    end = []
+    payments = {}
+    rows = 0
+    total_pmt = total_interest = total_addl = 0.0
+
+    opening_balance = end_balance = beg_balance
+    if beg_balance > 0:
+        for pay, daily_rate, pmt_due, addl_due in zip(is_payment, daily_rates, pmts, addls):
+            daily_interest = round(daily_rate * beg_balance, 2)
+
+            if pay:
+                # Payment capped at the outstanding balance, additional payment adjusted to match
+                pmt = min(pmt_due, beg_balance + daily_interest)
+                addl_pmt = min(addl_due, beg_balance - (pmt - daily_interest))
+                end_balance = beg_balance + daily_interest - (pmt + addl_pmt)
+                if totals_only:
+                    total_pmt += pmt
+                    total_addl += addl_pmt
+                else:
+                    payments[rows] = (pmt, addl_pmt)
+            else:
+                end_balance = beg_balance + daily_interest
+
+            if totals_only:
+                total_interest += daily_interest
+            else:
+                interest.append(daily_interest)
+                end.append(end_balance)
+            rows += 1
+
+            if end_balance <= 0:
+                break
+            beg_balance = end_balance
+
+    if totals_only:
+        return rows, total_pmt, total_interest, total_addl, end_balance
+
+    amounts = np.zeros((rows, len(AMOUNT_COLUMNS)), dtype=np.float64)
+    amounts[:, INTEREST] = interest
+    amounts[:, END] = end
+    amounts[:1, BEGIN] = opening_balance
+    amounts[1:, BEGIN] = amounts[:-1, END]
+    if payments:
+        idx = list(payments.keys())
+        amounts[idx, PAYMENT], amounts[idx, ADDL] = zip(*payments.values())
+
+    return amounts
+
+
+def _amortize_exact_events(principal: float, daily_rates: np.ndarray, pmt: np.ndarray, addl: np.ndarray,
+                           resume: bool=False):
+    """``_amortize_exact`` with the daily rate, payment and additional payment of each day taken from arrays.
+
+    A day with either payment is a payment day. With constant rates and payments, and
+    the ACT/365F day count, this is identical to ``_amortize_exact``.
+    """
+    is_payment = ((pmt != 0) | (addl != 0)).tolist()
+    beg_balance = float(principal) if resume else round(float(principal), 2)
+    return _exact_steps(beg_balance, is_payment, daily_rates.tolist(), pmt.tolist(), addl.tolist())
+
+
+def _amortize_closed_form_events(principal: float, daily_rates: np.ndarray, pmt: np.ndarray, addl: np.ndarray,
+                                 resume: bool=False):
+    """``_amortize_closed_form`` with the daily rate, payment and additional payment of each day taken from arrays.
+
+    The compounding of a pound from the start to the end of each day is the running
+    product of the daily growth, so the balances jump across any number of events in
+    one array computation.
+    """
+    opening_balance = principal if resume else round(principal, 2)
+    n = len(pmt) if opening_balance > 0 else 0
+    daily_rates = daily_rates[:n]
+
+    amounts = np.zeros((n, len(AMOUNT_COLUMNS)), dtype=np.float64)
+    begin, payment, interest, additional, end = amounts.T
+    payment[:] = pmt[:n]
+    additional[:] = addl[:n]
+
+    growth = np.cumprod(1 + daily_rates)
+    end[:] = growth * (opening_balance - np.cumsum((payment + additional) / growth))
+    begin[:1] = opening_balance
+    begin[1:] = end[:-1]
+    np.multiply(begin, daily_rates, out=interest)
+
+    cleared = np.flatnonzero(end <= 0)
+    if cleared.size:
+        k = cleared[0]
+        amounts = amounts[:k + 1]
+        payment[k] = min(payment[k], begin[k] + interest[k])
+        additional[k] = min(additional[k], begin[k] - (payment[k] - interest[k]))
+        end[k] = begin[k] + interest[k] - (payment[k] + additional[k])
+
+    return amounts
+
+
+_EVENT_ENGINE_FUNCS = {
+    'exact': _amortize_exact_events,
+    'closed_form': _amortize_closed_form_events,
+}
+
+
+def _amortize_exact(principal: float, interest_rate: float, monthly_pmt: float, is_payment: np.ndarray,
+                    addl_principal: float=0, resume: bool=False):
+    """Day by day amortization with the daily interest and payments rounded to 2dp.
+
+    Returns the Begin Balance, Payment, Interest, Additional_Payment and End Balance
+    columns as one ``(n_days, 5)`` array, truncated at the day the loan is paid off.
+    With ``resume`` the principal is a balance carried over from an earlier run, and
+    is used as it is rather than rounded.
+    """
+    # Plain floats, so round is Python's rather than numpy's
+    beg_balance = float(principal) if resume else round(float(principal), 2)
+    return _exact_steps(beg_balance, is_payment.tolist(), repeat(float(interest_rate) / ANNUAL_PAYMENTS),
+                        repeat(round(float(monthly_pmt), 2)), repeat(round(float(addl_principal), 2)))
+
+
+def _amortize_monthly(principal: float, interest_rate: float, monthly_pmt: float, is_payment: np.ndarray,
+                      fraction: np.ndarray, addl_principal: float=0, resume: bool=False, rounded: bool=True):
+    """Month by month amortization, with interest charged on each month's begin balance.
+
+    Each period's interest is the monthly rate on its begin balance, scaled by the
+    ``fraction`` of the month the period covers, and the payments are taken at the end
+    of the periods flagged by ``is_payment``. With ``rounded`` the interest and payments
+    are rounded to 2dp as in ``_amortize_exact``. Returns the same columns as that, one
+    row per period.
+    """
+    rounding = (lambda amount: round(amount, 2)) if rounded else (lambda amount: amount)
+    monthly_rate = float(interest_rate) / 12
+    pmt_due = rounding(float(monthly_pmt))
+    addl_due = rounding(float(addl_principal))
+
+    rows = []
+    beg_balance = float(principal) if resume else rounding(float(principal))
+    if beg_balance > 0:
+        for pay, part in zip(is_payment.tolist(), fraction.tolist()):
+            interest = rounding(monthly_rate * part * beg_balance)
+            pmt = addl_pmt = 0.0
+            if pay:
+                pmt = min(pmt_due, beg_balance + interest)
+                addl_pmt = min(addl_due, beg_balance - (pmt - interest))
+            end_balance = beg_balance + interest - (pmt + addl_pmt)
+            rows.append((beg_balance, pmt, interest, addl_pmt, end_balance))
+
+            if end_balance <= 0:
+                break
+            beg_balance = end_balance
+
+    return np.array(rows, dtype=np.float64).reshape(len(rows), len(AMOUNT_COLUMNS))
+
+
+def _amortize_closed_form(principal: float, interest_rate: float, monthly_pmt: float, is_payment: np.ndarray,
+                          addl_principal: float=0, resume: bool=False):
+    """Amortization with unrounded daily compounding, computed without a loop over days.
+
+    Between payments the balance grows by ``(1 + r/365)`` a day, so the end balance of
+    day ``t`` is the start balance compounded ``t + 1`` days less every payment made so
+    far, each compounded from the day it was taken. ``resume`` is as for ``_amortize_exact``.
+    """
+    daily_rate = interest_rate / ANNUAL_PAYMENTS
+    pmt_due = round(monthly_pmt, 2)
+    addl_due = round(addl_principal, 2)
+    opening_balance = principal if resume else round(principal, 2)
+
+    n = len(is_payment) if opening_balance > 0 else 0
+    is_payment = is_payment[:n]
+
+    amounts = np.zeros((n, len(AMOUNT_COLUMNS)), dtype=np.float64)
+    begin, payment, interest, addl, end = amounts.T
+    payment[is_payment] = pmt_due
+    addl[is_payment] = addl_due
+
+    growth = (1 + daily_rate) ** np.arange(1, n + 1, dtype=np.float64)
+    end[:] = growth * (opening_balance - np.cumsum((payment + addl) / growth))
+    begin[:1] = opening_balance
+    begin[1:] = end[:-1]
+    np.multiply(begin, daily_rate, out=interest)
+
+    # Truncate on the day the balance is cleared, capping that day's payments
+    cleared = np.flatnonzero(end <= 0)
+    if cleared.size:
+        k = cleared[0]
+        amounts = amounts[:k + 1]
+        payment[k] = min(pmt_due, begin[k] + interest[k])
+        addl[k] = min(addl_due, begin[k] - (payment[k] - interest[k]))
+        end[k] = begin[k] + interest[k] - (payment[k] + addl[k])
+
+    return amounts
+
+
+def to_pence(amount):
+    """Whole pence of an amount rounded to 2dp as ``round(amount, 2)`` does, for floats or arrays"""
+    if isinstance(amount, np.ndarray):
+        return np.rint(round2(amount) * 100).astype(np.int64)
+    return int(round(round(float(amount), 2) * 100))
+
+
+def rate_units(interest_rate):
+    """Annual interest rate as a whole number of ``1 / RATE_SCALE`` units, for floats or arrays"""
+    if isinstance(interest_rate, np.ndarray):
+        return np.rint(np.asarray(interest_rate, dtype=np.float64) * RATE_SCALE).astype(np.int64)
+    return int(round(float(interest_rate) * RATE_SCALE))
+
+
+def divide_pence(numerator, denominator: int, rounding: str='half_even'):
+    """Integer division of whole numbers, rounded by the given mode, for ints or int arrays.
+
+    ``rounding`` is ``'half_even'``, ``'half_up'`` (halves away from zero for positive
+    values), ``'floor'`` or ``'ceiling'``.
+    """
+    quotient, remainder = divmod(numerator, denominator)
+    if rounding == 'floor':
+        return quotient
+    if rounding == 'ceiling':
+        return quotient + (remainder > 0)
+    if rounding == 'half_up':
+        return quotient + (2 * remainder >= denominator)
+    if rounding == 'half_even':
+        return quotient + ((2 * remainder > denominator) | ((2 * remainder == denominator) & (quotient % 2 == 1)))
+    raise ValueError(f'Unknown rounding {rounding!r}, expected one of {tuple(PENCE_ENGINES.values())}')
+
+
+def _amortize_pence(principal: float, interest_rate: float, monthly_pmt: float, is_payment: np.ndarray,
+                    addl_principal: float=0, resume: bool=False, rounding: str='half_even'):
+    """Day by day amortization in whole pence, with the daily interest rounded by ``rounding``.
+
+    Returns the same columns as ``_amortize_exact``, every amount an exact number of
+    pence. Balances are always whole pence, so ``resume`` makes no difference.
+    """
+    units = rate_units(interest_rate)
+    denominator = ANNUAL_PAYMENTS * RATE_SCALE
+    pmt_due = to_pence(monthly_pmt)
+    addl_due = to_pence(addl_principal)
+
+    interest = []
+    end = []
+    payments = {}
+
+    beg_balance = opening_balance = to_pence(principal)
+    if beg_balance > 0:
+        for i, pay in enumerate(is_payment.tolist()):
+            daily_interest = divide_pence(units * beg_balance, denominator, rounding)
+            end_balance = beg_balance + daily_interest
+
+            if pay:
+                pmt = min(pmt_due, end_balance)
+                addl_pmt = min(addl_due, end_balance - pmt)
+                end_balance -= pmt + addl_pmt
+                payments[i] = (pmt, addl_pmt)
+
+            interest.append(daily_interest)
+            end.append(end_balance)
+
+            if end_balance <= 0:
+                break
+            beg_balance = end_balance
+
+    n = len(end)
+    amounts = np.zeros((n, len(AMOUNT_COLUMNS)), dtype=np.int64)
+    amounts[:, INTEREST] = interest
+    amounts[:, END] = end
+    amounts[:1, BEGIN] = opening_balance
+    amounts[1:, BEGIN] = amounts[:-1, END]
+    if payments:
+        idx = list(payments.keys())
+        amounts[idx, PAYMENT], amounts[idx, ADDL] = zip(*payments.values())
+
+    return amounts / 100
+
+
+_ENGINE_FUNCS = {
+    'exact': _amortize_exact,
+    'closed_form': _amortize_closed_form,
+    **{engine: partial(_amortize_pence, rounding=rounding) for engine, rounding in PENCE_ENGINES.items()},
+}
+
+_MONTHLY_ENGINE_FUNCS = {
+    'exact': _amortize_monthly,
+    'closed_form': partial(_amortize_monthly, rounded=False),
+}
+
+
+def amortize_arrays(principal: float, interest_rate: float, monthly_pmt: float, start_date, end_date,
+                    addl_principal: float=0, payment_day: int=1, engine: str='exact',
+                    interest_calculated: str='daily', events=None, day_count: str='ACT/365F'):
+    """Amortize a rate into column arrays.
+
+    Parameters
+    ----------
+    principal : float
+        Starting loan amount.
+    interest_rate : float
+        The interest rate expressed as a decimal.
+    monthly_pmt : float
+        The regular monthly payment amount
+    start_date : date
+        Starting date to build amortisation table
+    end_date : date
+        End date to build the amortisation table up to
+    addl_principal : float, optional
+        Any additional monthly payment made at the same time as the monthly_pmt, by default 0
+    payment_day : int, optional
+        Day of the month when monthly payments are taken, by default 1 for the first day of the month
+    engine : str, optional
+        ``'exact'`` for 2dp rounding of each day, ``'closed_form'`` for unrounded compounding,
+        or one of the ``PENCE_ENGINES`` for whole pence arithmetic, by default ``'exact'``
+    interest_calculated : str, optional
+        ``'daily'`` for one row per day, or ``'monthly'`` for one row per calendar month,
+        dated on its last day, with the interest charged monthly, by default ``'daily'``
+    events : list[dict], optional
+        Dated lump sums, payment changes, payment holidays and rate changes applied in
+        the same pass, see ``validate_events``, by default None
+    day_count : str, optional
+        Day count convention of the daily interest, one of ``DAY_COUNTS``, by default
+        ``'ACT/365F'``
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The datetime64[D] days and a ``(n_days, 5)`` float64 array holding the
+        Begin Balance, Payment, Interest, Additional_Payment and End Balance columns.
+    """
+    validate_engine(engine, interest_calculated, day_count)
+    validate_events(events, engine, interest_calculated)
+    calendar = calendar_window(start_date, end_date)
+    days = calendar.days
+    if events or day_count != 'ACT/365F':
+        amounts = _EVENT_ENGINE_FUNCS[engine](principal, *event_arrays(calendar, interest_rate, monthly_pmt,
+                                                                       payment_day, addl_principal, events,
+                                                                       day_count))
+        return days[:len(amounts)], amounts
+    if interest_calculated == 'monthly':
+        ends, fraction, is_payment = month_periods(days, payment_day)
+        amounts = _MONTHLY_ENGINE_FUNCS[engine](principal, interest_rate, monthly_pmt, is_payment, fraction,
+                                                addl_principal)
+        return days[ends[:len(amounts)]], amounts
+
+    amounts = _ENGINE_FUNCS[engine](principal, interest_rate, monthly_pmt, calendar.payment_mask(payment_day),
+                                    addl_principal)
+    return days[:len(amounts)], amounts
+
+
+def amortize_chunks(principal: float, interest_rate: float, monthly_pmt: float, start_date, end_date,
+                    addl_principal: float=0, payment_day: int=1, engine: str='exact', rows: int=10_000,
+                    interest_calculated: str='daily', events=None, day_count: str='ACT/365F'):
+    """Amortize a rate a chunk of days at a time.
+
+    Takes the same arguments as ``amortize_arrays``, and yields the same arrays split
+    into chunks of at most ``rows`` days. Each chunk carries on from the balance the
+    previous one ended on, so only one chunk is held in memory at a time.
+
+    Yields
+    ------
+    tuple[np.ndarray, np.ndarray]
+        The datetime64[D] days and ``(n_days, 5)`` amounts of each chunk
+    """
+    validate_engine(engine, interest_calculated, day_count)
+    validate_events(events, engine, interest_calculated)
+    if rows < 1:
+        raise ValueError('rows must be at least 1')
+
+    if interest_calculated == 'monthly':
+        # A row a month is small enough to calculate whole
+        days, amounts = amortize_arrays(principal, interest_rate, monthly_pmt, start_date, end_date,
+                                        addl_principal, payment_day, engine, interest_calculated)
+        for start in range(0, len(days), rows):
+            yield days[start:start + rows], amounts[start:start + rows]
+        return
+
+    calendar = calendar_window(start_date, end_date)
+    days = calendar.days
+    if events or day_count != 'ACT/365F':
+        daily = event_arrays(calendar, interest_rate, monthly_pmt, payment_day, addl_principal, events, day_count)
+
+        def amortize(balance, start, resume):
+            return _EVENT_ENGINE_FUNCS[engine](balance, *(values[start:start + rows] for values in daily),
+                                               resume=resume)
+    else:
+        is_payment = calendar.payment_mask(payment_day)
+
+        def amortize(balance, start, resume):
+            return _ENGINE_FUNCS[engine](balance, interest_rate, monthly_pmt, is_payment[start:start + rows],
+                                         addl_principal, resume=resume)
+
+    balance = principal
+    for start in range(0, len(days), rows):
+        amounts = amortize(balance, start, resume=start > 0)
+        if not len(amounts):
+            return
+        yield days[start:start + len(amounts)], amounts
+
+        balance = amounts[-1, END]
+        if balance <= 0:
+            return
+
+
+def to_records(days: np.ndarray, amounts: np.ndarray, periods: np.ndarray=None) -> np.ndarray:
+    """Pack schedule columns into a structured array with ``SCHEDULE_DTYPE``."""
+    records = np.empty(len(days), dtype=SCHEDULE_DTYPE)
+    records['Date'] = days
+    records['Period'] = np.arange(1, len(days) + 1) if periods is None else periods
+    for i, name in enumerate(AMOUNT_COLUMNS):
+        records[name] = amounts[:, i]
+    return records
+
+
+def _totals_exact(principal: float, interest_rate: float, monthly_pmt: float, is_payment: np.ndarray,
+                  addl_principal: float=0):
+    """Exact engine totals, running the same daily steps as ``_amortize_exact`` without keeping rows."""
+    return _exact_steps(round(float(principal), 2), is_payment.tolist(), repeat(float(interest_rate) / ANNUAL_PAYMENTS),
+                        repeat(round(float(monthly_pmt), 2)), repeat(round(float(addl_principal), 2)),
+                        totals_only=True)
+
+
+def _totals_closed_form(principal: float, interest_rate: float, monthly_pmt: float, is_payment: np.ndarray,
+                        addl_principal: float=0):
+    """Closed form engine totals, evaluating the balance on payment days only."""
+    daily_rate = interest_rate / ANNUAL_PAYMENTS
+    pmt_due = round(monthly_pmt, 2)
+    addl_due = round(addl_principal, 2)
+    opening_balance = round(principal, 2)
+    if opening_balance <= 0:
+        return 0, 0.0, 0.0, 0.0, opening_balance
+
+    pay_days = np.flatnonzero(is_payment)
+    growth = (1 + daily_rate) ** (pay_days + 1.0)
+    paid = np.cumsum((pmt_due + addl_due) / growth)
+    # Balance on each payment day, before and after the payments are taken
+    due = growth * (opening_balance - np.concatenate(([0.0], paid[:-1])))
+
+    cleared = np.flatnonzero(due - (pmt_due + addl_due) <= 0)
+    if cleared.size:
+        k = cleared[0]
+        pmt = min(pmt_due, due[k])
+        addl_pmt = min(addl_due, due[k] - pmt)
+        rows = int(pay_days[k]) + 1
+        total_pmt = pmt_due * k + pmt
+        total_addl = addl_due * k + addl_pmt
+        end_balance = due[k] - (pmt + addl_pmt)
+    else:
+        rows = len(is_payment)
+        total_pmt = pmt_due * len(pay_days)
+        total_addl = addl_due * len(pay_days)
+        end_balance = (1 + daily_rate) ** rows * (opening_balance - (paid[-1] if paid.size else 0.0))
+
+    # Every pound of balance change that was not paid off was interest
+    total_interest = end_balance - opening_balance + total_pmt + total_addl
+    return rows, float(total_pmt), float(total_interest), float(total_addl), float(end_balance)
+
+
+def _totals_pence(principal: float, interest_rate: float, monthly_pmt: float, is_payment: np.ndarray,
+                  addl_principal: float=0, rounding: str='half_even'):
+    """Pence engine totals, running the same daily steps as ``_amortize_pence`` without keeping rows."""
+    units = rate_units(interest_rate)
+    denominator = ANNUAL_PAYMENTS * RATE_SCALE
+    pmt_due = to_pence(monthly_pmt)
+    addl_due = to_pence(addl_principal)
+
+    rows = total_pmt = total_interest = total_addl = 0
+    beg_balance = end_balance = to_pence(principal)
+    if beg_balance > 0:
+        for pay in is_payment.tolist():
+            daily_interest = divide_pence(units * beg_balance, denominator, rounding)
+            end_balance = beg_balance + daily_interest
+
+            if pay:
+                pmt = min(pmt_due, end_balance)
+                addl_pmt = min(addl_due, end_balance - pmt)
+                end_balance -= pmt + addl_pmt
+                total_pmt += pmt
+                total_addl += addl_pmt
+
+            total_interest += daily_interest
+            rows += 1
+
+            if end_balance <= 0:
+                break
+            beg_balance = end_balance
+
+    return rows, total_pmt / 100, total_interest / 100, total_addl / 100, end_balance / 100
+
+
+_TOTALS_FUNCS = {
+    'exact': _totals_exact,
+    'closed_form': _totals_closed_form,
+    **{engine: partial(_totals_pence, rounding=rounding) for engine, rounding in PENCE_ENGINES.items()},
+}
+
+
+def amortize_totals(principal: float, interest_rate: float, monthly_pmt: float, start_date, end_date,
+                    addl_principal: float=0, payment_day: int=1, engine: str='exact',
+                    interest_calculated: str='daily', events=None, day_count: str='ACT/365F') -> dict:
+    """Totals and end balance of a rate, without building its daily rows.
+
+    Takes the same arguments as ``amortize_arrays``. The end balance is identical to the
+    last End Balance of the schedule from the same engine.
+
+    Returns
+    -------
+    dict
+        ``TOTALS`` values: the number of rows in the schedule, the total payments,
+        interest and additional payments, and the end balance.
+    """
+    validate_engine(engine, interest_calculated, day_count)
+    if interest_calculated == 'monthly' or events or day_count != 'ACT/365F':
+        _, amounts = amortize_arrays(principal, interest_rate, monthly_pmt, start_date, end_date,
+                                     addl_principal, payment_day, engine, interest_calculated, events, day_count)
+        end_balance = float(amounts[-1, END]) if len(amounts) else round(float(principal), 2)
+        return dict(zip(TOTALS, (len(amounts), *amounts[:, PAYMENT:END].sum(axis=0).tolist(), end_balance)))
+    is_payment = calendar_window(start_date, end_date).payment_mask(payment_day)
+    return dict(zip(TOTALS, _TOTALS_FUNCS[engine](principal, interest_rate, monthly_pmt, is_payment,
+                                                  addl_principal)))
+
+
+_SPLITTER = 134217729.0  # 2**27 + 1, splits a double into two 26 bit halves
+
+
+def round2(x: np.ndarray) -> np.ndarray:
+    """Round to 2 decimal places, matching Python's ``round(x, 2)`` exactly.
+
+    ``np.round`` rounds ``x * 100`` after that product has itself been rounded, which
+    disagrees with ``round`` on values close to a half penny. Here the rounding error of
+    ``x * 100`` is recovered exactly (Dekker's product) and used to settle those ties.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if not x.ndim:
+        return round2(x.reshape(1))[0]
+    scaled = x * 100.0
+    pence = np.rint(scaled)
+
+    # Only exact half pennies of the scaled value need the rounding error settling
+    tie = np.abs(scaled - pence) == 0.5
+    if tie.any():
+        x_tie, scaled_tie = x[tie], scaled[tie]
+        c = _SPLITTER * x_tie
+        hi = c - (c - x_tie)
+        lo = x_tie - hi
+        error = (hi * 100.0 - scaled_tie) + lo * 100.0
+        floor = np.floor(scaled_tie)
+        pence[tie] = np.where(error > 0, floor + 1, np.where(error < 0, floor, pence[tie]))
+    return pence / 100.0
+
+
+def _amortize_batch_exact(principal, interest_rate, monthly_pmt, is_payment, addl_principal):
+    """Exact engine run for many loans at once, stepping every loan through each day together."""
+    daily_rate = interest_rate / ANNUAL_PAYMENTS
+    pmt_due = round2(monthly_pmt)
+    addl_due = round2(addl_principal)
+    balance = round2(principal)
+
+    active = balance > 0
+    rows = np.zeros(balance.shape, dtype=np.int64)
+    totals = np.zeros((3,) + balance.shape, dtype=np.float64)
+
+    for pay in is_payment:
+        if not active.any():
+            break
+        daily_interest = round2(daily_rate * balance)
+        pmt = np.where(pay, np.minimum(pmt_due, balance + daily_interest), 0.0)
+        addl_pmt = np.where(pay, np.minimum(addl_due, balance - (pmt - daily_interest)), 0.0)
+        end_balance = balance + daily_interest - (pmt + addl_pmt)
+
+        totals += np.where(active, (pmt, daily_interest, addl_pmt), 0.0)
+        rows += active
+        balance = np.where(active, end_balance, balance)
+        active &= end_balance > 0
+
+    return rows, totals, balance
+
+
+def _amortize_batch_closed_form(principal, interest_rate, monthly_pmt, is_payment, addl_principal):
+    """Closed form engine run for many loans at once, jumping from one payment day to the next."""
+    daily_rate = interest_rate / ANNUAL_PAYMENTS
+    pmt_due = round2(monthly_pmt)
+    addl_due = round2(addl_principal)
+    balance = round2(principal)
+
+    active = balance > 0
+    rows = np.where(active, len(is_payment), 0)
+    totals = np.zeros((3,) + balance.shape, dtype=np.float64)
+
+    # Segments run from the day after one payment day up to and including the next
+    n = len(is_payment)
+    segment_ends = np.flatnonzero(np.any(np.reshape(is_payment, (n, -1)), axis=1))
+    if not segment_ends.size or segment_ends[-1] != n - 1:
+        segment_ends = np.append(segment_ends, n - 1)
+
+    previous = -1
+    for day in segment_ends.tolist():
+        if not active.any():
+            break
+        growth = (1 + daily_rate) ** (day - previous)
+        due = balance * growth
+        pmt = np.where(is_payment[day], np.minimum(pmt_due, due), 0.0)
+        addl_pmt = np.where(is_payment[day], np.minimum(addl_due, due - pmt), 0.0)
+        end_balance = due - (pmt + addl_pmt)
+
+        totals += np.where(active, (pmt, due - balance, addl_pmt), 0.0)
+        cleared = active & (end_balance <= 0)
+        rows = np.where(cleared, day + 1, rows)
+        balance = np.where(active, end_balance, balance)
+        active &= ~cleared
+        previous = day
+
+    return rows, totals, balance
+
+
+def _amortize_batch_pence(principal, interest_rate, monthly_pmt, is_payment, addl_principal, rounding='half_even'):
+    """Pence engine run for many loans at once, in int64 pence throughout."""
+    units = rate_units(interest_rate)
+    denominator = ANNUAL_PAYMENTS * RATE_SCALE
+    pmt_due = to_pence(monthly_pmt)
+    addl_due = to_pence(addl_principal)
+    balance = to_pence(principal)
+
+    # The interest numerator must fit in an int64, which allows £90m at 10%
+    max_numerator = int(np.abs(units).max(initial=0)) * int(np.abs(balance).max(initial=0))
+    if max_numerator > np.iinfo(np.int64).max // 2:
+        raise ValueError('Balances and rates are too large for the batch pence engine')
+
+    active = balance > 0
+    rows = np.zeros(balance.shape, dtype=np.int64)
+    totals = np.zeros((3,) + balance.shape, dtype=np.int64)
+
+    for pay in is_payment:
+        if not active.any():
+            break
+        daily_interest = divide_pence(units * balance, denominator, rounding)
+        due = balance + daily_interest
+        pmt = np.where(pay, np.minimum(pmt_due, due), 0)
+        addl_pmt = np.where(pay, np.minimum(addl_due, due - pmt), 0)
+        end_balance = due - (pmt + addl_pmt)
+
+        totals += np.where(active, (pmt, daily_interest, addl_pmt), 0)
+        rows += active
+        balance = np.where(active, end_balance, balance)
+        active &= end_balance > 0
+
+    return rows, totals / 100, balance / 100
+
+
+_BATCH_ENGINE_FUNCS = {
+    'exact': _amortize_batch_exact,
+    'closed_form': _amortize_batch_closed_form,
+    **{engine: partial(_amortize_batch_pence, rounding=rounding) for engine, rounding in PENCE_ENGINES.items()},
+}
+
+
+def amortize_batch(principal, interest_rate, monthly_pmt, is_payment: np.ndarray, addl_principal=0,
+                   engine: str='exact') -> dict:
+    """Amortize many loans over the same days at once, keeping only their totals.
+
+    The loan parameters broadcast against each other, so every loan is one element of
+    the resulting arrays. With the exact engine each loan's end balance is identical to
+    the one ``amortize_arrays`` produces.
+
+    Parameters
+    ----------
+    principal, interest_rate, monthly_pmt, addl_principal : array_like
+        Loan parameters, as for ``amortize_arrays``.
+    is_payment : np.ndarray
+        Boolean array with one entry per day, flagging the payment days. A second axis
+        gives each loan its own payment days.
+    engine : str, optional
+        One of ``ENGINES``, by default ``'exact'``
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        ``TOTALS`` arrays: the number of days each loan ran before being paid off
+        and its total payments, interest, additional payments and end balance.
+    """
+    validate_engine(engine)
+    principal, interest_rate, monthly_pmt, addl_principal = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (principal, interest_rate, monthly_pmt, addl_principal))
+    )
+    rows, totals, balance = _BATCH_ENGINE_FUNCS[engine](principal, interest_rate, monthly_pmt,
+                                                        np.asarray(is_payment, dtype=bool), addl_principal)
+    return dict(zip(TOTALS, (rows, *totals, balance)))
@@ -0,0 +1,73 @@
+"""
+Stream the daily schedules of many mortgages to a CSV or Parquet file.
+"""
+import os
+
+EXPORT_FORMATS = ('csv', 'parquet')
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError('Parquet export requires pyarrow, install it with `pip install pyarrow`') from e
+    return pyarrow
+
+
+def _iter_chunks(mortgages, rows: int):
+    """Schedule chunks of every mortgage, with the mortgage's position added as the first column"""
+    for index, mortgage in enumerate(mortgages):
+        for chunk in mortgage.iter_schedule_chunks(rows=rows):
+            chunk.insert(0, 'Mortgage', index)
+            yield chunk
+
+
+def export_schedules(mortgages, path: str, format: str=None, rows: int=10_000) -> int:
+    """Write the daily schedules of the mortgages to one file, a chunk at a time.
+
+    Schedules are calculated and written ``rows`` days at a time, so memory use stays
+    flat however many mortgages or days there are.
+
+    Parameters
+    ----------
+    mortgages : iterable of Mortgage
+        Mortgages to export, may be a generator
+    path : str
+        File to write
+    format : str, optional
+        ``'csv'`` or ``'parquet'``, by default taken from the file extension
+    rows : int, optional
+        Number of days calculated and written at a time, by default 10,000
+
+    Returns
+    -------
+    int
+        Number of rows written
+    """
+    if format is None:
+        format = os.path.splitext(path)[1].lstrip('.').lower()
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f'format must be one of {EXPORT_FORMATS}. Recieved {format!r}')
+
+    written = 0
+    if format == 'csv':
+        with open(path, 'w', newline='') as f:
+            for chunk in _iter_chunks(mortgages, rows):
+                chunk.to_csv(f, header=not written, index=False)
+                written += len(chunk)
+        return written
+
+    pa = _import_pyarrow()
+    writer = None
+    try:
+        for chunk in _iter_chunks(mortgages, rows):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pa.parquet.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            written += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
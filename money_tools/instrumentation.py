@@ -0,0 +1,121 @@
+"""
+Opt-in timing of the stages of building a Mortgage.
+
+Instrumentation is off unless ``collector.enable()`` is called, or the
+``MONEY_TOOLS_STATS`` environment variable is set, and then costs a single attribute
+check per stage. When on, each stage records its wall time, the rows it produced and,
+with memory tracking, the bytes it left allocated, both on the Mortgage's
+``build_stats`` and in the process-wide ``collector``.
+"""
+import json
+import os
+import time
+import tracemalloc
+from collections import OrderedDict
+
+
+class StatsCollector(object):
+    """
+    Process-wide record of every instrumented stage, which batch jobs can dump as JSON.
+    """
+
+    def __init__(self, enabled: bool=False):
+        self.enabled = enabled
+        self.records = []
+
+    def __repr__(self):
+        return 'StatsCollector(enabled={}, records={})'.format(self.enabled, len(self.records))
+
+    def enable(self, track_memory: bool=False):
+        """Start recording stages, and with ``track_memory`` the bytes each allocates.
+
+        Memory tracking uses ``tracemalloc``, which slows every allocation while on.
+        """
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording stages, and stop any memory tracking"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.enabled = False
+
+    def clear(self):
+        """Remove every record"""
+        self.records = []
+
+    def summary(self) -> dict:
+        """Count, total seconds, rows and bytes of each stage, in the order stages were first seen"""
+        summary = OrderedDict()
+        for record in self.records:
+            totals = summary.setdefault(record['stage'], {'count': 0, 'seconds': 0.0, 'rows': 0, 'bytes': 0})
+            totals['count'] += 1
+            totals['seconds'] += record['seconds']
+            totals['rows'] += record.get('rows') or 0
+            totals['bytes'] += record.get('bytes') or 0
+        return summary
+
+    def dump(self, path: str=None) -> str:
+        """JSON of the records and their summary, also written to path if given"""
+        payload = json.dumps({'summary': self.summary(), 'records': self.records}, indent=2, default=str)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(payload)
+        return payload
+
+
+collector = StatsCollector(enabled=bool(os.environ.get('MONEY_TOOLS_STATS')))
+
+
+class _Stage(object):
+    """A stage being timed, added to ``stats`` and the collector when it exits"""
+    enabled = True
+
+    def __init__(self, stats: list, name: str):
+        self.stats = stats
+        self.record = {'stage': name}
+
+    def __enter__(self):
+        self._bytes = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.record['seconds'] = time.perf_counter() - self._start
+        if self._bytes is not None and tracemalloc.is_tracing():
+            self.record['bytes'] = tracemalloc.get_traced_memory()[0] - self._bytes
+        self.stats.append(self.record)
+        collector.records.append(self.record)
+        return False
+
+    def set(self, **fields):
+        """Add fields, such as the rows produced, to the stage's record"""
+        self.record.update(fields)
+
+
+class _NullStage(object):
+    """Stand in for a stage while instrumentation is off"""
+    enabled = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(stats: list, name: str):
+    """Context manager timing a stage into the ``stats`` list, doing nothing while disabled.
+
+    Fields that are costly to work out should only be set when ``enabled`` is true.
+    """
+    if not collector.enabled:
+        return _NULL_STAGE
+    return _Stage(stats, name)
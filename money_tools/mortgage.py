@@ -6,13 +6,41 @@ import pandas as pd
 from datetime import date
 import numpy as np
 from collections import OrderedDict
-from dateutil.relativedelta import relativedelta
-import calendar
-import matplotlib.pyplot as plt
-from money_tools import Rate
+from functools import cached_property
+from .rate import Rate, _parse_date_range, schedule_frame
+from .cache import RateCache, default_rate_cache
+from .store import ScheduleStore
+from .calendar_index import calendar_window
+from .compact import CompactSchedule, validate_compact
+from .engine import TOTALS, events_within, validate_events
+from .instrumentation import stage
 
 
-_general_plot_properties = dict(linewidth=1.0, marker='', linestyle='-')
+def _aggregate(schedule: pd.DataFrame, keys: np.ndarray, is_period_end: np.ndarray, dates: np.ndarray=None):
+    """Sum the payment columns of the schedule within each distinct key.
+
+    The End Balance of each key is taken from its rows flagged by ``is_period_end``, keys
+    without one are dropped. Passing ``dates`` adds the last Date of each key.
+    """
+    groups, group = np.unique(keys, return_inverse=True)
+    n_groups = len(groups)
+
+    aggregated = pd.DataFrame({column: np.bincount(group, weights=schedule[column].values, minlength=n_groups)
+                               for column in ['Payment', 'Interest', 'Additional_Payment']},
+                              index=groups)
+
+    if dates is not None:
+        last_date = np.full(n_groups, dates.min())
+        np.maximum.at(last_date, group, dates)
+        aggregated['Date'] = last_date.astype('datetime64[s]')
+
+    end_balance = np.full(n_groups, np.nan)
+    end_balance[group[is_period_end]] = schedule['End Balance'].values[is_period_end]
+    aggregated['End Balance'] = end_balance
+
+    has_end_balance = np.zeros(n_groups, dtype=bool)
+    has_end_balance[group[is_period_end]] = True
+    return aggregated.loc[has_end_balance]
 
 class Mortgage(object):
     """
@@ -28,7 +56,10 @@ class Mortgage(object):
 
         # TODO: add further config validation checks
 
-    def __init__(self, start_balance: float, rates_configs: list):
+    def __init__(self, start_balance: float, rates_configs: list, engine: str='exact',
+                 rate_cache: RateCache=default_rate_cache, schedule_store: ScheduleStore=None,
+                 interest_calculated: str='daily', events: list=None, day_count: str='ACT/365F',
+                 compact: str=None):
         """Creata a Mortgage object from which summary information can be viewed.
         
         Parameters
@@ -49,6 +80,29 @@ class Mortgage(object):
                 "end_date": '2020-12-31',
                 "payment_day": 1
             }
+        engine : str, optional
+            Amortization engine used by every rate, one of ``money_tools.engine.ENGINES``,
+            by default ``'exact'``. The ``'pence'`` engines keep every amount in whole pence.
+        rate_cache : RateCache, optional
+            Cache the rates are looked up in, so rates with the same inputs are only
+            computed once, by default the process-wide cache. None disables caching.
+        schedule_store : ScheduleStore, optional
+            On-disk store the daily schedule is loaded from, or saved to when it is first
+            calculated, by default None
+        interest_calculated : str, optional
+            ``'daily'``, or ``'monthly'`` for interest charged monthly, when the schedule
+            has a row per month rather than per day, by default ``'daily'``
+        events : list[dict], optional
+            Dated lump sums, payment changes, payment holidays and rate changes, see
+            ``money_tools.engine.validate_events``. Each rate applies the events dated
+            within it, and the part of any holiday that overlaps it. By default None
+        day_count : str, optional
+            Day count convention of the daily interest, one of
+            ``money_tools.calendar_index.DAY_COUNTS``, by default ``'ACT/365F'``
+        compact : str, optional
+            Keep the daily schedule as a ``money_tools.compact.CompactSchedule`` with
+            ``'pence'`` or ``'float32'`` amounts, and rebuild the daily arrays and frames
+            from it on each use rather than holding them, by default None
         """
         
         # Check rates not empty
@@ -59,115 +113,270 @@ class Mortgage(object):
         # Check all list entries are valid rates
         for rate_config in rates_configs:
             self.validate_rate_config(rate_config)
+        validate_events(events, engine, interest_calculated)
+        validate_compact(compact)
                 
+        self._construct(start_balance, rates_configs, engine, rate_cache, schedule_store, interest_calculated,
+                        events, day_count, compact)
+
+    def _construct(self, start_balance, rates_configs, engine, rate_cache, schedule_store, interest_calculated,
+                   events, day_count, compact, rates=()):
+        """Construct the rates of the mortgage, following on from any rates already constructed"""
         self.start_balance = start_balance
+        self.rates_configs = list(rates_configs)
+        self.engine = engine
+        self.interest_calculated = interest_calculated
+        self.events = list(events) if events else []
+        self.day_count = day_count
+        self.compact = compact
+        self.rate_cache = rate_cache
+        self.schedule_store = schedule_store
+        # Stage records of this mortgage, only added to while instrumentation is enabled
+        self.build_stats = []
 
         # Construct all rates
-        self.rates = list()
-        rate_start_balance = start_balance
-        for rate_config in rates_configs:
-            rate = Rate(
-                rate_start_balance,
-                rate_config['rate'],
-                rate_config['monthly_payment'],
-                start_date=rate_config['start_date'],
-                term=rate_config['term'],
-                end_date=rate_config['end_date'],
-                payment_day=rate_config['payment_day'],
-            )
-            rate_start_balance = rate.end_balance
-            self.rates.append(rate)
-
-        # Combine all the Schedules
-        self.schedule = None
-        for rate in self.rates:
-            if isinstance(self.schedule, pd.DataFrame):
-                self.schedule = self.schedule.append(rate.schedule, ignore_index=True)
-            else:
-                self.schedule = rate.schedule
+        self.rates = list(rates)
+        with stage(self.build_stats, 'rates') as rates_stage:
+            if rates_stage.enabled and rate_cache is not None:
+                hits, misses = rate_cache.hits, rate_cache.misses
+
+            rate_start_balance = self.rates[-1].end_balance if self.rates else start_balance
+            for rate_config in self.rates_configs[len(self.rates):]:
+                rate_events = None
+                if self.events:
+                    rate_events = events_within(self.events, *_parse_date_range(
+                        rate_config['start_date'], rate_config['term'], rate_config['end_date']))
+                rate_args = dict(
+                    start_date=rate_config['start_date'],
+                    term=rate_config['term'],
+                    end_date=rate_config['end_date'],
+                    payment_day=rate_config['payment_day'],
+                    engine=engine,
+                    interest_calculated=interest_calculated,
+                    events=rate_events,
+                    day_count=day_count,
+                )
+                if rate_cache is None:
+                    rate = Rate(rate_start_balance, rate_config['rate'], rate_config['monthly_payment'], **rate_args)
+                else:
+                    rate = rate_cache.get_rate(rate_start_balance, rate_config['rate'],
+                                               rate_config['monthly_payment'], **rate_args)
+                rate_start_balance = rate.end_balance
+                self.rates.append(rate)
+
+            if rates_stage.enabled:
+                rates_stage.set(rates=len(self.rates) - len(rates),
+                                rows=sum(rate.totals['Periods'] for rate in self.rates[len(rates):]))
+                if rate_cache is not None:
+                    rates_stage.set(cache_hits=rate_cache.hits - hits, cache_misses=rate_cache.misses - misses)
 
         # Mortage Rate Dates
-        self.start_date = self.schedule['Date'].iloc[0]
-        self.end_date = self.schedule['Date'].iloc[-1]
+        self.start_date = pd.Timestamp(self.rates[0].start_date)
+        last_rate = next((rate for rate in reversed(self.rates) if rate.totals['Periods']), self.rates[-1])
+        self.end_date = pd.Timestamp(last_rate.schedule_end_date)
 
         # Final end balances of all rates
         self.end_balance = self.rates[-1].end_balance
 
-        # Schedules expressed in other time granularities
-        self.schedule_monthly = self.calc_schedule_monthly()
-        self.schedule_yearly = self.calc_schedule_yearly()        
+    def with_rate(self, index: int, new_config: dict):
+        """New mortgage with the rate at ``index`` replaced by ``new_config``.
+
+        The rates before ``index`` are shared with this mortgage, only the rates from
+        ``index`` onwards are recomputed.
+        """
+        self.validate_rate_config(new_config)
+        rates_configs = list(self.rates_configs)
+        rates_configs[index] = new_config
+        index = range(len(rates_configs))[index]
+
+        mortgage = object.__new__(type(self))
+        mortgage._construct(self.start_balance, rates_configs, self.engine, self.rate_cache,
+                            self.schedule_store, self.interest_calculated, self.events, self.day_count,
+                            self.compact, rates=self.rates[:index])
+        return mortgage
+
+    def _cached_unless_compact(self, name: str, build):
+        """Value of a cached attribute, built on first use, or on every use of a compact mortgage"""
+        value = self.__dict__.get(name)
+        if value is None:
+            value = build()
+            if self.compact is None:
+                self.__dict__[name] = value
+        return value
+
+    @property
+    def schedule(self):
+        """Daily schedule of all the rates, calculated on first use, or rebuilt on each use when compact"""
+        def build():
+            # Each stage is timed apart from the stages it depends on
+            self.schedule_arrays if self.compact is None else self.compact_schedule
+            with stage(self.build_stats, 'schedule') as schedule_stage:
+                schedule = self.calc_schedule()
+                schedule_stage.set(rows=len(schedule))
+            return schedule
+        return self._cached_unless_compact('_schedule', build)
+
+    @cached_property
+    def schedule_monthly(self):
+        """Schedule aggregated to months, calculated on first use"""
+        # Built once and passed on, as a compact mortgage rebuilds it on each use
+        schedule = self.schedule
+        with stage(self.build_stats, 'schedule_monthly') as monthly_stage:
+            schedule_monthly = self.calc_schedule_monthly(schedule)
+            monthly_stage.set(rows=len(schedule_monthly))
+        return schedule_monthly
+
+    @cached_property
+    def schedule_yearly(self):
+        """Schedule aggregated to years, calculated on first use"""
+        # Built once and passed on, as a compact mortgage rebuilds it on each use
+        schedule = self.schedule
+        with stage(self.build_stats, 'schedule_yearly') as yearly_stage:
+            schedule_yearly = self.calc_schedule_yearly(schedule)
+            yearly_stage.set(rows=len(schedule_yearly))
+        return schedule_yearly
+
+    @cached_property
+    def totals(self):
+        """Totals across all the rates, calculated without building the daily schedule"""
+        totals = {key: sum(rate.totals[key] for rate in self.rates) for key in TOTALS[:-1]}
+        totals['End Balance'] = self.end_balance
+        return totals
         
     def __repr__(self):
         return 'Mortgage()'
         
-    def calc_schedule_monthly(self):
-        """Aggregate the schedule to Month Level"""
-        schedule = self.schedule
-        
-        schedule['year'] = schedule['Date'].dt.year
-        schedule['month'] = schedule['Date'].dt.month
-        schedule['day'] = schedule['Date'].dt.day
-        schedule['end_day'] = schedule[['year', 'month']].apply(lambda x: calendar.monthrange(x.year, x.month)[1],
-                                                                axis=1)
-
-
-        schedule_mon = schedule\
-            .groupby(['year', 'month'])\
-            .agg({'Payment': 'sum',
-                  'Interest': 'sum',
-                  'Additional_Payment': 'sum'
-                 }
-                )
+    @cached_property
+    def calendar(self):
+        """Window of the shared calendar index over the days of every rate"""
+        return calendar_window(min(rate.start_date for rate in self.rates), max(rate.end_date for rate in self.rates))
 
-        schedule_mon.index.names = ['year', 'month']
-        schedule_mon.reset_index(inplace=True)
-        
-        month_end_balances = schedule.loc[schedule['day'] == schedule['end_day'], 
-                                          ['year', 'month', 'End Balance']]
+    @property
+    def schedule_arrays(self):
+        """Date, Period and amount arrays of the daily schedule, see ``calc_schedule_arrays``.
 
-        
-        schedule_mon = schedule_mon.merge(month_end_balances, how='inner', on=['year', 'month'])
-        
-        schedule_mon['day'] = 1 # start of month
-        schedule_mon['Month Date'] = pd.to_datetime(schedule_mon[['year', 'month', 'day']])
+        Calculated on first use, or rebuilt from ``compact_schedule`` on each use when compact.
+        """
+        if self.compact is not None:
+            return self.compact_schedule.arrays()
+        return self._schedule_arrays
+
+    @cached_property
+    def _schedule_arrays(self):
+        return self._load_schedule_arrays()
+
+    @cached_property
+    def compact_schedule(self):
+        """Daily schedule as a ``CompactSchedule``, the only form a compact mortgage keeps it in"""
+        if self.compact is None:
+            return CompactSchedule.from_arrays(*self.schedule_arrays)
+        return CompactSchedule.from_arrays(*self._load_schedule_arrays(), compact=self.compact)
+
+    def _load_schedule_arrays(self):
+        """Schedule arrays from the schedule store, or calculated and stored"""
+        with stage(self.build_stats, 'schedule_arrays') as arrays_stage:
+            if self.schedule_store is None:
+                arrays = self.calc_schedule_arrays()
+            else:
+                key = self.schedule_store.key([(rate.start_balance, rate.annual_interest_rate, rate.monthly_payment,
+                                                rate.start_date.toordinal(), rate.end_date.toordinal(),
+                                                rate.payment_day, rate.engine, rate.interest_calculated,
+                                                rate.events, rate.day_count) for rate in self.rates])
+                arrays = self.schedule_store.get(key)
+                arrays_stage.set(store_hit=arrays is not None)
+                if arrays is None:
+                    arrays = self.calc_schedule_arrays()
+                    self.schedule_store.put(key, *arrays)
+            arrays_stage.set(rows=len(arrays[0]))
+        return arrays
+
+    def calc_schedule_arrays(self):
+        """Combine the daily schedule arrays of all the rates
+
+        The rates' column arrays are concatenated once, so the cost is linear in the
+        number of rates. Periods restart from 1 at the start of each rate. A compact
+        mortgage does not leave the arrays cached on its rates.
+        """
+        arrays = [rate.schedule_arrays if self.compact is None else rate.calc_schedule_arrays() for rate in self.rates]
+        days = np.concatenate([days for days, _ in arrays])
+        periods = np.concatenate([np.arange(1, len(days) + 1, dtype=np.int32) for days, _ in arrays])
+        amounts = np.concatenate([amounts for _, amounts in arrays])
+        return days, periods, amounts
+
+    def calc_schedule(self):
+        """Combine the daily schedules of all the rates"""
+        days, periods, amounts = self.schedule_arrays
+        return schedule_frame(days, amounts, periods)
+
+    def iter_schedule_chunks(self, rows: int=10_000):
+        """Daily schedule of all the rates as DataFrames of at most ``rows`` days each
+
+        Chunks are calculated as they are consumed, so the full schedule is never held
+        in memory. Concatenated they equal ``schedule``. A chunk never spans two rates.
+        """
+        for rate in self.rates:
+            yield from rate.iter_schedule_chunks(rows=rows)
+
+    def calc_schedule_monthly(self, schedule: pd.DataFrame=None):
+        """Aggregate the schedule, by default the daily schedule, to Month Level"""
+        schedule = self.schedule if schedule is None else schedule
+        days = schedule['Date'].values.astype('datetime64[D]')
+        months = days.astype('datetime64[M]')
+        calendar = self.calendar
+
+        # Only months with a month end day in the schedule have an End Balance
+        schedule_mon = _aggregate(schedule, months, calendar.month_end[calendar.positions(days)])
+
+        schedule_mon['Month Date'] = schedule_mon.index.values.astype('datetime64[s]')
 
         # Monthly principal amounts    
         schedule_mon['Principal'] = schedule_mon['Payment'] - schedule_mon['Interest']
+
+        return schedule_mon.reset_index(drop=True)
         
-        schedule_mon.drop(['day', 'month', 'year'], axis=1, inplace=True)
-        
-        return schedule_mon
-        
-    def calc_schedule_yearly(self):
-        """Aggregate the schedule to years"""
-        
-        schedule = self.schedule
+    def calc_schedule_yearly(self, schedule: pd.DataFrame=None):
+        """Aggregate the schedule, by default the daily schedule, to years"""
+        schedule = self.schedule if schedule is None else schedule
+        days = schedule['Date'].values.astype('datetime64[D]')
 
         # Yearly
-        start_date = schedule['Date'].min()
-        schedule['years_out'] = schedule['Date'].apply(lambda x: relativedelta(x, start_date).years)
-        schedule['end_of_year_window'] = schedule['years_out'].diff(-1).fillna(-1).abs()
-        
-        schedule_yr = schedule\
-            .groupby([schedule['years_out']])\
-            .agg({'Payment': 'sum',
-                  'Interest': 'sum',
-                  'Additional_Payment': 'sum',
-                  'Date': 'min',
-                  'Date': 'max'
-                 }
-                )
+        calendar = self.calendar
+        years = calendar.years_out(days.min())[calendar.positions(days)]
+        end_of_year_window = np.append(np.abs(np.diff(years)) == 1, True)
+
+        schedule_yr = _aggregate(schedule, years, end_of_year_window, dates=days)
+        schedule_yr.index.name = 'years_out'
 
         schedule_yr.reset_index(drop=False, inplace=True)
         schedule_yr['Principal'] = schedule_yr['Payment'] - schedule_yr['Interest']
-        
-        yearly_end_balances = schedule.loc[schedule['end_of_year_window'] == 1, 
-                                           ['years_out', 'End Balance']]
-
-        schedule_yr = schedule_yr.merge(yearly_end_balances, how='inner', on=['years_out'])
+        schedule_yr['End Balance'] = schedule_yr.pop('End Balance')
 
         return schedule_yr
         
+    @property
+    def _summary_index(self):
+        """Date ordered schedule columns with cumulative sums of the payment columns.
+
+        Built once, or on each use when compact, so the totals between any two dates are
+        the difference of two cumulative sums found by binary search.
+        """
+        return self._cached_unless_compact('_summary_index_arrays', self._build_summary_index)
+
+    def _build_summary_index(self):
+        schedule = self.schedule
+        with stage(self.build_stats, 'summary_index') as index_stage:
+            order = np.argsort(schedule['Date'].values, kind='stable')
+            dates = schedule['Date'].values.astype('datetime64[s]')[order]
+            amounts = schedule[['Payment', 'Interest', 'Additional_Payment']].values[order]
+            cumulative = np.zeros((len(order) + 1, 3))
+            np.cumsum(amounts, axis=0, out=cumulative[1:])
+
+            # Padded by one, so every range end is a valid index for reduceat
+            begin = np.append(schedule['Begin Balance'].values[order], np.nan)
+            end = schedule['End Balance'].values[order]
+            index_stage.set(rows=len(order))
+        return dates, cumulative, begin, end
+
     def payment_summary(self, start_date=None, end_date=None):
         """Summary of cost of mortgage between two dates"""
         
@@ -176,72 +385,71 @@ class Mortgage(object):
         
         if not end_date:
             end_date = self.end_date
-        
-        df = self.schedule \
-                 .loc[(self.schedule['Date'] >= start_date) & (self.schedule['Date'] <= end_date), :]
-        
-        summary = pd.DataFrame({'Start Balance': [df['Begin Balance'].max()],
-                                'Total Payments': [df['Payment'].sum()],
-                                'Total Interest': [df['Interest'].sum()],
-                                'Total Additional Payments': [df['Additional_Payment'].sum()],
-                                'End Balance': df.loc[df['Date'] == end_date, 'End Balance'].values,
-                                'Start Date': [df['Date'].min()],
-                                'End Date': [df['Date'].max()]},
+
+        return self.payment_summaries([(start_date, end_date)])
+
+    def payment_summaries(self, periods):
+        """Summaries of the cost of the mortgage over many periods at once.
+
+        Parameters
+        ----------
+        periods : iterable[tuple]
+            ``(start_date, end_date)`` pairs, each date may be a string, date or Timestamp
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per period, with the same columns as ``payment_summary``, or no rows
+            when the schedule has no days
+        """
+        dates, cumulative, begin, end = self._summary_index
+        periods = list(periods)
+        # Without any days, paid off before it starts or no days long, there is nothing to summarise
+        starts, ends = zip(*periods) if len(periods) and len(dates) else ((), ())
+        starts = pd.to_datetime(list(starts)).values.astype('datetime64[s]')
+        ends = pd.to_datetime(list(ends)).values.astype('datetime64[s]')
+
+        lo = np.searchsorted(dates, starts, side='left')
+        hi = np.searchsorted(dates, ends, side='right')
+        valid = hi > lo
+        hi = np.maximum(hi, lo)
+
+        totals = cumulative[hi] - cumulative[lo]
+        start_balance = np.maximum.reduceat(begin, np.column_stack([lo, hi]).ravel())[::2] \
+            if len(lo) else np.empty(0)
+        last = np.maximum(hi - 1, 0)
+        no_date = np.datetime64('NaT', 's')
+
+        summary = pd.DataFrame({'Start Balance': np.where(valid, start_balance, np.nan),
+                                'Total Payments': totals[:, 0],
+                                'Total Interest': totals[:, 1],
+                                'Total Additional Payments': totals[:, 2],
+                                'End Balance': np.where(valid, end[last], np.nan),
+                                'Start Date': np.where(valid, dates[np.minimum(lo, len(dates) - 1)], no_date),
+                                'End Date': np.where(valid, dates[last], no_date)},
                                index=None)
         
         return summary
 
+    def sensitivities(self, bumps: dict=None, analytic: bool=False):
+        """Change in total interest and balances from bumping each rate's inputs, see
+        ``money_tools.sensitivities.sensitivities``
+        """
+        from . import sensitivities
+        return sensitivities.sensitivities(self, bumps=bumps, analytic=analytic)
+
     # Plotting Methods
 
     def plot_monthly_schedule(self):
         """
-        Visual the monthly schedule
+        Visual the monthly schedule, see ``money_tools.plotting``
         """
-        monthly_schedule = self.schedule_monthly
-
-        fig, (ax1, ax2) = plt.subplots(2, 1, sharex=True, figsize=(6, 10))
-        
-        # remaining Balance plots
-        ax1.plot(monthly_schedule["Month Date"], monthly_schedule["End Balance"], color='r', label='End Balance', **_general_plot_properties)
-
-        # Breakdown of monthly payment plots
-        ax2.plot(monthly_schedule["Month Date"], monthly_schedule["Payment"], color='k', label='Payment', **_general_plot_properties)
-        ax2.plot(monthly_schedule["Month Date"], monthly_schedule["Interest"], color='b', label='Interest Paid', **_general_plot_properties)
-        ax2.plot(monthly_schedule["Month Date"], monthly_schedule["Principal"], color='g', label='Pricipal Paid', **_general_plot_properties)
-        
-        ax1.set_ylabel('Amount')
-        ax2.set_ylabel('Amount')
-        ax2.set_xlabel('Payment Month')
-        
-        # rotate x-labels 45deg
-        for tick in ax2.get_xticklabels():
-            tick.set_rotation(45)
-
-        ax1.legend()
-        ax2.legend()
+        from . import plotting
+        plotting.plot_monthly_schedule(self.schedule_monthly)
 
-        ax1.title.set_text('Monthly Payment Schedule')
-        
     def plot_cumulative_monthly_schedule(self):
         """
-        Visualise the cumulative monthly schedule 
+        Visualise the cumulative monthly schedule, see ``money_tools.plotting``
         """
-
-        monthly_schedule = self.schedule_monthly
-        
-        monthly_schedule['Cumulative Payment'] = monthly_schedule['Payment'].cumsum()
-        monthly_schedule['Cumulative Principal'] = monthly_schedule['Principal'].cumsum()
-        monthly_schedule['Cumulative Interest'] = monthly_schedule['Interest'].cumsum()
-        
-        plt.figure()
-        plt.plot(monthly_schedule["Month Date"], monthly_schedule["End Balance"], color='r', label='Remaining Balance', **_general_plot_properties)
-        plt.plot(monthly_schedule["Month Date"], monthly_schedule["Cumulative Payment"], color='k', label='Cumulative Payments', **_general_plot_properties)
-        plt.plot(monthly_schedule["Month Date"], monthly_schedule["Cumulative Principal"], color='b', label='Cumulative Principal Paid', **_general_plot_properties)
-        plt.plot(monthly_schedule["Month Date"], monthly_schedule["Cumulative Interest"], color='g', label='Cumulative Interest Paid', **_general_plot_properties)
-        
-        plt.legend()
-        plt.xlabel('Payment Month')
-        plt.xticks(rotation=45)
-        plt.ylabel('Amount')
-
-        plt.title('Cumulative Monthly Payment Schedule')
+        from . import plotting
+        plotting.plot_cumulative_monthly_schedule(self.schedule_monthly)
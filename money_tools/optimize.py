@@ -0,0 +1,160 @@
+"""
+Find the cheapest sequences of mortgage products across successive fix periods.
+"""
+import bisect
+import heapq
+import itertools
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+
+from .cache import RateCache
+from .rate import _parse_date_range
+
+
+def validate_product(product: dict):
+    """Validate a product dict from a menu."""
+    if not isinstance(product, dict):
+        raise ValueError(f'Product must be dict object. Recieved a product of type {type(product)}')
+    missing = {'rate', 'monthly_payment', 'term'} - set(product)
+    if missing:
+        raise ValueError(f'Product is missing {sorted(missing)}')
+
+
+def _prune(states: list, top_k: int, balance_bucket: float):
+    """Drop the states that cannot lead to one of the top_k plans.
+
+    A state is dropped when at least top_k others have both a lower or equal balance and
+    a lower or equal cost, as every continuation of those is at least as cheap. With a
+    balance_bucket, only the top_k cheapest states within each bucket of balances are kept.
+    """
+    states = sorted(states, key=lambda state: (state[1], state[0]))
+
+    kept = []
+    costs = []
+    for state in states:
+        cost = state[0]
+        if bisect.bisect_right(costs, cost) < top_k:
+            kept.append(state)
+        bisect.insort(costs, cost)
+
+    if balance_bucket:
+        buckets = itertools.groupby(sorted(kept, key=lambda state: (state[1] // balance_bucket, state[0])),
+                                    key=lambda state: state[1] // balance_bucket)
+        kept = [state for _, bucket in buckets for state in itertools.islice(bucket, top_k)]
+    return kept
+
+
+def optimize_plans(start_balance: float, menus: list, start_date, term=None, end_date=None, payment_day: int=1,
+                   top_k: int=3, balance_bucket: float=None, engine: str='exact', rate_cache: RateCache=None):
+    """Cheapest sequences of products, by total interest plus fees, up to the end date.
+
+    The search is a dynamic programme over ``(renewal date, balance)`` states, from the
+    start date forwards. Each product taken from a state runs for its term, or up to the
+    end date, and leads to a new state at the next renewal date. States are only compared
+    with others at the same renewal date facing the same menu. Segment results are
+    memoized in a ``RateCache`` keyed on the balance to the penny, so paths that meet at
+    the same date and balance share their remaining work.
+
+    Parameters
+    ----------
+    start_balance : float
+        The starting balance owed
+    menus : list[list[dict]]
+        Products available at each renewal, the first menu at the start date. The last
+        menu is reused for any further renewals. Each product has the structure::
+
+            {
+                "rate": 0.0163,
+                "monthly_payment": 1167.02,
+                "fee": 999,
+                "term": 2
+            }
+
+        with the term in years. A ``"name"`` may be added to identify the product.
+    start_date : date or str
+        Date of the first product
+    term : int, optional
+        Length in years of the period compared, if ``end_date`` is not given
+    end_date : date or str, optional
+        Last day of the period compared
+    payment_day : int, optional
+        Day of the month when monthly payments are taken, by default 1
+    top_k : int, optional
+        Number of plans returned, by default 3
+    balance_bucket : float, optional
+        Width of the balance buckets states are grouped into at each renewal date, only
+        the top_k cheapest in each bucket are extended. Faster, but no longer exact.
+        By default no bucketing.
+    engine : str, optional
+        Amortization engine, by default ``'exact'``
+    rate_cache : RateCache, optional
+        Cache for the segment results, by default a new cache for this search
+
+    Returns
+    -------
+    list[dict]
+        The top_k plans, cheapest first, each with the ``rates_configs`` to build it as a
+        ``Mortgage``, the chosen ``products``, and its Total Interest, Total Fees,
+        Total Cost and End Balance.
+    """
+    if not menus or not all(menus):
+        raise ValueError('Every menu must have at least one product')
+    for product in itertools.chain.from_iterable(menus):
+        validate_product(product)
+
+    start_date, end_date = (day.date() if isinstance(day, datetime) else day
+                            for day in _parse_date_range(start_date, term, end_date))
+    rate_cache = rate_cache if rate_cache is not None else RateCache(maxsize=4096)
+
+    # States waiting at each renewal date and menu position: (cost, balance, interest, fees, configs, products).
+    # States facing different menus lead to different plans, so are only pruned against their own key
+    pending = {(start_date, 0): [(0.0, start_balance, 0.0, 0.0, (), ())]}
+    keys = [(start_date, 0)]
+    finished = []
+
+    while keys:
+        key = heapq.heappop(keys)
+        renewal_date, position = key
+        states = _prune(pending.pop(key), top_k, balance_bucket)
+
+        for cost, balance, interest, fees, configs, products in states:
+            for product in menus[position]:
+                product_end = renewal_date + relativedelta(years=product['term'], days=-1)
+                config = {
+                    "rate": product['rate'],
+                    "monthly_payment": product['monthly_payment'],
+                    "start_date": renewal_date,
+                    "term": None,
+                    "end_date": min(product_end, end_date),
+                    "payment_day": payment_day
+                }
+                # Keyed on the balance in pence, the engines' own starting state, so branches
+                # meeting at the same balance to the penny share the segment
+                rate = rate_cache.get_rate(round(balance, 2), config['rate'], config['monthly_payment'],
+                                           start_date=renewal_date, end_date=config['end_date'],
+                                           payment_day=payment_day, engine=engine)
+                fee = product.get('fee', 0)
+                state = (cost + rate.totals['Total Interest'] + fee,
+                         rate.end_balance,
+                         interest + rate.totals['Total Interest'],
+                         fees + fee,
+                         configs + (config,),
+                         products + (product,))
+
+                if config['end_date'] >= end_date or rate.end_balance <= 0:
+                    finished.append(state)
+                else:
+                    next_key = (config['end_date'] + relativedelta(days=1), min(len(products) + 1, len(menus) - 1))
+                    if next_key not in pending:
+                        pending[next_key] = []
+                        heapq.heappush(keys, next_key)
+                    pending[next_key].append(state)
+
+    best = sorted(finished, key=lambda state: (state[0], state[1]))[:top_k]
+    return [{'rates_configs': list(configs),
+             'products': list(products),
+             'Total Interest': interest,
+             'Total Fees': fees,
+             'Total Cost': cost,
+             'End Balance': balance}
+            for cost, balance, interest, fees, configs, products in best]
@@ -0,0 +1,155 @@
+"""
+Build large batches of Mortgages across a pool of worker processes.
+"""
+import collections
+import itertools
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .mortgage import Mortgage
+
+
+SUMMARY_FIELDS = ['Start Balance', 'Total Payments', 'Total Interest', 'Total Additional Payments',
+                  'End Balance', 'Start Date', 'End Date']
+
+# Marks the end of the tasks fed to a pool
+_DONE = object()
+
+
+def _summary_array(mortgage: Mortgage) -> np.ndarray:
+    """Pack the payment summary of a mortgage into a float array, dates as day numbers.
+
+    A mortgage without any schedule days, such as one starting paid off, has an empty
+    payment summary, so is packed from its totals and its start and end dates instead.
+    """
+    summary = mortgage.payment_summary()
+    if summary.empty:
+        totals = mortgage.totals
+        summary = {'Start Balance': round(float(mortgage.start_balance), 2), 'Start Date': mortgage.start_date,
+                   'End Date': mortgage.end_date, **{field: totals[field] for field in SUMMARY_FIELDS[1:5]}}
+    else:
+        summary = summary.iloc[0]
+    values = [summary[field] for field in SUMMARY_FIELDS[:5]]
+    values += [summary[field].to_datetime64().astype('datetime64[D]').astype(np.int64)
+               for field in SUMMARY_FIELDS[5:]]
+    return np.array(values, dtype=np.float64)
+
+
+def _run_chunk(chunk: list, engine: str):
+    """Worker task, summarising a chunk of ``(index, start_balance, rates_configs)`` entries.
+
+    Returns the indices and summary arrays of the mortgages that were built, stacked into
+    single arrays, and a list of ``(index, error message)`` for the ones that failed.
+    """
+    indices = []
+    summaries = []
+    errors = []
+    for index, start_balance, rates_configs in chunk:
+        try:
+            summaries.append(_summary_array(Mortgage(start_balance, rates_configs, engine=engine)))
+            indices.append(index)
+        except Exception as err:
+            errors.append((index, f'{type(err).__name__}: {err}'))
+
+    summaries = np.vstack(summaries) if summaries else np.empty((0, len(SUMMARY_FIELDS)))
+    return np.array(indices, dtype=np.int64), summaries, errors
+
+
+def _unpack_chunk(result):
+    """Turn a worker result back into ``(index, summary, error)`` tuples."""
+    indices, summaries, errors = result
+    unpacked = [(index, None, error) for index, error in errors]
+    for index, values in zip(indices.tolist(), summaries):
+        summary = dict(zip(SUMMARY_FIELDS[:5], values[:5].tolist()))
+        for field, day in zip(SUMMARY_FIELDS[5:], values[5:]):
+            summary[field] = pd.Timestamp(np.datetime64(int(day), 'D'))
+        unpacked.append((index, summary, None))
+    return sorted(unpacked, key=lambda item: item[0])
+
+
+def run_mortgages(configs, workers: int=None, chunksize: int=16, ordered: bool=True, engine: str='exact'):
+    """Build and summarise many mortgages across a pool of processes.
+
+    Parameters
+    ----------
+    configs : iterable[tuple[float, list[dict]]]
+        ``(start_balance, rates_configs)`` pairs, as taken by ``Mortgage``. Consumed
+        lazily, so it can be a generator over a large book.
+    workers : int, optional
+        Number of worker processes, by default one per CPU
+    chunksize : int, optional
+        Number of mortgages sent to a worker in one task, by default 16
+    ordered : bool, optional
+        Yield results in the order of ``configs``, otherwise as soon as each chunk
+        completes, by default True
+    engine : str, optional
+        Amortization engine used by every mortgage, by default ``'exact'``
+
+    Yields
+    ------
+    tuple[int, dict, str]
+        The position of the config in ``configs``, its payment summary as a dict with
+        the ``Mortgage.payment_summary`` columns, and an error message. A config that
+        fails to build yields a ``None`` summary and its error, without stopping the run.
+    """
+    if chunksize < 1:
+        raise ValueError('chunksize must be at least 1')
+
+    numbered = ((index, start_balance, rates_configs)
+                for index, (start_balance, rates_configs) in enumerate(configs))
+    chunks = iter(lambda: list(itertools.islice(numbered, chunksize)), [])
+
+    for result in bounded_map(_run_chunk, chunks, engine, workers=workers, ordered=ordered):
+        yield from _unpack_chunk(result)
+
+
+def bounded_map(fn, tasks, *args, workers: int=None, ordered: bool=True):
+    """Run ``fn(task, *args)`` for each task across a pool of processes, yielding the results.
+
+    At most two tasks per worker are in flight, so tasks are read from the iterable only
+    as results are consumed, and a slow consumer holds back the producer.
+
+    Parameters
+    ----------
+    fn : callable
+        Picklable function run in the workers
+    tasks : iterable
+        First argument of each call, consumed lazily
+    *args
+        Further arguments of every call
+    workers : int, optional
+        Number of worker processes, by default one per CPU
+    ordered : bool, optional
+        Yield results in the order of ``tasks``, otherwise as each completes, by default True
+    """
+    tasks = iter(tasks)
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Bound the tasks in flight so a long iterable of tasks is not read in all at once
+        max_pending = 2 * workers
+        pending = collections.deque()
+
+        def submit_next():
+            task = next(tasks, _DONE)
+            if task is not _DONE:
+                pending.append(executor.submit(fn, task, *args))
+            return task is not _DONE
+
+        while len(pending) < max_pending and submit_next():
+            pass
+
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [future for future in pending if future in finished]
+                for future in done:
+                    pending.remove(future)
+
+            for future in done:
+                submit_next()
+                yield future.result()
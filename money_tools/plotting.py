@@ -0,0 +1,62 @@
+"""
+Plots of mortgage schedules.
+
+matplotlib is only imported with this module, which ``Mortgage``'s plot methods
+import on first use.
+"""
+import matplotlib.pyplot as plt
+
+
+_general_plot_properties = dict(linewidth=1.0, marker='', linestyle='-')
+
+
+def plot_monthly_schedule(monthly_schedule):
+    """
+    Visual a monthly schedule, as ``Mortgage.schedule_monthly``
+    """
+    fig, (ax1, ax2) = plt.subplots(2, 1, sharex=True, figsize=(6, 10))
+    
+    # remaining Balance plots
+    ax1.plot(monthly_schedule["Month Date"], monthly_schedule["End Balance"], color='r', label='End Balance', **_general_plot_properties)
+
+    # Breakdown of monthly payment plots
+    ax2.plot(monthly_schedule["Month Date"], monthly_schedule["Payment"], color='k', label='Payment', **_general_plot_properties)
+    ax2.plot(monthly_schedule["Month Date"], monthly_schedule["Interest"], color='b', label='Interest Paid', **_general_plot_properties)
+    ax2.plot(monthly_schedule["Month Date"], monthly_schedule["Principal"], color='g', label='Pricipal Paid', **_general_plot_properties)
+    
+    ax1.set_ylabel('Amount')
+    ax2.set_ylabel('Amount')
+    ax2.set_xlabel('Payment Month')
+    
+    # rotate x-labels 45deg
+    for tick in ax2.get_xticklabels():
+        tick.set_rotation(45)
+
+    ax1.legend()
+    ax2.legend()
+
+    ax1.title.set_text('Monthly Payment Schedule')
+
+
+def plot_cumulative_monthly_schedule(monthly_schedule):
+    """
+    Visualise the cumulative monthly schedule, without adding the cumulative columns to it
+    """
+    monthly_schedule = monthly_schedule.copy()
+    
+    monthly_schedule['Cumulative Payment'] = monthly_schedule['Payment'].cumsum()
+    monthly_schedule['Cumulative Principal'] = monthly_schedule['Principal'].cumsum()
+    monthly_schedule['Cumulative Interest'] = monthly_schedule['Interest'].cumsum()
+    
+    plt.figure()
+    plt.plot(monthly_schedule["Month Date"], monthly_schedule["End Balance"], color='r', label='Remaining Balance', **_general_plot_properties)
+    plt.plot(monthly_schedule["Month Date"], monthly_schedule["Cumulative Payment"], color='k', label='Cumulative Payments', **_general_plot_properties)
+    plt.plot(monthly_schedule["Month Date"], monthly_schedule["Cumulative Principal"], color='b', label='Cumulative Principal Paid', **_general_plot_properties)
+    plt.plot(monthly_schedule["Month Date"], monthly_schedule["Cumulative Interest"], color='g', label='Cumulative Interest Paid', **_general_plot_properties)
+    
+    plt.legend()
+    plt.xlabel('Payment Month')
+    plt.xticks(rotation=45)
+    plt.ylabel('Amount')
+
+    plt.title('Cumulative Monthly Payment Schedule')
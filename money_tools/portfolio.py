@@ -0,0 +1,229 @@
+"""
+Amortize a whole book of loans together, held as parallel arrays rather than Mortgages.
+"""
+import numpy as np
+import pandas as pd
+from functools import cached_property
+
+from .calendar_index import calendar_window
+from .engine import ANNUAL_PAYMENTS, TOTALS, round2
+from .rate import _parse_date_range
+
+
+class Portfolio(object):
+    """
+    Book of loans, each made up of a sequence of rates like a ``Mortgage``.
+
+    The loans are stored as arrays with one row per loan and one column per rate, and
+    are stepped through time together a day at a time with the exact engine. Every
+    loan's totals and end balance are the ones its ``Mortgage`` gives, without any
+    per-loan objects or schedules being built.
+    """
+
+    def __init__(self, start_balance, rates, monthly_payments, start_dates, end_dates, payment_days=1):
+        """Create a portfolio from arrays of loan parameters.
+
+        Parameters
+        ----------
+        start_balance : array_like
+            Starting balance of each loan, shape ``(n_loans,)``
+        rates : array_like
+            Annual interest rate of each rate of each loan, expressed as a decimal,
+            shape ``(n_loans, n_rates)``
+        monthly_payments : array_like
+            Monthly payment of each rate, broadcast against ``rates``
+        start_dates, end_dates : array_like
+            First and last day of each rate, as datetime64 or date strings, broadcast
+            against ``rates``. Loans with fewer rates are padded with NaT start dates.
+        payment_days : array_like, optional
+            Day of the month payments are taken on in each rate, by default 1
+        """
+        self.start_balance = np.asarray(start_balance, dtype=np.float64).reshape(-1)
+        n_loans = len(self.start_balance)
+
+        rates = np.asarray(rates, dtype=np.float64).reshape(n_loans, -1)
+        shape = rates.shape
+        self.rates = rates
+        self.monthly_payments = np.broadcast_to(np.asarray(monthly_payments, dtype=np.float64), shape)
+        self.start_dates = np.broadcast_to(np.asarray(start_dates, dtype='datetime64[D]'), shape)
+        self.end_dates = np.broadcast_to(np.asarray(end_dates, dtype='datetime64[D]'), shape)
+        self.payment_days = np.broadcast_to(np.asarray(payment_days, dtype=np.int64), shape)
+
+        has_rate = ~np.isnat(self.start_dates)
+        if not has_rate.any():
+            raise ValueError('The portfolio must have at least one rate')
+        if np.isnat(self.end_dates[has_rate]).any():
+            raise ValueError('Every rate with a start date needs an end date')
+        self._has_rate = has_rate
+
+    @classmethod
+    def from_configs(cls, start_balances, rates_configs_list):
+        """Create a portfolio from the arguments of one ``Mortgage`` per loan.
+
+        Parameters
+        ----------
+        start_balances : list[float]
+            Starting balance of each loan
+        rates_configs_list : list[list[dict]]
+            The ``rates_configs`` of each loan, as for ``Mortgage``
+        """
+        if len(start_balances) != len(rates_configs_list):
+            raise ValueError('There must be one list of rates configs per start balance')
+
+        n_rates = max(len(configs) for configs in rates_configs_list)
+        shape = (len(start_balances), n_rates)
+        rates = np.zeros(shape)
+        monthly_payments = np.zeros(shape)
+        start_dates = np.full(shape, np.datetime64('NaT'), dtype='datetime64[D]')
+        end_dates = np.full(shape, np.datetime64('NaT'), dtype='datetime64[D]')
+        payment_days = np.ones(shape, dtype=np.int64)
+
+        for i, rates_configs in enumerate(rates_configs_list):
+            for j, config in enumerate(rates_configs):
+                start, end = _parse_date_range(config['start_date'], config['term'], config['end_date'])
+                rates[i, j] = config['rate']
+                monthly_payments[i, j] = config['monthly_payment']
+                start_dates[i, j] = start
+                end_dates[i, j] = end
+                payment_days[i, j] = config['payment_day']
+
+        return cls(start_balances, rates, monthly_payments, start_dates, end_dates, payment_days)
+
+    def __repr__(self):
+        return 'Portfolio(n_loans={}, n_rates={})'.format(*self.rates.shape)
+
+    def __len__(self):
+        return len(self.start_balance)
+
+    @cached_property
+    def _results(self):
+        return self.calc_results()
+
+    @property
+    def totals(self) -> dict:
+        """``TOTALS`` arrays of every loan, as ``Mortgage.totals`` gives for each"""
+        return self._results['totals']
+
+    @property
+    def end_balance(self) -> np.ndarray:
+        """End balance of every loan"""
+        return self._results['totals']['End Balance']
+
+    @property
+    def end_date(self) -> np.ndarray:
+        """Last day of every loan's schedule, earlier than its last rate's end date if paid off"""
+        return self._results['end_date']
+
+    @property
+    def schedule_monthly(self) -> pd.DataFrame:
+        """Book level monthly totals, see ``calc_results``"""
+        return self._results['schedule_monthly']
+
+    def calc_results(self) -> dict:
+        """Step every loan through each day from the first start date to the last end date.
+
+        Each rate starts from the previous rate's end balance rounded to 2dp, as the
+        rates of a ``Mortgage`` do, and a loan stops once its balance is cleared.
+
+        The book level monthly totals have the Payment, Interest and Additional_Payment
+        of every loan summed within each month, and the End Balance summed over the
+        loans with a schedule on the last day of the month, counted in Loans. Unlike a
+        loan's own monthly schedule, the payments of the month a loan is paid off in
+        are kept.
+        """
+        has_rate = self._has_rate
+        first_day = self.start_dates[has_rate].min()
+        calendar = calendar_window(first_day, self.end_dates[has_rate].max())
+        days = calendar.days
+        n_loans = len(self)
+
+        # Rate switches, ordered by the day index they take effect on
+        loan_idx, rate_idx = np.nonzero(has_rate)
+        switch_day = (self.start_dates[loan_idx, rate_idx] - first_day).astype(np.int64)
+        order = np.argsort(switch_day, kind='stable')
+        loan_idx, rate_idx, switch_day = loan_idx[order], rate_idx[order], switch_day[order]
+        switch_bounds = np.searchsorted(switch_day, np.arange(len(days) + 1))
+        end_day = (self.end_dates - first_day).astype(np.int64)
+
+        # State of each loan's current rate, as a rate ending before day 0 until its first starts
+        balance = self.start_balance.copy()
+        daily_rate = np.zeros(n_loans)
+        pmt_due = np.zeros(n_loans)
+        pay_day = np.zeros(n_loans, dtype=np.int64)
+        rate_end = np.full(n_loans, -1, dtype=np.int64)
+
+        rows = np.zeros(n_loans, dtype=np.int64)
+        last_row = np.full(n_loans, -1, dtype=np.int64)
+        # Running totals of each loan's current rate, added to the loan's totals as the rate
+        # ends, so they are summed in the same order as Mortgage.totals sums its rates' totals
+        rate_totals = np.zeros((3, n_loans))
+        totals = np.zeros((3, n_loans))
+
+        months = days.astype('datetime64[M]')
+        month_idx = (months - months[0]).astype(np.int64)
+        n_months = month_idx[-1] + 1
+        monthly = np.zeros((4, n_months))
+        month_loans = np.zeros(n_months, dtype=np.int64)
+        month_has_end = np.zeros(n_months, dtype=bool)
+        dom = calendar.day_of_month
+        month_end = calendar.month_end
+
+        for t in range(len(days)):
+            lo, hi = switch_bounds[t], switch_bounds[t + 1]
+            if hi > lo:
+                loans, cols = loan_idx[lo:hi], rate_idx[lo:hi]
+                totals[:, loans] += rate_totals[:, loans]
+                rate_totals[:, loans] = 0.0
+                daily_rate[loans] = self.rates[loans, cols] / ANNUAL_PAYMENTS
+                pmt_due[loans] = round2(self.monthly_payments[loans, cols])
+                pay_day[loans] = self.payment_days[loans, cols]
+                rate_end[loans] = end_day[loans, cols]
+                balance[loans] = round2(balance[loans])
+
+            active = (rate_end >= t) & (balance > 0)
+            if not active.any():
+                continue
+
+            # Interest on every active loan, then payments on just the loans paying today
+            daily_interest = round2(daily_rate * balance)
+            daily_interest *= active
+            balance += daily_interest
+            paying = np.flatnonzero(active & (pay_day == dom[t]))
+            pmt = np.minimum(pmt_due[paying], balance[paying])
+            balance[paying] -= pmt
+
+            rate_totals[0, paying] += pmt
+            rate_totals[1] += daily_interest
+            rows += active
+            np.copyto(last_row, t, where=active)
+
+            m = month_idx[t]
+            monthly[0, m] += pmt.sum()
+            monthly[1, m] += daily_interest.sum()
+            if month_end[t]:
+                monthly[3, m] = balance[active].sum()
+                month_loans[m] = active.sum()
+                month_has_end[m] = True
+
+        totals += rate_totals
+
+        # Loans without a row keep their opening balance, rounded as an empty rate rounds it
+        balance = np.where(rows > 0, balance, round2(balance))
+
+        schedule_monthly = pd.DataFrame({
+            'Payment': monthly[0],
+            'Interest': monthly[1],
+            'Additional_Payment': monthly[2],
+            'End Balance': monthly[3],
+            'Loans': month_loans,
+            'Month Date': np.unique(months).astype('datetime64[s]'),
+        })
+        schedule_monthly = schedule_monthly.loc[month_has_end].reset_index(drop=True)
+        schedule_monthly['Principal'] = schedule_monthly['Payment'] - schedule_monthly['Interest']
+
+        end_date = np.where(last_row >= 0, days[np.maximum(last_row, 0)], np.datetime64('NaT'))
+        return {
+            'totals': dict(zip(TOTALS, (rows, *totals, balance))),
+            'end_date': end_date.astype('datetime64[D]'),
+            'schedule_monthly': schedule_monthly,
+        }
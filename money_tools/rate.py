@@ -1,87 +1,45 @@
 """
 Rates that make up a Mortgage.
 """
-import pandas as pd
 from datetime import datetime, date
 import numpy as np
-from collections import OrderedDict
 from dateutil.relativedelta import relativedelta
-import calendar
-import matplotlib.pyplot as plt
-
-
-def _amortize(principal: float, interest_rate: float, monthly_pmt: float, start_date: date, end_date: date,
-              addl_principal: float=0, payment_day: int=1
-    ):
-    """Creates the amortization table entries.
-    
-    Parameters
-    ----------
-    principal : float
-        Starting loan amount.
-    interest_rate : float
-        The interest rate expressed as a decimal.
-    monthly_pmt : float
-        The regular monthly payment amount
-    start_date : date
-        Starting date to build amortisation table
-    end_date : date
-        End date to build the amortisation table up to
-    addl_principal : float, optional
-        Any additional monthly payment made at the same time as the monthly_pmt, by default 0
-    payment_day : int, optional
-        Day of the month when monthly payments are taken, by default 1 for the first day of the month
-
-    Yields
-    ------
-    OrderedDict
+from functools import cached_property
+from typing import TYPE_CHECKING
+from .engine import (AMOUNT_COLUMNS, amortize_arrays, amortize_chunks, amortize_totals, to_records, validate_engine,
+                     validate_events)
 
-    """
-    ANNUAL_PAYMENTS = 365  # TODO deal with leap years
-
-    # initialize the variables to keep track of the periods and running balances
-    p = 1
-    beg_balance = round(principal, 2)
-    end_balance = round(beg_balance, 2)
-    running_date = start_date
+if TYPE_CHECKING:
+    import pandas as pd
 
-    while end_balance > 0 and running_date <= end_date:
 
-        # Recalculate the interest based on the current balance
-        daily_interest = round(((interest_rate/ANNUAL_PAYMENTS) * beg_balance), 2)
+def schedule_frame(days: np.ndarray, amounts: np.ndarray, periods: np.ndarray=None) -> 'pd.DataFrame':
+    """Wrap schedule column arrays in a DataFrame.
 
-        # Payments only made 1 day a month
-        if running_date.day == payment_day:
-            pmt = round(monthly_pmt, 2)
-            # Determine payment based on whether or not this period will pay off the loan
-            pmt = min(pmt, beg_balance + daily_interest)
-            principal = pmt - daily_interest
-            # Ensure additional payment gets adjusted if the loan is being paid off
-            addl_pmt = min(round(addl_principal, 2), beg_balance - principal)
-        else:
-            pmt = 0
-            addl_pmt = 0
-
-        # Updated balance at end of day
-        end_balance = beg_balance + daily_interest - (pmt + addl_pmt)
+    The amounts are used as the DataFrame's float block without being copied.
+    """
+    # pandas is only imported once a frame is needed, the arrays and totals do without it
+    import pandas as pd
 
-        yield OrderedDict([('Date',running_date),
-                            ('Period', p),
-                            ('Begin Balance', beg_balance),
-                            ('Payment', pmt),
-                            ('Interest', daily_interest),
-                            ('Additional_Payment', addl_pmt),
-                            ('End Balance', end_balance)])
+    if periods is None:
+        periods = np.arange(1, len(days) + 1, dtype=np.int32)
+    schedule = pd.DataFrame(amounts, columns=list(AMOUNT_COLUMNS), copy=False)
+    schedule.insert(0, 'Period', periods)
+    schedule.insert(0, 'Date', days.astype('datetime64[s]', copy=False))
+    return schedule
 
-        # Increment the counter, balance and date
-        p += 1
-        running_date += relativedelta(days=1)
-        beg_balance = end_balance
 
+def amortize_table(*args, as_array=False, **kwargs):
+    """create an amortization table as a dataframe
 
-def amortize_table(*args, **kwargs):
-    """create an amortization table as a dataframe"""
-    return pd.DataFrame(_amortize(*args, **kwargs))
+    Takes the same arguments as ``money_tools.engine.amortize_arrays``. With
+    ``as_array=True`` the table is returned as a numpy structured array, without using
+    pandas.
+    """
+    days, amounts = amortize_arrays(*args, **kwargs)
+    if as_array:
+        return to_records(days, amounts)
+    return schedule_frame(days, amounts)
 
 
 dt_fmt = '%Y-%m-%d'
@@ -97,38 +55,50 @@ def _parse_date(date_input, error_msg=None):
     else:
         raise ValueError(error_msg)
 
+def _parse_date_range(start_date, term=None, end_date=None):
+    """Parse the start date and the end date given either directly or as a term in years
+    """
+    INVALID_DATE_ERROR_MSG = 'Value of {} must be a date object or valid date string.'
+    start_date = _parse_date(start_date, error_msg=INVALID_DATE_ERROR_MSG.format('start_date'))
+
+    if not term and not end_date:
+        raise ValueError('No term or end_date provide, provide one or the other.')
+    elif term and not end_date:
+        end_date = start_date + relativedelta(years=term)
+    elif not term and end_date:
+        end_date = _parse_date(end_date, error_msg=INVALID_DATE_ERROR_MSG.format('end_date'))
+    elif term and end_date:
+        raise Warning('Both term and end_date defined. Defaulting to use end_date value.')
+    else:
+        raise ValueError('Unexpected values of term and end_date provide.')
+
+    return start_date, end_date
+
+
 class Rate:
     """Base class for rates that make up a mortgage/loan
     """
 
     def __init__(self, start_balance, annual_interest_rate, monthly_payment, start_date=date.today(),
-                 term=None, end_date=None, payment_day=1):
+                 term=None, end_date=None, payment_day=1, engine='exact', interest_calculated='daily', events=None,
+                 day_count='ACT/365F'):
         self.start_balance = start_balance
         self.annual_interest_rate = annual_interest_rate
-        self.interest_calculated = 'daily'
+        self.interest_calculated = interest_calculated
         self.monthly_payment = monthly_payment
         
         # Parse days
-        INVALID_DATE_ERROR_MSG = 'Value of {} must be a date object or valid date string.'
-        self.start_date = _parse_date(start_date, error_msg=INVALID_DATE_ERROR_MSG.format('start_date'))
- 
-        if not term and not end_date:
-            raise ValueError('No term or end_date provide, provide one or the other.')
-        elif term and not end_date:
-            self.end_date = self.start_date + relativedelta(years=term)
-        elif not term and end_date:
-            self.end_date = _parse_date(end_date, error_msg=INVALID_DATE_ERROR_MSG.format('end_date'))
-        elif term and end_date:
-            self.end_date = _parse_date(end_date, error_msg=INVALID_DATE_ERROR_MSG.format('end_date'))
-            raise Warning('Both term and end_date defined. Defaulting to use end_date value.')
-        else:
-            raise ValueError('Unexpected values of term and end_date provide.')
+        self.start_date, self.end_date = _parse_date_range(start_date, term, end_date)
         
         self.payment_day = payment_day
-        
-        # make daily schedule
-        self.schedule = self.calc_schedule()
-        self.end_balance = self.schedule['End Balance'].iloc[-1]
+
+        validate_engine(engine, interest_calculated, day_count)
+        self.engine = engine
+        self.day_count = day_count
+
+        # Dated lump sums, payment changes, holidays and rate changes, applied in one pass
+        validate_events(events, engine, interest_calculated)
+        self.events = list(events) if events else []
 
     def __repr__(self):
         return 'Rate(start_balance={}, annual_interest_rate={}, monthly_payment={}, start_date=\'{}\', end_date=\'{}\')'\
@@ -136,17 +106,72 @@ class Rate:
                     self.start_date.strftime(dt_fmt), self.end_date.strftime(dt_fmt)
             )
 
+    @cached_property
+    def schedule(self):
+        """Daily schedule, calculated on first use"""
+        return self.calc_schedule()
+
+    @cached_property
+    def totals(self):
+        """Totals and end balance of the rate, calculated without building the daily schedule"""
+        return amortize_totals(self.start_balance,
+                               self.annual_interest_rate,
+                               monthly_pmt=self.monthly_payment,
+                               start_date=self.start_date,
+                               end_date=self.end_date,
+                               payment_day=self.payment_day,
+                               engine=self.engine,
+                               interest_calculated=self.interest_calculated,
+                               events=self.events,
+                               day_count=self.day_count)
+
+    @property
+    def end_balance(self):
+        return self.totals['End Balance']
+
+    @property
+    def schedule_end_date(self):
+        """Date of the last day in the schedule, earlier than end_date if the loan is paid off"""
+        if self.interest_calculated == 'monthly':
+            days, _ = self.schedule_arrays
+            return days[-1].astype(date) if len(days) else self.start_date - relativedelta(days=1)
+        return self.start_date + relativedelta(days=self.totals['Periods'] - 1)
+
+    @cached_property
+    def schedule_arrays(self):
+        """Date and amount arrays of the daily schedule, as returned by ``amortize_arrays``"""
+        return self.calc_schedule_arrays()
+
+    def calc_schedule_arrays(self):
+        """Date and amount arrays of the daily schedule, calculated without being cached"""
+        return amortize_arrays(self.start_balance,
+                               self.annual_interest_rate,
+                               monthly_pmt=self.monthly_payment,
+                               start_date=self.start_date,
+                               end_date=self.end_date,
+                               payment_day=self.payment_day,
+                               engine=self.engine,
+                               interest_calculated=self.interest_calculated,
+                               events=self.events,
+                               day_count=self.day_count)
+
     def calc_schedule(self):
         """Daily payment schedule, accounting for interest paid daily"""
-        schedule = amortize_table(self.start_balance,
-                                  self.annual_interest_rate,
-                                  monthly_pmt=self.monthly_payment,
-                                  start_date=self.start_date,
-                                  end_date=self.end_date,
-                                  payment_day=self.payment_day)
-        
-        # Ensure dt dtype
-        schedule['Date'] = pd.to_datetime(schedule['Date'])
-        schedule['Date'] = schedule['Date']
-        
-        return schedule
+        return schedule_frame(*self.schedule_arrays)
+
+    def iter_schedule_chunks(self, rows: int=10_000):
+        """Daily schedule as DataFrames of at most ``rows`` days each, without building it whole"""
+        period = 1
+        for days, amounts in amortize_chunks(self.start_balance,
+                                             self.annual_interest_rate,
+                                             monthly_pmt=self.monthly_payment,
+                                             start_date=self.start_date,
+                                             end_date=self.end_date,
+                                             payment_day=self.payment_day,
+                                             engine=self.engine,
+                                             rows=rows,
+                                             interest_calculated=self.interest_calculated,
+                                             events=self.events,
+                                             day_count=self.day_count):
+            yield schedule_frame(days, amounts, np.arange(period, period + len(days), dtype=np.int32))
+            period += len(days)
@@ -0,0 +1,87 @@
+"""
+Compare many rate, payment and overpayment combinations in one computation.
+"""
+import itertools
+import numpy as np
+import pandas as pd
+from datetime import date
+
+from .calendar_index import calendar_window
+from .engine import amortize_batch
+from .rate import _parse_date_range
+
+
+SCENARIO_COLUMNS = ['Rate', 'Fee', 'Monthly Payment', 'Additional Payment']
+
+
+def evaluate_grid(start_balance: float, rates: list, monthly_payments: list, addl_principal: list=(0,),
+                  fees: list=None, start_date=date.today(), term=None, end_date=None, payment_day: int=1,
+                  engine: str='exact') -> pd.DataFrame:
+    """Summarise every combination of rate, monthly payment and additional payment.
+
+    All the scenarios are amortized together by ``money_tools.engine.amortize_batch``,
+    with one array element per scenario, rather than building a ``Mortgage`` for each.
+
+    Parameters
+    ----------
+    start_balance : float
+        The starting balance owed
+    rates : list[float]
+        Annual interest rates of the products on offer, expressed as decimals
+    monthly_payments : list[float]
+        Regular monthly payment amounts to try with every product
+    addl_principal : list[float], optional
+        Additional monthly payment amounts to try, by default only 0
+    fees : list[float], optional
+        Fee charged for each product, matching the order of ``rates``, by default no fees
+    start_date : date or str, optional
+        Starting date of the period compared, by default today
+    term : int, optional
+        Length of the period in years, if ``end_date`` is not given
+    end_date : date or str, optional
+        End date of the period compared
+    payment_day : int, optional
+        Day of the month when monthly payments are taken, by default 1
+    engine : str, optional
+        One of ``money_tools.engine.ENGINES``, by default ``'exact'``
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per scenario with the scenario inputs and the same totals as
+        ``Mortgage.payment_summary``, plus the total interest and fees.
+    """
+    if fees is None:
+        fees = [0] * len(rates)
+    if len(fees) != len(rates):
+        raise ValueError(f'Expected one fee per rate, recieved {len(fees)} fees for {len(rates)} rates')
+
+    start_date, end_date = _parse_date_range(start_date, term, end_date)
+    calendar = calendar_window(start_date, end_date)
+    days = calendar.days
+
+    grid = pd.DataFrame([(rate, fee, pmt, addl) for (rate, fee), pmt, addl
+                         in itertools.product(zip(rates, fees), monthly_payments, addl_principal)],
+                        columns=SCENARIO_COLUMNS)
+
+    totals = amortize_batch(start_balance,
+                            grid['Rate'].values,
+                            grid['Monthly Payment'].values,
+                            calendar.payment_mask(payment_day),
+                            addl_principal=grid['Additional Payment'].values,
+                            engine=engine)
+
+    summary = grid.assign(**{
+        'Start Balance': round(start_balance, 2),
+        'Total Payments': totals['Total Payments'],
+        'Total Interest': totals['Total Interest'],
+        'Total Additional Payments': totals['Total Additional Payments'],
+        'End Balance': totals['End Balance'],
+        'Start Date': days[0],
+        'End Date': days[np.maximum(totals['Periods'], 1) - 1],
+    })
+    summary['Start Date'] = summary['Start Date'].astype('datetime64[s]')
+    summary['End Date'] = summary['End Date'].astype('datetime64[s]')
+    summary['Total Interest And Fees'] = summary['Total Interest'] + summary['Fee']
+
+    return summary
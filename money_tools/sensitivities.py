@@ -0,0 +1,231 @@
+"""
+Sensitivity of a Mortgage's total interest and balances to bumps of each rate's inputs.
+"""
+import numpy as np
+import pandas as pd
+
+from .calendar_index import calendar_window
+from .engine import ANNUAL_PAYMENTS, amortize_batch
+
+
+# Inputs of each rate that can be bumped, with the default bumps: +/-25bp and +/-100 a month
+DEFAULT_BUMPS = {
+    'rate': (-0.0025, 0.0025),
+    'monthly_payment': (-100, 100),
+}
+
+VALUE_COLUMNS = ['Total Interest', 'Fix End Balance', 'End Balance']
+SENSITIVITY_COLUMNS = ['Rate Index', 'Input', 'Bump'] + VALUE_COLUMNS + ['Delta ' + col for col in VALUE_COLUMNS]
+
+
+def _batched(mortgage) -> bool:
+    """Whether every rate can be run by the batch engines, which apply no events or other day counts"""
+    return not mortgage.events and all(rate.interest_calculated == 'daily' and rate.day_count == 'ACT/365F'
+                                       for rate in mortgage.rates)
+
+
+def _bumped_inputs(mortgage, bumps: dict):
+    """Rate index, input name and bump of every variant, led by the unbumped base"""
+    unknown = set(bumps) - set(DEFAULT_BUMPS)
+    if unknown:
+        raise ValueError(f'Unknown inputs {sorted(unknown)}, expected any of {tuple(DEFAULT_BUMPS)}')
+    variants = [(0, None, 0.0)]
+    for index in range(len(mortgage.rates)):
+        for name, values in bumps.items():
+            variants += [(index, name, float(bump)) for bump in values]
+    return variants
+
+
+def _batch_key(mortgage) -> tuple:
+    """Dates, payment days and engines of the rates, which mortgages batched together must share"""
+    return tuple((rate.start_date, rate.end_date, rate.payment_day, rate.engine) for rate in mortgage.rates)
+
+
+def _batch_values(mortgages: list, variants: list) -> tuple:
+    """Total Interest, Fix End Balance and End Balance of every variant of each mortgage, a batch run per rate.
+
+    The mortgages share their ``_batch_key``, so the same variants. Variants share the
+    base rates before the rate they bump. From that rate on, each rate is one
+    ``amortize_batch`` call over every mortgage's variants bumping it or an earlier
+    rate, sharing the rate's payment days from the calendar index. Also returns each
+    mortgage's base variant end balance of each rate.
+    """
+    n_mortgages, n_variants = len(mortgages), len(variants)
+    n_rates = len(mortgages[0].rates)
+    # Every mortgage's variants are stacked one after another
+    owner = np.repeat(np.arange(n_mortgages), n_variants)
+    index = np.tile([i for i, _, _ in variants], n_mortgages)
+    base_interest = np.cumsum([[0.0] + [rate.totals['Total Interest'] for rate in mortgage.rates]
+                               for mortgage in mortgages], axis=1)
+
+    values = np.zeros((len(VALUE_COLUMNS), n_mortgages * n_variants))
+    values[0] = base_interest[owner, index]
+    balance = np.zeros(n_mortgages * n_variants)
+    fix_ends = np.zeros((n_mortgages, n_rates))
+    for j in range(n_rates):
+        rates = [mortgage.rates[j] for mortgage in mortgages]
+        running = index <= j
+        starting = index == j
+        balance[starting] = np.array([rate.start_balance for rate in rates])[owner[starting]]
+
+        rate_bumps = np.zeros(n_variants)
+        payment_bumps = np.zeros(n_variants)
+        for k, (i, name, bump) in enumerate(variants):
+            if i == j and name == 'rate':
+                rate_bumps[k] = bump
+            elif i == j and name == 'monthly_payment':
+                payment_bumps[k] = bump
+        interest_rate = np.array([float(rate.annual_interest_rate) for rate in rates])[owner] \
+            + np.tile(rate_bumps, n_mortgages)
+        monthly_pmt = np.array([float(rate.monthly_payment) for rate in rates])[owner] \
+            + np.tile(payment_bumps, n_mortgages)
+
+        rate = rates[0]
+        is_payment = calendar_window(rate.start_date, rate.end_date).payment_mask(rate.payment_day)
+        totals = amortize_batch(balance[running], interest_rate[running], monthly_pmt[running], is_payment,
+                                engine=rate.engine)
+        values[0, running] += totals['Total Interest']
+        balance[running] = totals['End Balance']
+        values[1, starting] = balance[starting]
+        fix_ends[:, j] = balance[::n_variants]
+
+    values[2] = balance
+    return values.reshape(len(VALUE_COLUMNS), n_mortgages, n_variants).transpose(1, 0, 2), fix_ends
+
+
+def _rebuilt_values(mortgage, variants: list) -> tuple:
+    """``_batch_values`` rebuilding the rates from each bump with ``Mortgage.with_rate``"""
+    values = np.zeros((len(VALUE_COLUMNS), len(variants)))
+    for k, (index, name, bump) in enumerate(variants):
+        bumped = mortgage
+        if name is not None:
+            config = dict(mortgage.rates_configs[index])
+            config[name] += bump
+            bumped = mortgage.with_rate(index, config)
+        values[:, k] = (bumped.totals['Total Interest'], bumped.rates[index].end_balance, bumped.end_balance)
+    return values, np.array([rate.end_balance for rate in mortgage.rates])
+
+
+def _derivatives(rate) -> dict:
+    """Derivatives of a rate's end balance and interest under closed form compounding.
+
+    With ``g = 1 + r/365`` over ``n`` days and payments on days ``k``, the end balance is
+    ``g**n * B - P * sum(g**(n - k - 1))`` and the interest is the end balance less the
+    start balance plus the payments made.
+    """
+    calendar = calendar_window(rate.start_date, rate.end_date)
+    n = len(calendar)
+    pay_days = calendar.payment_offsets(rate.payment_day)
+    g = 1 + rate.annual_interest_rate / ANNUAL_PAYMENTS
+    paid_growth = g ** (n - pay_days - 1.0)
+
+    growth = g ** n
+    paid_growth_by_g = ((n - pay_days - 1.0) * g ** (n - pay_days - 2.0)).sum()
+    end_by_rate = (n * g ** (n - 1.0) * rate.start_balance - rate.monthly_payment * paid_growth_by_g) / ANNUAL_PAYMENTS
+    return {
+        'growth': growth,
+        'end': {'rate': end_by_rate, 'monthly_payment': -paid_growth.sum()},
+        'interest': {'rate': end_by_rate, 'monthly_payment': len(pay_days) - paid_growth.sum()},
+        # The derivatives only hold while the balance is not paid off within the rate
+        'valid': rate.totals['Periods'] == n,
+    }
+
+
+def _analytic_deltas(mortgage, variants: list) -> np.ndarray:
+    """First order estimates of the Delta columns from the closed form derivatives, NaN once a loan is paid off"""
+    derivatives = [_derivatives(rate) for rate in mortgage.rates]
+    deltas = np.full((len(VALUE_COLUMNS), len(variants)), np.nan)
+    for k, (index, name, bump) in enumerate(variants):
+        if name is None:
+            deltas[:, k] = 0.0
+            continue
+        if not all(d['valid'] for d in derivatives[index:]):
+            continue
+        d_end = derivatives[index]['end'][name]
+        d_interest = derivatives[index]['interest'][name]
+        fix_end = d_end
+        for later in derivatives[index + 1:]:
+            d_interest += (later['growth'] - 1) * d_end
+            d_end *= later['growth']
+        deltas[:, k] = (d_interest * bump, fix_end * bump, d_end * bump)
+    return deltas
+
+
+def _table(mortgage, variants: list, values: np.ndarray, fix_ends: np.ndarray, analytic: bool) -> pd.DataFrame:
+    """Sensitivity table of a mortgage from the values of its variants"""
+    # Deltas from the unbumped base, the Fix End Balance from the base's end balance of the bumped rate
+    index, inputs, bumped = (list(column) for column in zip(*variants))
+    base = values[:, :1].repeat(len(variants), axis=1)
+    base[1] = fix_ends[index]
+
+    table = pd.DataFrame({'Rate Index': index, 'Input': inputs, 'Bump': bumped})
+    for col, value, delta in zip(VALUE_COLUMNS, values, values - base):
+        table[col] = value
+        table['Delta ' + col] = delta
+    table = table[SENSITIVITY_COLUMNS]
+    if analytic:
+        for col, delta in zip(VALUE_COLUMNS, _analytic_deltas(mortgage, variants)):
+            table['Analytic Delta ' + col] = delta
+
+    # The first variant is the unbumped base itself
+    return table.iloc[1:].reset_index(drop=True)
+
+
+def sensitivities(mortgage, bumps: dict=None, analytic: bool=False) -> pd.DataFrame:
+    """Change in a mortgage's total interest and balances from bumping each rate's inputs.
+
+    Each variant bumps one input of one rate, keeping every other rate's inputs, with
+    the later rates starting from the bumped balances. Every variant of the batch
+    engines is run together, a batch run per rate. Mortgages with events or other day
+    counts rebuild their rates from each bump instead.
+
+    Parameters
+    ----------
+    mortgage : Mortgage
+        The base mortgage
+    bumps : dict, optional
+        Bumps of each input, ``'rate'`` and/or ``'monthly_payment'``, by default
+        ``DEFAULT_BUMPS``: +/-25bp on the rate and +/-100 on the monthly payment
+    analytic : bool, optional
+        Add ``Analytic Delta`` columns, first order estimates of the deltas from the
+        closed form derivatives, NaN where the loan is paid off, by default False
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per rate, input and bump, with ``SENSITIVITY_COLUMNS``. The Fix End
+        Balance is the end balance of the bumped rate, the End Balance the mortgage's.
+    """
+    return batch_sensitivities([mortgage], bumps=bumps, analytic=analytic).drop(columns='Mortgage')
+
+
+def batch_sensitivities(mortgages, bumps: dict=None, analytic: bool=False) -> pd.DataFrame:
+    """``sensitivities`` of many mortgages, as one table with the mortgage's position as the first column.
+
+    The variants of every mortgage whose rates share their dates, payment days and
+    engines are run together, a batch run per rate across all those mortgages.
+    """
+    bumps = DEFAULT_BUMPS if bumps is None else bumps
+    mortgages = list(mortgages)
+    variants = [_bumped_inputs(mortgage, bumps) for mortgage in mortgages]
+
+    results = [None] * len(mortgages)
+    groups = {}
+    for position, mortgage in enumerate(mortgages):
+        if _batched(mortgage):
+            groups.setdefault(_batch_key(mortgage), []).append(position)
+        else:
+            results[position] = _rebuilt_values(mortgage, variants[position])
+    for positions in groups.values():
+        values, fix_ends = _batch_values([mortgages[position] for position in positions], variants[positions[0]])
+        for position, mortgage_values, mortgage_fix_ends in zip(positions, values, fix_ends):
+            results[position] = mortgage_values, mortgage_fix_ends
+
+    tables = []
+    for position, (mortgage, (values, fix_ends)) in enumerate(zip(mortgages, results)):
+        table = _table(mortgage, variants[position], values, fix_ends, analytic)
+        table.insert(0, 'Mortgage', position)
+        tables.append(table)
+    if not tables:
+        return pd.DataFrame(columns=['Mortgage'] + SENSITIVITY_COLUMNS)
+    return pd.concat(tables, ignore_index=True)
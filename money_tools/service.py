@@ -0,0 +1,299 @@
+"""
+Quote mortgages from JSON requests, in batches or from an asyncio server.
+
+A request is a JSON object with the arguments of a ``Mortgage``::
+
+    {"id": "quote-1", "start_balance": 200000, "engine": "exact",
+     "rates_configs": [{"rate": 0.03, "monthly_payment": 1000, "start_date": "2024-01-01",
+                        "term": null, "end_date": "2026-12-31", "payment_day": 1}]}
+
+and its quote is the ``Mortgage.totals`` with the first and last days of the schedule.
+Identical requests in a batch are quoted once, and a large enough group of exact engine
+requests is amortized together as a ``Portfolio``.
+"""
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import TOTALS
+from .mortgage import Mortgage
+from .portfolio import Portfolio
+
+
+QUOTE_FIELDS = list(TOTALS) + ['Start Date', 'End Date']
+
+# Request fields passed on to Mortgage, the id is only echoed back
+REQUEST_FIELDS = ('start_balance', 'rates_configs', 'engine')
+
+# Fewest exact engine requests worth amortizing together, below which a Portfolio's day
+# by day loop over arrays costs more than building each Mortgage
+VECTORIZE_MIN = 32
+
+
+def request_key(request: dict) -> str:
+    """Canonical JSON of the fields that determine a request's quote, identical for identical requests"""
+    if not isinstance(request, dict):
+        raise ValueError(f'Request must be a JSON object. Recieved {type(request).__name__}')
+    missing = {'start_balance', 'rates_configs'} - set(request)
+    if missing:
+        raise ValueError(f'Request is missing {sorted(missing)}')
+    return json.dumps({field: request.get(field, 'exact' if field == 'engine' else None)
+                       for field in REQUEST_FIELDS}, sort_keys=True, default=str)
+
+
+def _day(value) -> str:
+    return None if value is None else str(value)[:10]
+
+
+def _quote(periods, totals, start_date, end_date) -> dict:
+    """Quote with ``QUOTE_FIELDS``, without an End Date when no days were amortized"""
+    values = [int(periods), *(float(total) for total in totals), _day(start_date), _day(end_date) if periods else None]
+    return dict(zip(QUOTE_FIELDS, values))
+
+
+def _mortgage_quote(start_balance, rates_configs, engine) -> dict:
+    mortgage = Mortgage(start_balance, rates_configs, engine=engine)
+    totals = mortgage.totals
+    return _quote(totals['Periods'], [totals[field] for field in TOTALS[1:]], mortgage.start_date.date(),
+                  mortgage.end_date.date())
+
+
+def _portfolio_quotes(requests: list) -> list:
+    portfolio = Portfolio.from_configs([request['start_balance'] for request in requests],
+                                       [request['rates_configs'] for request in requests])
+    totals = portfolio.totals
+    return [_quote(totals['Periods'][i], [totals[field][i] for field in TOTALS[1:]], start_date,
+                   portfolio.end_date[i]) for i, start_date in enumerate(portfolio.start_dates[:, 0])]
+
+
+def _error(err: Exception) -> str:
+    return f'{type(err).__name__}: {err}'
+
+
+def _quote_unique(requests: list) -> list:
+    """``(quote, error)`` of each of a list of distinct requests"""
+    results = [None] * len(requests)
+    exact = [i for i, request in enumerate(requests) if request.get('engine', 'exact') == 'exact']
+    if len(exact) >= VECTORIZE_MIN:
+        try:
+            quotes = _portfolio_quotes([requests[i] for i in exact])
+        except Exception:
+            # A bad request fails the whole portfolio, so quote each alone to find it
+            pass
+        else:
+            for i, quote in zip(exact, quotes):
+                results[i] = (quote, None)
+
+    for i, request in enumerate(requests):
+        if results[i] is None:
+            try:
+                results[i] = (_mortgage_quote(request['start_balance'], request['rates_configs'],
+                                              request.get('engine', 'exact')), None)
+            except Exception as err:
+                results[i] = (None, _error(err))
+    return results
+
+
+def quote_batch(requests: list) -> list:
+    """Quote a batch of requests, each identical request only once.
+
+    Returns
+    -------
+    list[tuple[dict, str]]
+        The quote of each request, with ``QUOTE_FIELDS``, and an error message, in the
+        order of the requests. A request that fails has a ``None`` quote and its error.
+    """
+    results = [None] * len(requests)
+    positions = {}
+    for position, request in enumerate(requests):
+        try:
+            positions.setdefault(request_key(request), []).append(position)
+        except ValueError as err:
+            results[position] = (None, _error(err))
+
+    unique = [requests[same[0]] for same in positions.values()]
+    for same, result in zip(positions.values(), _quote_unique(unique)):
+        for position in same:
+            results[position] = result
+    return results
+
+
+def respond(request, result: tuple) -> dict:
+    """JSON response of a request, echoing its id"""
+    quote, error = result
+    request_id = request.get('id') if isinstance(request, dict) else None
+    return {'id': request_id, 'quote': quote, 'error': error}
+
+
+def parse_request(line):
+    """Request decoded from a JSON line, or the error message of a line that is not JSON"""
+    try:
+        return json.loads(line), None
+    except ValueError as err:
+        return None, _error(err)
+
+
+async def _skip_line(reader: asyncio.StreamReader):
+    """Discard the rest of a line longer than the reader's limit, up to and including its newline"""
+    while True:
+        try:
+            await reader.readuntil(b'\n')
+            return
+        except asyncio.LimitOverrunError as err:
+            await reader.readexactly(err.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+class QuoteServer(object):
+    """
+    asyncio server answering JSON line requests with JSON line quotes.
+
+    Identical requests in flight at the same time share one quote, and the distinct
+    requests arriving within ``batch_window`` seconds of each other are quoted together
+    by ``quote_batch``, off the event loop.
+    """
+
+    def __init__(self, batch_window: float=0.005, max_batch: int=1024, max_pending: int=4096,
+                 workers: int=None, max_line: int=2 ** 23):
+        """
+        Parameters
+        ----------
+        batch_window : float, optional
+            Seconds a request waits for others to batch with, by default 0.005
+        max_batch : int, optional
+            Most distinct requests quoted in one batch, by default 1024
+        max_pending : int, optional
+            Most requests being answered at once, past which connections are not read
+            from until quotes are sent, by default 4096
+        workers : int, optional
+            Number of processes batches are quoted in, by default a thread of this process
+        max_line : int, optional
+            Longest request line in bytes, longer lines are answered with an error, by
+            default 8 MiB
+        """
+        if batch_window < 0 or max_batch < 1 or max_pending < 1 or max_line < 1:
+            raise ValueError('batch_window cannot be negative, and max_batch, max_pending and max_line must be at '
+                             'least 1')
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.workers = workers
+        self.max_line = max_line
+
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+
+        self._executor = ProcessPoolExecutor(max_workers=workers) if workers else None
+        self._in_flight = {}
+        self._batch = []
+        self._flush_handle = None
+        self._tasks = set()
+        self._slots = None
+
+    def __repr__(self):
+        return 'QuoteServer(requests={}, coalesced={}, batches={})'.format(self.requests, self.coalesced,
+                                                                           self.batches)
+
+    def stats(self) -> dict:
+        """Requests answered, how many shared another's quote, and the batches quoted"""
+        return {'requests': self.requests, 'coalesced': self.coalesced, 'batches': self.batches}
+
+    async def quote(self, request: dict) -> tuple:
+        """``(quote, error)`` of a request, shared with any identical request in flight"""
+        try:
+            key = request_key(request)
+        except ValueError as err:
+            return None, _error(err)
+
+        self.requests += 1
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = self._in_flight[key] = loop.create_future()
+            self._batch.append((key, request))
+            if len(self._batch) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        # Shielded, so a waiter going away does not cancel the quote for the others
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        """Start quoting the requests batched so far"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch = self._batch, []
+        if batch:
+            self.batches += 1
+            task = asyncio.get_running_loop().create_task(self._quote_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _quote_batch(self, batch: list):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self._executor, quote_batch, [request for _, request in batch])
+        except Exception as err:
+            results = [(None, _error(err))] * len(batch)
+        for (key, _), result in zip(batch, results):
+            self._in_flight.pop(key).set_result(result)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer each JSON line read from a connection with a JSON line, as each quote is ready"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        answering = set()
+
+        async def answer(line):
+            try:
+                request, error = parse_request(line) if line is not None else (None, too_long)
+                result = (None, error) if error else await self.quote(request)
+                writer.write(json.dumps(respond(request, result)).encode() + b'\n')
+                await writer.drain()
+            finally:
+                self._slots.release()
+
+        too_long = _error(ValueError(f'Request line is longer than {self.max_line} bytes'))
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as err:
+                    line = err.partial
+                    if not line:
+                        break
+                except asyncio.LimitOverrunError:
+                    # Answered with an error, like any other invalid line
+                    await _skip_line(reader)
+                    line = None
+                if line is not None and not line.strip():
+                    continue
+                # Stop reading while too many requests are being answered
+                await self._slots.acquire()
+                task = asyncio.create_task(answer(line))
+                answering.add(task)
+                task.add_done_callback(answering.discard)
+            await asyncio.gather(*answering, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def start(self, host: str='127.0.0.1', port: int=8765, path: str=None) -> asyncio.AbstractServer:
+        """Start listening on a local TCP port, or on a unix socket at path"""
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path=path, limit=self.max_line)
+        return await asyncio.start_server(self.handle, host=host, port=port, limit=self.max_line)
+
+    async def serve_forever(self, host: str='127.0.0.1', port: int=8765, path: str=None):
+        server = await self.start(host, port, path)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        """Shut down the worker processes, if any"""
+        if self._executor is not None:
+            self._executor.shutdown()
@@ -0,0 +1,201 @@
+"""
+Monte Carlo simulation of a mortgage moving onto a variable rate after its last fixed rate.
+"""
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dateutil.relativedelta import relativedelta
+
+from .calendar_index import calendar_window
+from .engine import ANNUAL_PAYMENTS, TOTALS, round2
+from .mortgage import Mortgage
+from .rate import _parse_date_range
+
+
+MONTHLY_COLUMNS = ['Payment', 'Interest', 'End Balance']
+
+
+class MeanReverting(object):
+    """
+    Mean reverting (Vasicek) model of the annual rate, stepped monthly.
+
+    Each month the rate moves a fraction of the way back to the long run rate, plus a
+    normally distributed shock, using the exact transition of the continuous model.
+    """
+
+    def __init__(self, long_run_rate: float=0.04, speed: float=0.3, volatility: float=0.01,
+                 floor: float=0.0):
+        """
+        Parameters
+        ----------
+        long_run_rate : float, optional
+            Rate the paths revert to, by default 0.04
+        speed : float, optional
+            Speed of reversion per year, by default 0.3
+        volatility : float, optional
+            Annualised standard deviation of the rate, by default 0.01
+        floor : float, optional
+            Lowest rate a path can take, None for no floor, by default 0
+        """
+        if speed <= 0:
+            raise ValueError('speed must be positive')
+        self.long_run_rate = long_run_rate
+        self.speed = speed
+        self.volatility = volatility
+        self.floor = floor
+
+    def __repr__(self):
+        return 'MeanReverting(long_run_rate={}, speed={}, volatility={}, floor={})'\
+            .format(self.long_run_rate, self.speed, self.volatility, self.floor)
+
+    def __call__(self, n_paths: int, n_months: int, rng: np.random.Generator, start_rate: float) -> np.ndarray:
+        """Rate of each path in each month, shape ``(n_paths, n_months)``, one step on from start_rate"""
+        decay = np.exp(-self.speed / 12)
+        shock = self.volatility * np.sqrt((1 - decay ** 2) / (2 * self.speed))
+
+        paths = np.empty((n_paths, n_months))
+        rate = np.full(n_paths, float(start_rate))
+        for month in range(n_months):
+            rate = self.long_run_rate + (rate - self.long_run_rate) * decay + shock * rng.standard_normal(n_paths)
+            paths[:, month] = rate
+        if self.floor is not None:
+            np.maximum(paths, self.floor, out=paths)
+        return paths
+
+
+def _simulate_paths(start_balance: float, rates: np.ndarray, monthly_payment: float, is_payment: np.ndarray,
+                    month_idx: np.ndarray, month_start: np.ndarray, month_end: np.ndarray):
+    """Amortize every path together with the exact engine's daily steps.
+
+    ``rates`` has one row per month and one column per path. Each month starts from the
+    balance rounded to 2dp, as each rate of a ``Mortgage`` does. Returns the days each
+    path ran, and its Payment, Interest and End Balance in each month, the End Balance
+    taken on the days flagged by ``month_end``.
+    """
+    n_months, n_paths = rates.shape
+    daily_rates = rates / ANNUAL_PAYMENTS
+    pmt_due = round2(monthly_payment)
+
+    balance = np.full(n_paths, float(start_balance))
+    rows = np.zeros(n_paths, dtype=np.int64)
+    monthly = np.zeros((len(MONTHLY_COLUMNS), n_months, n_paths))
+    active = np.ones(n_paths, dtype=bool)
+
+    for t, (pay, m) in enumerate(zip(is_payment.tolist(), month_idx.tolist())):
+        if month_start[t]:
+            balance = round2(balance)
+            active &= balance > 0
+
+        if active.any():
+            daily_interest = round2(daily_rates[m] * balance)
+            daily_interest *= active
+            balance += daily_interest
+            if pay:
+                pmt = np.minimum(pmt_due, balance)
+                pmt *= active
+                balance -= pmt
+                monthly[0, m] += pmt
+            monthly[1, m] += daily_interest
+            rows += active
+            active &= balance > 0
+
+        if month_end[t]:
+            monthly[2, m] = balance
+
+    return rows, monthly
+
+
+def simulate(mortgage: Mortgage, term=None, end_date=None, rate_paths=None, n_paths: int=1000, seed=None,
+             monthly_payment: float=None, payment_day: int=None, percentiles=(5, 50, 95),
+             workers: int=None) -> dict:
+    """Simulate a mortgage on a variable rate after its last rate, over many rate paths.
+
+    Every path is amortized in one array computation. Each path gives the same end
+    balance as a ``Mortgage`` with the same rates and a rate for each month of the path.
+
+    Parameters
+    ----------
+    mortgage : Mortgage
+        The fixed rates, the variable rate starting the day after the last one ends
+    term : int, optional
+        Years on the variable rate, if ``end_date`` is not given
+    end_date : date or str, optional
+        Last day on the variable rate
+    rate_paths : array_like or callable, optional
+        Annual rate of each path in each calendar month from the start of the variable
+        rate, shape ``(n_paths, n_months)``. A callable is a model, called as
+        ``rate_paths(n_paths, n_months, rng, start_rate)`` with the last fixed rate as
+        start_rate. By default a ``MeanReverting`` model.
+    n_paths : int, optional
+        Number of paths a model generates, by default 1000
+    seed : int, optional
+        Seed of the random generator passed to the model
+    monthly_payment : float, optional
+        Monthly payment on the variable rate, by default the last rate's
+    payment_day : int, optional
+        Day of the month payments are taken, by default the last rate's
+    percentiles : sequence of float, optional
+        Percentiles of the monthly schedules returned, by default (5, 50, 95)
+    workers : int, optional
+        Number of processes the paths are split across, by default all in this process
+
+    Returns
+    -------
+    dict
+        ``'rate_paths'``, the ``(n_paths, n_months)`` rates, ``'totals'``, the ``TOTALS``
+        of the whole mortgage for each path, and ``'schedules_monthly'``, a monthly
+        schedule for each percentile. Each column of those is the percentile across the
+        paths within each month, so a schedule is not itself any one path.
+    """
+    last_rate = mortgage.rates[-1]
+    start_date, end_date = _parse_date_range(last_rate.end_date + relativedelta(days=1), term, end_date)
+    monthly_payment = last_rate.monthly_payment if monthly_payment is None else monthly_payment
+    payment_day = last_rate.payment_day if payment_day is None else payment_day
+
+    calendar = calendar_window(start_date, end_date)
+    days = calendar.days
+    months = days.astype('datetime64[M]')
+    month_idx = (months - months[0]).astype(np.int64)
+    n_months = int(month_idx[-1]) + 1
+    month_start = np.append(True, month_idx[1:] != month_idx[:-1])
+
+    if rate_paths is None:
+        rate_paths = MeanReverting()
+    if callable(rate_paths):
+        rate_paths = rate_paths(n_paths, n_months, np.random.default_rng(seed), last_rate.annual_interest_rate)
+    rate_paths = np.asarray(rate_paths, dtype=np.float64)
+    if rate_paths.ndim != 2 or rate_paths.shape[1] != n_months:
+        raise ValueError(f'rate_paths must have shape (n_paths, {n_months}), one rate per month')
+
+    # The last day closes the last month, so its End Balance is always each path's end balance
+    month_end = calendar.month_end.copy()
+    month_end[-1] = True
+    args = (monthly_payment, calendar.payment_mask(payment_day), month_idx, month_start, month_end)
+    if workers and workers > 1:
+        chunks = np.array_split(rate_paths.T, workers, axis=1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_paths, [mortgage.end_balance] * len(chunks), chunks,
+                                        *([arg] * len(chunks) for arg in args)))
+        rows = np.concatenate([rows for rows, _ in results])
+        monthly = np.concatenate([monthly for _, monthly in results], axis=2)
+    else:
+        rows, monthly = _simulate_paths(mortgage.end_balance, rate_paths.T, *args)
+
+    payments, interest, balances = monthly
+    totals = dict(zip(TOTALS, (mortgage.totals['Periods'] + rows,
+                               mortgage.totals['Total Payments'] + payments.sum(axis=0),
+                               mortgage.totals['Total Interest'] + interest.sum(axis=0),
+                               np.full(len(rows), float(mortgage.totals['Total Additional Payments'])),
+                               balances[-1])))
+
+    month_dates = np.unique(months).astype('datetime64[s]')
+    schedules = {}
+    for percentile in percentiles:
+        values = np.percentile(monthly, percentile, axis=2)
+        schedule = pd.DataFrame(dict(zip(MONTHLY_COLUMNS, values)))
+        schedule['Rate'] = np.percentile(rate_paths, percentile, axis=0)
+        schedule['Month Date'] = month_dates
+        schedule['Principal'] = schedule['Payment'] - schedule['Interest']
+        schedules[percentile] = schedule
+
+    return {'rate_paths': rate_paths, 'totals': totals, 'schedules_monthly': schedules}
@@ -0,0 +1,186 @@
+"""
+Solve for the payment, payoff date or overpayment that meets a target.
+
+Each solver starts from the closed form answer for unrounded daily compounding, then
+settles on the exact answer in whole pence with a handful of balance-only runs of
+``money_tools.engine.amortize_totals``. No schedules are built.
+"""
+import math
+from datetime import date
+from dateutil.relativedelta import relativedelta
+
+from .calendar_index import calendar_window
+from .engine import ANNUAL_PAYMENTS, amortize_totals
+from .rate import _parse_date_range
+
+
+def _smallest_pence(satisfied, guess: float, max_pence: int) -> int:
+    """Smallest whole number of pence, from 0 to max_pence, satisfying a monotone condition.
+
+    Steps out from the guess in doubling steps to bracket the answer, then bisects.
+    """
+    guess = min(max(int(round(guess * 100)), 0), max_pence)
+    step = 1
+    if satisfied(guess):
+        hi, lo = guess, guess - step
+        while lo >= 0 and satisfied(lo):
+            hi, step = lo, step * 2
+            lo = hi - step
+        lo = max(lo, -1)
+    else:
+        lo = guess
+        while True:
+            if lo >= max_pence:
+                raise ValueError('No solution up to the maximum amount')
+            hi = min(lo + step, max_pence)
+            if satisfied(hi):
+                break
+            lo, step = hi, step * 2
+
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if satisfied(mid):
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+
+def _payment_factors(annual_interest_rate: float, start_date, end_date, payment_day: int):
+    """Growth of a pound over the whole period and of a pound paid on each payment day.
+
+    Under closed form compounding the end balance is
+    ``growth * start_balance - paid_growth.sum() * payment``.
+    """
+    calendar = calendar_window(start_date, end_date)
+    pay_days = calendar.payment_offsets(payment_day)
+    days = calendar.days
+    daily_growth = 1 + annual_interest_rate / ANNUAL_PAYMENTS
+    growth = daily_growth ** len(days)
+    paid_growth = daily_growth ** (len(days) - pay_days - 1.0)
+    return growth, paid_growth
+
+
+def solve_monthly_payment(target_end_balance: float, start_balance: float, annual_interest_rate: float,
+                          start_date=date.today(), term=None, end_date=None, payment_day: int=1,
+                          addl_principal: float=0, engine: str='exact') -> float:
+    """Smallest monthly payment that brings the balance down to the target by the end date.
+
+    Parameters
+    ----------
+    target_end_balance : float
+        Balance to reach, 0 to clear the loan
+    start_balance, annual_interest_rate, start_date, term, end_date, payment_day
+        As for ``Rate``
+    addl_principal : float, optional
+        Additional monthly payment made with every payment, by default 0
+    engine : str, optional
+        One of ``money_tools.engine.ENGINES``, by default ``'exact'``
+
+    Returns
+    -------
+    float
+        The monthly payment, in whole pence
+    """
+    start_date, end_date = _parse_date_range(start_date, term, end_date)
+    growth, paid_growth = _payment_factors(annual_interest_rate, start_date, end_date, payment_day)
+    if not paid_growth.size:
+        raise ValueError('No payment days between start_date and end_date')
+
+    guess = (growth * start_balance - target_end_balance) / paid_growth.sum() - addl_principal
+
+    def reaches_target(pence):
+        totals = amortize_totals(start_balance, annual_interest_rate, pence / 100, start_date, end_date,
+                                 addl_principal=addl_principal, payment_day=payment_day, engine=engine)
+        return round(totals['End Balance'], 2) <= target_end_balance
+
+    # Paying off the whole balance with interest on the first payment day always clears it
+    max_pence = int(math.ceil(growth * max(start_balance, 0) * 100)) + 1
+    return _smallest_pence(reaches_target, guess, max_pence) / 100
+
+
+def solve_payoff_date(start_balance: float, annual_interest_rate: float, monthly_payment: float,
+                      start_date=date.today(), payment_day: int=1, addl_principal: float=0,
+                      engine: str='exact', max_term: int=50):
+    """Date the loan is cleared by the monthly payments, or None if not within max_term years.
+
+    Parameters
+    ----------
+    start_balance, annual_interest_rate, monthly_payment, start_date, payment_day
+        As for ``Rate``
+    addl_principal : float, optional
+        Additional monthly payment made with every payment, by default 0
+    engine : str, optional
+        One of ``money_tools.engine.ENGINES``, by default ``'exact'``
+    max_term : int, optional
+        Years to search for the payoff date, by default 50
+
+    Returns
+    -------
+    date or None
+    """
+    start_date, last_date = _parse_date_range(start_date, term=max_term)
+
+    # Annuity term at the effective monthly rate, padded for the rounding and payment day
+    outflow = monthly_payment + addl_principal
+    monthly_rate = (1 + annual_interest_rate / ANNUAL_PAYMENTS) ** (ANNUAL_PAYMENTS / 12) - 1
+    interest_only = start_balance * monthly_rate
+    if outflow <= interest_only:
+        months = 12 * max_term
+    elif monthly_rate > 0:
+        months = -math.log(1 - interest_only / outflow) / math.log(1 + monthly_rate)
+    else:
+        months = start_balance / outflow
+
+    estimate = start_date + relativedelta(months=int(math.ceil(months)) + 2)
+    for end_date in (min(estimate, last_date), last_date):
+        totals = amortize_totals(start_balance, annual_interest_rate, monthly_payment, start_date, end_date,
+                                 addl_principal=addl_principal, payment_day=payment_day, engine=engine)
+        if totals['End Balance'] <= 0:
+            return start_date + relativedelta(days=totals['Periods'] - 1)
+    return None
+
+
+def solve_overpayment_for_break_even(fee: float, start_balance: float, annual_interest_rate: float,
+                                     monthly_payment: float, start_date=date.today(), term=None, end_date=None,
+                                     payment_day: int=1, engine: str='exact') -> float:
+    """Smallest additional monthly payment whose interest saving over the period covers the fee.
+
+    The saving is measured against making the monthly payment alone.
+
+    Parameters
+    ----------
+    fee : float
+        Fee the interest saved must cover
+    start_balance, annual_interest_rate, monthly_payment, start_date, term, end_date, payment_day
+        As for ``Rate``
+    engine : str, optional
+        One of ``money_tools.engine.ENGINES``, by default ``'exact'``
+
+    Returns
+    -------
+    float
+        The additional monthly payment, in whole pence
+    """
+    start_date, end_date = _parse_date_range(start_date, term, end_date)
+
+    def interest(addl_principal):
+        return amortize_totals(start_balance, annual_interest_rate, monthly_payment, start_date, end_date,
+                               addl_principal=addl_principal, payment_day=payment_day,
+                               engine=engine)['Total Interest']
+
+    base_interest = interest(0)
+
+    # Each pound overpaid on a payment day saves the interest it would have accrued to the end
+    _, paid_growth = _payment_factors(annual_interest_rate, start_date, end_date, payment_day)
+    saving_per_pound = (paid_growth - 1).sum()
+    guess = fee / saving_per_pound if saving_per_pound > 0 else 0
+
+    def covers_fee(pence):
+        return base_interest - interest(pence / 100) >= fee
+
+    # Overpaying the whole balance saves the most interest there is to save
+    max_pence = int(math.ceil(max(start_balance, 0) * 100))
+    if not covers_fee(max_pence):
+        raise ValueError('Overpayments cannot save enough interest to cover the fee')
+    return _smallest_pence(covers_fee, guess, max_pence) / 100
@@ -0,0 +1,132 @@
+"""
+Content addressed on-disk cache of daily schedules, stored as memory-mapped column files.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+
+# Column files of a stored schedule, with the dtype each is saved as, the ones
+# ``Mortgage.schedule_arrays`` gives
+SCHEDULE_FILES = {
+    'Date': 'datetime64[D]',
+    'Period': np.int32,
+    'amounts': np.float64,
+}
+
+
+def _version():
+    from money_tools import __version__
+    return __version__
+
+
+class ScheduleStore(object):
+    """
+    Directory of schedules, each saved as one ``.npy`` file per column under the hash of
+    the inputs that produced it.
+
+    Stored schedules are opened memory-mapped and read-only, so any number of processes
+    can share one copy in the page cache. A schedule is written to a temporary directory
+    and renamed into place, so concurrent writers of the same schedule never expose a
+    partial one.
+    """
+
+    def __init__(self, path: str, max_bytes: int=None):
+        """Open, or create, a store.
+
+        Parameters
+        ----------
+        path : str
+            Directory holding the stored schedules
+        max_bytes : int, optional
+            Size the store is trimmed back to after each write, evicting the least
+            recently used schedules first, by default unbounded
+        """
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        os.makedirs(self.path, exist_ok=True)
+
+    def __repr__(self):
+        return 'ScheduleStore(path=\'{}\', max_bytes={})'.format(self.path, self.max_bytes)
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Stable hash of JSON serialisable inputs together with the library version and column dtypes"""
+        dtypes = {name: np.dtype(dtype).str for name, dtype in SCHEDULE_FILES.items()}
+        payload = json.dumps([_version(), dtypes, parts], sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.path, key)
+
+    def get(self, key: str):
+        """Memory-mapped ``(days, periods, amounts)`` arrays for the key, or None if not stored"""
+        entry = self._entry(key)
+        try:
+            arrays = tuple(np.load(os.path.join(entry, f'{name}.npy'), mmap_mode='r') for name in SCHEDULE_FILES)
+            os.utime(entry)
+        except FileNotFoundError:
+            return None
+        return arrays
+
+    def put(self, key: str, days: np.ndarray, periods: np.ndarray, amounts: np.ndarray):
+        """Store schedule arrays under the key, then evict if the store is over its size"""
+        entry = self._entry(key)
+        if os.path.isdir(entry):
+            return
+
+        tmp = tempfile.mkdtemp(dir=self.path, prefix='.tmp-')
+        try:
+            for (name, dtype), values in zip(SCHEDULE_FILES.items(), (days, periods, amounts)):
+                np.save(os.path.join(tmp, f'{name}.npy'), np.asarray(values).astype(dtype, copy=False))
+            os.rename(tmp, entry)
+        except OSError:
+            # Another process stored the same schedule first
+            if not os.path.isdir(entry):
+                raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+
+    def entries(self) -> list:
+        """``(last used time, size in bytes, key)`` of every stored schedule, oldest first"""
+        entries = []
+        for key in os.listdir(self.path):
+            entry = self._entry(key)
+            if key.startswith('.') or not os.path.isdir(entry):
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+                entries.append((os.path.getmtime(entry), size, key))
+            except FileNotFoundError:
+                continue
+        return sorted(entries)
+
+    def size(self) -> int:
+        """Total bytes of the stored schedules"""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes: int):
+        """Remove the least recently used schedules until the store is within max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= max_bytes:
+                break
+            # Renamed out of the way first, so readers never see a half deleted schedule
+            trash = tempfile.mkdtemp(dir=self.path, prefix='.evict-')
+            try:
+                os.rename(self._entry(key), os.path.join(trash, key))
+                total -= size
+            except OSError:
+                pass
+            shutil.rmtree(trash, ignore_errors=True)
+
+    def clear(self):
+        """Remove every stored schedule"""
+        self.evict(0)
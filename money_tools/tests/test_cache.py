@@ -0,0 +1,79 @@
+from money_tools import Mortgage
+from money_tools.cache import RateCache
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import pickle
+import pytest
+
+
+@pytest.fixture
+def rates_configs():
+    return [{
+            "rate": rate,
+            "monthly_payment": 1000.00,
+            "start_date": f'{year}-01-01',
+            "term": None,
+            "end_date": f'{year}-12-31',
+            "payment_day": 1
+        } for year, rate in [(2019, 0.01), (2020, 0.02), (2021, 0.03)]]
+
+
+class TestRateCache:
+
+    def test_hits_and_misses(self):
+        cache = RateCache(maxsize=4)
+        rate = cache.get_rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31')
+        assert cache.get_rate(100_000, 0.01, 1000, start_date=datetime(2019, 1, 1),
+                              end_date='2019-12-31') is rate
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'maxsize': 4}
+
+    def test_eviction(self):
+        cache = RateCache(maxsize=2)
+        first = cache.get_rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31')
+        cache.get_rate(100_000, 0.02, 1000, start_date='2019-01-01', end_date='2019-12-31')
+        cache.get_rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31')
+        cache.get_rate(100_000, 0.03, 1000, start_date='2019-01-01', end_date='2019-12-31')
+        assert cache.evictions == 1
+        assert cache.get_rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31') is first
+
+    def test_threads(self):
+        cache = RateCache(maxsize=8)
+
+        def get_rates(offset):
+            return [cache.get_rate(100_000, 0.01 + (offset + i) % 16 / 1000, 1000, start_date='2019-01-01',
+                                   end_date='2019-12-31') for i in range(500)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(get_rates, range(8)))
+        assert len(cache) == 8
+        assert cache.hits + cache.misses == 8 * 500
+        assert all(rate.annual_interest_rate == 0.01 + (offset + i) % 16 / 1000
+                   for offset, rates in enumerate(results) for i, rate in enumerate(rates))
+
+    def test_pickle(self):
+        cache = RateCache(maxsize=4)
+        cache.get_rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31')
+        restored = pickle.loads(pickle.dumps(cache))
+        assert len(restored) == 1
+        restored.get_rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31')
+        assert restored.hits == 1
+
+    def test_mortgage_prefix_reused(self, rates_configs):
+        cache = RateCache()
+        Mortgage(100_000, rates_configs, rate_cache=cache)
+        rates_configs[-1]['rate'] = 0.04
+        Mortgage(100_000, rates_configs, rate_cache=cache)
+        assert cache.hits == 2
+        assert cache.misses == 4
+
+
+class TestWithRate:
+
+    def test_with_rate(self, rates_configs):
+        mortgage = Mortgage(100_000, rates_configs, rate_cache=None)
+        new_config = dict(rates_configs[-1], rate=0.04)
+        changed = mortgage.with_rate(-1, new_config)
+        assert changed.rates[:2] == mortgage.rates[:2]
+        assert changed.rates[2] is not mortgage.rates[2]
+        assert changed.end_balance == Mortgage(100_000, rates_configs[:2] + [new_config],
+                                               rate_cache=None).end_balance
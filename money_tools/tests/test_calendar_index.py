@@ -0,0 +1,108 @@
+from money_tools import Mortgage
+from money_tools.calendar_index import (CalendarIndex, calendar_window, day_of_month, day_range, is_month_end,
+                                        payment_mask, years_out)
+from money_tools.rate import Rate
+import numpy as np
+import pytest
+
+
+class TestCalendarIndex:
+
+    def test_window_tables(self):
+        calendar = calendar_window('2019-03-17', '2024-02-29')
+        days = day_range('2019-03-17', '2024-02-29')
+        assert (calendar.days == days).all()
+        assert (calendar.day_of_month == day_of_month(days)).all()
+        assert (calendar.month_end == is_month_end(days)).all()
+        assert (calendar.payment_mask(17) == payment_mask(days, 17)).all()
+        assert (calendar.years_out() == years_out(days, days[0])).all()
+        assert (days[calendar.anniversary_offsets()] == np.array(['2020-03-17', '2021-03-17', '2022-03-17',
+                                                                  '2023-03-17'], dtype='datetime64[D]')).all()
+
+    def test_windows_share_tables(self):
+        first = calendar_window('2019-01-01', '2019-12-31')
+        second = calendar_window('2019-06-01', '2019-06-30')
+        assert np.shares_memory(first.payment_mask(1), second.payment_mask(1))
+        with pytest.raises(ValueError):
+            second.days[0] = np.datetime64('2000-01-01')
+
+    def test_index_grows(self):
+        calendar_window('2019-01-01', '2019-12-31')
+        calendar = calendar_window('1999-05-01', '2101-01-01')
+        assert calendar.index.first_year <= 1999 and calendar.index.last_year >= 2101
+        assert calendar.days[0] == np.datetime64('1999-05-01') and calendar.days[-1] == np.datetime64('2101-01-01')
+        assert len(calendar_window('2019-01-02', '2019-01-01')) == 0
+
+    def test_short_months(self):
+        calendar = calendar_window('2021-01-01', '2021-04-30')
+        assert (calendar.days[calendar.payment_offsets(31)].astype(str) == ['2021-01-31', '2021-03-31']).all()
+        assert (calendar.days[calendar.payment_offsets(31, 'last_day')].astype(str)
+                == ['2021-01-31', '2021-02-28', '2021-03-31', '2021-04-30']).all()
+        with pytest.raises(ValueError):
+            calendar.payment_mask(31, 'next_day')
+
+    def test_day_counts(self):
+        index = CalendarIndex(2020, 2021)
+        leap = index.window('2020-01-01', '2020-12-31')
+        accrual, basis = leap.day_count('ACT/365F')
+        assert (accrual / basis).sum() == pytest.approx(366 / 365)
+        accrual, basis = leap.day_count('ACT/ACT')
+        assert (accrual / basis).sum() == pytest.approx(1)
+
+        accrual, basis = index.window('2020-01-01', '2021-12-31').day_count('30/360')
+        assert (basis == 360).all()
+        months = index.window('2020-01-01', '2021-12-31').days.astype('datetime64[M]')
+        assert (np.bincount((months - months[0]).astype(int), weights=accrual) == 30).all()
+        with pytest.raises(ValueError):
+            index.day_count('ACT/364')
+
+
+class TestDayCount:
+
+    @pytest.mark.parametrize('engine', ['exact', 'closed_form'])
+    def test_act_365f_matches_default(self, engine):
+        args = (100_000, 0.03, 1000)
+        kwargs = dict(start_date='2020-01-01', end_date='2021-12-31', engine=engine)
+        default = Rate(*args, **kwargs)
+        explicit = Rate(*args, day_count='ACT/365F', events=[{"date": '2000-01-01', "type": "lump_sum",
+                                                              "amount": 1}], **kwargs)
+        np.testing.assert_allclose(default.schedule_arrays[1], explicit.schedule_arrays[1],
+                                   rtol=0 if engine == 'exact' else 1e-9)
+
+    def test_act_act(self):
+        kwargs = dict(start_date='2020-01-01', end_date='2020-12-31')
+        act_365 = Rate(100_000, 0.03, 0, **kwargs)
+        act_act = Rate(100_000, 0.03, 0, day_count='ACT/ACT', **kwargs)
+        assert act_act.schedule['Interest'].iloc[0] == round(100_000 * 0.03 / 366, 2)
+        assert act_act.totals['Total Interest'] < act_365.totals['Total Interest']
+
+    def test_thirty_360(self):
+        rate = Rate(100_000, 0.03, 0, start_date='2021-01-01', end_date='2021-12-31', day_count='30/360')
+        schedule = rate.schedule.set_index('Date')
+        assert schedule.loc['2021-01-31', 'Interest'] == 0
+        assert schedule.loc['2021-02-28', 'Interest'] == pytest.approx(3 * schedule.loc['2021-02-27', 'Interest'],
+                                                                       abs=0.02)
+        assert rate.totals['Total Interest'] == pytest.approx(100_000 * ((1 + 0.03 / 360) ** 360 - 1), abs=1)
+
+    def test_closed_form(self):
+        kwargs = dict(start_date='2020-01-01', end_date='2024-12-31', day_count='ACT/ACT')
+        exact = Rate(100_000, 0.03, 1000, **kwargs)
+        closed_form = Rate(100_000, 0.03, 1000, engine='closed_form', **kwargs)
+        assert closed_form.end_balance == pytest.approx(exact.end_balance, abs=1)
+
+    def test_mortgage(self):
+        rates_configs = [{"rate": 0.02, "monthly_payment": 1000, "start_date": '2020-01-01', "term": None,
+                          "end_date": '2020-12-31', "payment_day": 1},
+                         {"rate": 0.03, "monthly_payment": 1000, "start_date": '2021-01-01', "term": None,
+                          "end_date": '2021-12-31', "payment_day": 1}]
+        mortgage = Mortgage(100_000, rates_configs, day_count='ACT/ACT')
+        assert [rate.day_count for rate in mortgage.rates] == ['ACT/ACT', 'ACT/ACT']
+        assert mortgage.end_balance != Mortgage(100_000, rates_configs).end_balance
+        assert mortgage.with_rate(1, rates_configs[1]).end_balance == mortgage.end_balance
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            Rate(100_000, 0.03, 1000, start_date='2020-01-01', end_date='2020-12-31', day_count='ACT/360')
+        with pytest.raises(ValueError):
+            Rate(100_000, 0.03, 1000, start_date='2020-01-01', end_date='2020-12-31', day_count='ACT/ACT',
+                 engine='pence')
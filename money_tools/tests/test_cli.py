@@ -0,0 +1,51 @@
+from money_tools.cli import main, run
+from money_tools.service import quote_batch
+import io
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def request_lines(n):
+    rates_configs = [{"rate": 0.02, "monthly_payment": 1000, "start_date": '2024-01-01', "term": None,
+                      "end_date": '2025-12-31', "payment_day": 1}]
+    return [json.dumps({"id": f'q{i}', "start_balance": 50_000 + i, "rates_configs": rates_configs}) + '\n'
+            for i in range(n)]
+
+
+class TestRun:
+
+    def test_in_process(self):
+        output = io.StringIO()
+        failures = run(request_lines(5) + ['\n', 'not json\n'], output, workers=1, chunksize=2)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert failures == 1
+        assert [response['index'] for response in responses] == [0, 1, 2, 3, 4, 6]
+        assert responses[0]['quote'] == quote_batch([json.loads(request_lines(1)[0])])[0][0]
+        assert responses[-1]['error'].startswith('JSONDecodeError')
+
+    def test_worker_pool(self):
+        output = io.StringIO()
+        assert run(request_lines(7), output, workers=2, chunksize=2) == 0
+        assert [json.loads(line)['id'] for line in output.getvalue().splitlines()] == [f'q{i}' for i in range(7)]
+
+    def test_engine_default(self):
+        lines = request_lines(1)
+        output = io.StringIO()
+        run(lines, output, workers=1, engine='pence')
+        expected, _ = quote_batch([dict(json.loads(lines[0]), engine='pence')])[0]
+        assert json.loads(output.getvalue())['quote'] == expected
+
+    def test_files(self, tmp_path):
+        (tmp_path / 'requests.jsonl').write_text(''.join(request_lines(3)))
+        assert main(['run', str(tmp_path / 'requests.jsonl'), '-o', str(tmp_path / 'quotes.jsonl'), '-w', '1']) == 0
+        assert len((tmp_path / 'quotes.jsonl').read_text().splitlines()) == 3
+
+    def test_console(self):
+        result = subprocess.run([sys.executable, '-m', 'money_tools', 'run', '-w', '1'], cwd=ROOT,
+                                input=''.join(request_lines(2)) + '{}\n', capture_output=True, text=True)
+        assert result.returncode == 1
+        assert len(result.stdout.splitlines()) == 3
@@ -0,0 +1,94 @@
+from money_tools import Mortgage
+from money_tools.compact import CompactSchedule
+from money_tools.store import ScheduleStore
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def rates_configs():
+    return [{"rate": 0.03, "monthly_payment": 1000, "start_date": '2024-01-01', "term": None,
+             "end_date": '2025-12-31', "payment_day": 1},
+            {"rate": 0.05, "monthly_payment": 1100, "start_date": '2026-01-01', "term": None,
+             "end_date": '2030-12-31', "payment_day": 15}]
+
+
+class TestCompactSchedule:
+
+    def test_pence_round_trip(self, rates_configs):
+        arrays = Mortgage(100_000, rates_configs, engine='pence').schedule_arrays
+        compact = CompactSchedule.from_arrays(*arrays)
+        for restored, original in zip(compact.arrays(), arrays):
+            assert (restored == original).all()
+        assert compact.offsets.dtype == np.int32
+        assert compact.amounts.dtype == np.int64
+        assert list(compact.begin_rows) == [0]
+
+    def test_float32(self, rates_configs):
+        days, periods, amounts = Mortgage(100_000, rates_configs).schedule_arrays
+        compact = CompactSchedule.from_arrays(days, periods, amounts, compact='float32')
+        assert compact.nbytes < 0.5 * (days.nbytes + periods.nbytes + amounts.nbytes)
+        np.testing.assert_allclose(compact.arrays()[2], amounts, atol=0.01)
+
+    def test_begin_breaks(self):
+        days = np.arange('2024-01-01', '2024-01-05', dtype='datetime64[D]')
+        amounts = np.array([[100, 0, 1, 0, 101], [101, 0, 1, 0, 102], [50, 0, 1, 0, 51], [51, 0, 1, 0, 52]], float)
+        compact = CompactSchedule.from_arrays(days, np.array([1, 2, 1, 2]), amounts)
+        assert list(compact.begin_rows) == [0, 2]
+        assert (compact.arrays()[2] == amounts).all()
+        assert (compact.periods == [1, 2, 1, 2]).all()
+
+    def test_empty(self):
+        compact = CompactSchedule.from_arrays(np.array([], dtype='datetime64[D]'), np.array([], dtype=np.int32),
+                                              np.zeros((0, 5)))
+        days, periods, amounts = compact.arrays()
+        assert len(days) == len(periods) == len(amounts) == 0
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            CompactSchedule.from_arrays(np.array([], dtype='datetime64[D]'), np.array([]), np.zeros((0, 5)),
+                                        compact='float16')
+
+
+class TestCompactMortgage:
+
+    @pytest.mark.parametrize('compact', ['pence', 'float32'])
+    def test_matches_full(self, rates_configs, compact):
+        full = Mortgage(100_000, rates_configs, rate_cache=None)
+        mortgage = Mortgage(100_000, rates_configs, rate_cache=None, compact=compact)
+        atol = 1e-6 if compact == 'pence' else 0.01
+        assert (mortgage.schedule['Date'] == full.schedule['Date']).all()
+        assert (mortgage.schedule['Period'] == full.schedule['Period']).all()
+        np.testing.assert_allclose(mortgage.schedule['End Balance'], full.schedule['End Balance'], atol=atol)
+        np.testing.assert_allclose(mortgage.schedule_monthly['Interest'], full.schedule_monthly['Interest'],
+                                   atol=atol * 31)
+        assert mortgage.payment_summary().iloc[0]['End Balance'] == pytest.approx(full.end_balance, abs=atol)
+
+    def test_keeps_only_compact(self, rates_configs):
+        mortgage = Mortgage(100_000, rates_configs, rate_cache=None, compact='pence')
+        mortgage.schedule_monthly
+        mortgage.payment_summary()
+        assert mortgage.schedule is not mortgage.schedule
+        assert {'_schedule', '_schedule_arrays', '_summary_index_arrays'}.isdisjoint(vars(mortgage))
+        assert all('schedule_arrays' not in vars(rate) for rate in mortgage.rates)
+        assert 'compact_schedule' in vars(mortgage)
+
+    def test_aggregates_build_schedule_once(self, rates_configs, monkeypatch):
+        mortgage = Mortgage(100_000, rates_configs, rate_cache=None, compact='pence')
+        builds = []
+        calc_schedule = mortgage.calc_schedule
+        monkeypatch.setattr(mortgage, 'calc_schedule', lambda: builds.append(1) or calc_schedule())
+        mortgage.schedule_monthly
+        mortgage.schedule_yearly
+        assert len(builds) == 2
+
+    def test_with_rate_and_store(self, rates_configs, tmp_path):
+        store = ScheduleStore(str(tmp_path))
+        mortgage = Mortgage(100_000, rates_configs, compact='pence', schedule_store=store)
+        assert mortgage.with_rate(1, rates_configs[1]).compact == 'pence'
+        stored = Mortgage(100_000, rates_configs, compact='pence', schedule_store=store)
+        assert (mortgage.compact_schedule.amounts == stored.compact_schedule.amounts).all()
+
+    def test_invalid(self, rates_configs):
+        with pytest.raises(ValueError):
+            Mortgage(100_000, rates_configs, compact='int8')
@@ -0,0 +1,54 @@
+from money_tools import Mortgage
+from money_tools.export import export_schedules
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def dummy_rates_list():
+    rate_config1 = {
+            "rate": 0.01,
+            "monthly_payment": 1000.00,
+            "start_date": '2019-01-01',
+            "term": None,
+            "end_date": '2019-12-31',
+            "payment_day": 1
+        }
+
+    rate_config2 = {
+            "rate": 0.02,
+            "monthly_payment": 1000.00,
+            "start_date": '2020-01-01',
+            "term": None,
+            "end_date": '2020-12-31',
+            "payment_day": 1
+        }
+    return [rate_config1, rate_config2]
+
+
+class TestExportSchedules:
+
+    def test_csv(self, tmp_path, dummy_rates_list):
+        mortgages = [Mortgage(balance, dummy_rates_list) for balance in (100_000, 5_000)]
+        path = tmp_path / 'schedules.csv'
+        written = export_schedules(iter(mortgages), str(path), rows=50)
+
+        exported = pd.read_csv(path, parse_dates=['Date'])
+        assert written == len(exported) == sum(len(mortgage.schedule) for mortgage in mortgages)
+        assert list(exported.columns) == ['Mortgage'] + list(mortgages[0].schedule.columns)
+        for index, mortgage in enumerate(mortgages):
+            schedule = exported[exported['Mortgage'] == index].drop(columns='Mortgage').reset_index(drop=True)
+            pd.testing.assert_frame_equal(schedule, mortgage.schedule, check_dtype=False)
+
+    def test_parquet(self, tmp_path, dummy_rates_list):
+        pytest.importorskip('pyarrow')
+        mortgage = Mortgage(100_000, dummy_rates_list)
+        path = tmp_path / 'schedules.parquet'
+        export_schedules([mortgage], str(path), rows=50)
+
+        exported = pd.read_parquet(path).drop(columns='Mortgage')
+        pd.testing.assert_frame_equal(exported, mortgage.schedule, check_dtype=False)
+
+    def test_unknown_format(self, tmp_path, dummy_rates_list):
+        with pytest.raises(ValueError):
+            export_schedules([Mortgage(100_000, dummy_rates_list)], str(tmp_path / 'schedules.txt'))
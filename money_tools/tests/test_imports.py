@@ -0,0 +1,42 @@
+import json
+import os
+import subprocess
+import sys
+import money_tools
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(money_tools.__file__)))
+
+
+# Budget for a cold import of the array engines and Rate, on top of the interpreter start up
+IMPORT_BUDGET_SECONDS = 1.0
+
+IMPORT_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import money_tools.engine, money_tools.solvers
+from money_tools import Rate
+Rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31').totals
+elapsed = time.perf_counter() - start
+from money_tools import Mortgage
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+'''
+
+
+def run_import_script(script=IMPORT_SCRIPT):
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True, cwd=ROOT)
+    return json.loads(result.stdout)
+
+
+class TestImports:
+
+    def test_import_time_budget(self):
+        assert run_import_script()['elapsed'] < IMPORT_BUDGET_SECONDS
+
+    def test_no_plotting_imports(self):
+        modules = run_import_script()['modules']
+        assert 'matplotlib' not in modules
+        assert 'money_tools.plotting' not in modules
+
+    def test_array_engines_without_pandas(self):
+        script = IMPORT_SCRIPT.replace('from money_tools import Mortgage', '')
+        assert 'pandas' not in run_import_script(script)['modules']
@@ -0,0 +1,64 @@
+from money_tools import Mortgage
+from money_tools.cache import RateCache
+from money_tools.instrumentation import collector
+import json
+import pytest
+
+
+@pytest.fixture
+def dummy_rate():
+    rate_config = {
+            "rate": 0.01,
+            "monthly_payment": 1000.00,
+            "start_date": '2019-01-01',
+            "term": None,
+            "end_date": '2019-12-31',
+            "payment_day": 1
+        }
+    return rate_config
+
+
+@pytest.fixture
+def enabled_collector():
+    collector.clear()
+    collector.enable(track_memory=True)
+    yield collector
+    collector.disable()
+    collector.clear()
+
+
+class TestInstrumentation:
+
+    def test_disabled_by_default(self, dummy_rate):
+        assert not collector.enabled
+        mortgage = Mortgage(100_000, [dummy_rate])
+        mortgage.schedule_monthly
+        assert mortgage.build_stats == []
+
+    def test_build_stats(self, dummy_rate, enabled_collector):
+        rate_cache = RateCache()
+        Mortgage(100_000, [dummy_rate], rate_cache=rate_cache)
+        mortgage = Mortgage(100_000, [dummy_rate], rate_cache=rate_cache)
+        mortgage.schedule_monthly
+        mortgage.schedule_yearly
+        mortgage.payment_summary()
+
+        stats = {record['stage']: record for record in mortgage.build_stats}
+        assert list(stats) == ['rates', 'schedule_arrays', 'schedule', 'schedule_monthly', 'schedule_yearly',
+                               'summary_index']
+        assert stats['rates']['cache_hits'] == 1
+        assert stats['rates']['rows'] == stats['schedule']['rows'] == 365
+        assert stats['schedule_monthly']['rows'] == 12
+        assert stats['schedule']['bytes'] > 0
+        assert all(record['seconds'] >= 0 for record in mortgage.build_stats)
+
+    def test_collector_dump(self, dummy_rate, enabled_collector, tmp_path):
+        for _ in range(2):
+            Mortgage(100_000, [dummy_rate], rate_cache=None).schedule
+        path = tmp_path / 'stats.json'
+        enabled_collector.dump(str(path))
+
+        dumped = json.loads(path.read_text())
+        assert dumped['summary']['schedule']['count'] == 2
+        assert dumped['summary']['schedule']['rows'] == 730
+        assert len(dumped['records']) == 6
@@ -1,6 +1,7 @@
 import pytest
 from money_tools import Mortgage, Rate
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
 
@@ -39,6 +40,43 @@ class TestSingleRateMortgage(object):
         df = mortgage.payment_summary()
         assert type(df) == pd.DataFrame
 
+    def test_payment_summary_range(self, dummy_rate):
+        mortgage = Mortgage(100_000, [dummy_rate])
+        df = mortgage.payment_summary('2019-03-01', '2019-05-31')
+        schedule = mortgage.schedule
+        in_range = schedule[(schedule['Date'] >= '2019-03-01') & (schedule['Date'] <= '2019-05-31')]
+        assert df['Start Balance'].iloc[0] == in_range['Begin Balance'].max()
+        assert round(df['Total Interest'].iloc[0], 2) == round(in_range['Interest'].sum(), 2)
+        assert df['End Balance'].iloc[0] == in_range['End Balance'].iloc[-1]
+
+    def test_payment_summaries(self, dummy_rate):
+        mortgage = Mortgage(100_000, [dummy_rate])
+        periods = [('2019-01-01', '2019-01-31'), ('2019-02-01', '2019-12-31'), ('2020-01-01', '2020-12-31')]
+        df = mortgage.payment_summaries(periods)
+        assert len(df) == 3
+        assert round(df['Total Payments'].iloc[:2].sum(), 2) == 12_000
+        assert df['End Balance'].iloc[1] == mortgage.end_balance
+        assert pd.isna(df['End Balance'].iloc[2])
+
+        dates = np.array(periods, dtype='datetime64[D]')
+        assert mortgage.payment_summaries(dates).equals(df)
+        assert mortgage.payment_summaries(period for period in periods).equals(df)
+        assert mortgage.payment_summaries(period for period in []).empty
+
+    def test_payment_summaries_empty_schedule(self, dummy_rate):
+        mortgage = Mortgage(0, [dummy_rate])
+        assert len(mortgage.schedule) == 0
+        assert mortgage.payment_summary().empty
+        df = mortgage.payment_summaries([('2019-01-01', '2019-12-31')])
+        assert df.empty and list(df.columns) == list(Mortgage(100_000, [dummy_rate]).payment_summary().columns)
+
+    def test_totals(self, dummy_rate):
+        mortgage = Mortgage(100_000, [dummy_rate])
+        assert 'schedule' not in vars(mortgage)
+        assert mortgage.totals['Periods'] == 365
+        assert mortgage.end_date == mortgage.schedule['Date'].iloc[-1]
+        assert round(mortgage.totals['Total Interest'], 2) == round(mortgage.schedule['Interest'].sum(), 2)
+
     def test_yearly_schedule(self):
 
         rate_config = {
@@ -52,6 +90,36 @@ class TestSingleRateMortgage(object):
         mortgage = Mortgage(100_000, [rate_config])
         assert round(mortgage.schedule_yearly.Interest.sum(), 2) == 1_745.60
 
+    def test_aggregation_leaves_schedule_unchanged(self, dummy_rate):
+        mortgage = Mortgage(100_000, [dummy_rate])
+        columns = list(mortgage.schedule.columns)
+        mortgage.schedule_monthly
+        mortgage.schedule_yearly
+        assert list(mortgage.schedule.columns) == columns
+
+    def test_plots_leave_schedule_unchanged(self, dummy_rate):
+        matplotlib = pytest.importorskip('matplotlib')
+        matplotlib.use('Agg')
+        mortgage = Mortgage(100_000, [dummy_rate])
+        columns = list(mortgage.schedule_monthly.columns)
+        mortgage.plot_monthly_schedule()
+        mortgage.plot_cumulative_monthly_schedule()
+        assert list(mortgage.schedule_monthly.columns) == columns
+        matplotlib.pyplot.close('all')
+
+    def test_yearly_schedule_leap_day_start(self):
+        rate_config = {
+            "rate": 0.01,
+            "monthly_payment": 1100,
+            "start_date": '2020-02-29',
+            "term": None,
+            "end_date": '2022-03-31',
+            "payment_day": 1
+        }
+        mortgage = Mortgage(100_000, [rate_config])
+        assert mortgage.schedule_yearly['Date'].dt.strftime('%Y-%m-%d').tolist() == \
+            ['2021-02-27', '2022-02-27', '2022-03-31']
+
 # Dummy Rate Data
 @pytest.fixture
 def dummy_rates_list():
@@ -80,6 +148,57 @@ class TestMultiRateMortgage(object):
         mortgage = Mortgage(100_000, dummy_rates_list)
         assert type(mortgage) == Mortgage
 
+    def test_schedule(self, dummy_rates_list):
+        mortgage = Mortgage(100_000, dummy_rates_list)
+        assert len(mortgage.schedule) == 365 + 366
+        assert mortgage.schedule['Period'].iloc[365] == 1
+        assert mortgage.schedule['End Balance'].iloc[-1] == mortgage.end_balance
+        assert mortgage.end_date == pd.Timestamp('2020-12-31')
+
+    def test_paid_off_before_last_rate(self, dummy_rates_list):
+        mortgage = Mortgage(5_000, dummy_rates_list)
+        assert mortgage.end_balance <= 0
+        assert mortgage.end_date == mortgage.schedule['Date'].iloc[-1]
+
+    def test_monthly_interest(self, dummy_rates_list):
+        mortgage = Mortgage(100_000, dummy_rates_list, interest_calculated='monthly')
+        assert len(mortgage.schedule) == 24
+        assert mortgage.schedule['Period'].iloc[12] == 1
+        assert mortgage.schedule_monthly['End Balance'].tolist() == mortgage.schedule['End Balance'].tolist()
+        assert mortgage.schedule_yearly['End Balance'].iloc[-1] == mortgage.end_balance
+        assert mortgage.end_date == pd.Timestamp('2020-12-31')
+        assert mortgage.payment_summary()['Total Payments'].iloc[0] == 24_000
+
+    def test_monthly_interest_paid_off(self, dummy_rates_list):
+        mortgage = Mortgage(5_000, dummy_rates_list, interest_calculated='monthly')
+        assert mortgage.end_balance <= 0
+        assert mortgage.end_date == mortgage.schedule['Date'].iloc[-1]
+
+    def test_events(self, dummy_rates_list):
+        events = [{"date": '2019-12-01', "type": "holiday", "end_date": '2020-02-29'},
+                  {"date": '2020-06-01', "type": "rate", "rate": 0.01}]
+        mortgage = Mortgage(100_000, dummy_rates_list, events=events)
+        split = [dict(dummy_rates_list[0], end_date='2019-11-30'),
+                 dict(dummy_rates_list[0], start_date='2019-12-01', monthly_payment=0),
+                 dict(dummy_rates_list[1], end_date='2020-02-29', monthly_payment=0),
+                 dict(dummy_rates_list[1], start_date='2020-03-01', end_date='2020-05-31'),
+                 dict(dummy_rates_list[1], start_date='2020-06-01', rate=0.01)]
+        expected = Mortgage(100_000, split)
+        assert [len(rate.events) for rate in mortgage.rates] == [1, 2]
+        assert mortgage.end_balance == pytest.approx(expected.end_balance)
+        assert mortgage.totals['Total Interest'] == pytest.approx(expected.totals['Total Interest'])
+
+    def test_schedule_chunks(self, dummy_rates_list):
+        mortgage = Mortgage(100_000, dummy_rates_list, rate_cache=None)
+        chunks = list(mortgage.iter_schedule_chunks(rows=100))
+        assert max(len(chunk) for chunk in chunks) == 100
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), mortgage.schedule)
+
+    def test_schedule_chunks_paid_off(self, dummy_rates_list):
+        mortgage = Mortgage(5_000, dummy_rates_list, rate_cache=None)
+        chunks = list(mortgage.iter_schedule_chunks(rows=2))
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), mortgage.schedule)
+
     @pytest.mark.skip
     def test_end_balance(self, dummy_rate):
         mortgage = Mortgage(100_000, dummy_rates_list)
@@ -0,0 +1,74 @@
+from money_tools import Mortgage
+from money_tools.optimize import optimize_plans
+import itertools
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def menus():
+    first = [{"name": "2yr low", "rate": 0.0163, "monthly_payment": 1200, "fee": 999, "term": 2},
+             {"name": "2yr med", "rate": 0.0179, "monthly_payment": 1200, "fee": 299, "term": 2},
+             {"name": "1yr", "rate": 0.0150, "monthly_payment": 1200, "fee": 1499, "term": 1}]
+    later = [{"name": "2yr", "rate": 0.0250, "monthly_payment": 1200, "fee": 999, "term": 2},
+             {"name": "svr", "rate": 0.0450, "monthly_payment": 1200, "fee": 0, "term": 1}]
+    return [first, later]
+
+
+def brute_force_costs(start_balance, menus, start_date, end_date):
+    """Total cost of every product sequence, built one Mortgage at a time"""
+    start_date, end_date = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    costs = set()
+    max_renewals = (end_date - start_date).days // 365 + 1
+    for n_products in range(1, max_renewals + 1):
+        menu_sequence = [menus[min(i, len(menus) - 1)] for i in range(n_products)]
+        for products in itertools.product(*menu_sequence):
+            rates_configs = []
+            renewal_date = start_date
+            for product in products:
+                if renewal_date > end_date:
+                    break
+                product_end = min(renewal_date + pd.DateOffset(years=product['term'], days=-1), end_date)
+                rates_configs.append({"rate": product['rate'], "monthly_payment": product['monthly_payment'],
+                                      "start_date": renewal_date.date(), "term": None,
+                                      "end_date": product_end.date(), "payment_day": 1})
+                renewal_date = product_end + pd.DateOffset(days=1)
+            # Only sequences whose last product, and no earlier one, reaches the end date are whole plans
+            if len(rates_configs) < len(products) or renewal_date <= end_date:
+                continue
+            mortgage = Mortgage(start_balance, rates_configs)
+            fees = sum(product.get('fee', 0) for product in products)
+            costs.add(round(mortgage.totals['Total Interest'] + fees, 6))
+    return sorted(costs)
+
+
+class TestOptimizePlans:
+
+    def test_top_plans_sorted(self, menus):
+        plans = optimize_plans(270_000, menus, start_date='2020-01-01', term=4, top_k=3)
+        assert len(plans) == 3
+        costs = [plan['Total Cost'] for plan in plans]
+        assert costs == sorted(costs)
+
+    def test_matches_brute_force(self, menus):
+        plans = optimize_plans(270_000, menus, start_date='2020-01-01', end_date='2023-12-31', top_k=3)
+        expected = brute_force_costs(270_000, menus, '2020-01-01', '2023-12-31')
+        assert [round(plan['Total Cost'], 6) for plan in plans] == pytest.approx(expected[:3], abs=1e-6)
+
+    def test_states_facing_different_menus(self):
+        """A state is not pruned by a cheaper one at the same date that faces a different menu"""
+        products = {name: {"name": name, "rate": rate, "monthly_payment": 2000, "fee": 0, "term": term}
+                    for name, rate, term in [('A', 0.01, 1), ('B', 0.02, 2), ('cheap', 0.005, 1), ('dear', 0.10, 1)]}
+        menus = [[products['A'], products['B']], [products['cheap']], [products['dear']]]
+        plan = optimize_plans(100_000, menus, start_date='2020-01-01', end_date='2023-01-01', top_k=1)[0]
+        assert [product['name'] for product in plan['products']] == ['B', 'cheap', 'dear']
+        assert round(plan['Total Cost'], 6) == min(brute_force_costs(100_000, menus, '2020-01-01', '2023-01-01'))
+        assert round(plan['Total Cost'], 2) == 3292.98
+
+    def test_plan_builds_mortgage(self, menus):
+        plan = optimize_plans(270_000, menus, start_date='2020-01-01', term=4, top_k=1)[0]
+        mortgage = Mortgage(270_000, plan['rates_configs'])
+        summary = mortgage.payment_summary()
+        assert mortgage.end_balance == plan['End Balance']
+        assert round(summary['Total Interest'].iloc[0], 2) == round(plan['Total Interest'], 2)
+        assert plan['Total Fees'] == sum(product['fee'] for product in plan['products'])
@@ -0,0 +1,55 @@
+from money_tools import Mortgage
+from money_tools.parallel import bounded_map, run_mortgages
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def configs():
+    def rate_config(monthly_payment):
+        return {
+            "rate": 0.01,
+            "monthly_payment": monthly_payment,
+            "start_date": '2019-01-01',
+            "term": None,
+            "end_date": '2019-12-31',
+            "payment_day": 1
+        }
+    return [(100_000, [rate_config(pmt)]) for pmt in (900, 1000, 1100, 1200, 1300)]
+
+
+class TestRunMortgages:
+
+    def test_ordered_results(self, configs):
+        results = list(run_mortgages(configs, workers=2, chunksize=2))
+        assert [index for index, _, _ in results] == list(range(len(configs)))
+        assert all(error is None for _, _, error in results)
+
+    def test_matches_payment_summary(self, configs):
+        _, summary, _ = next(run_mortgages(configs[:1], workers=1))
+        expected = Mortgage(*configs[0]).payment_summary().iloc[0]
+        assert summary['End Balance'] == expected['End Balance']
+        assert summary['End Date'] == pd.Timestamp('2019-12-31')
+
+    def test_zero_balance(self, configs):
+        (index, summary, error), = run_mortgages([(0, configs[0][1])], workers=1)
+        assert error is None
+        assert summary['Start Balance'] == 0 and summary['End Balance'] == 0
+        assert summary['Total Payments'] == 0 and summary['Total Interest'] == 0
+        assert summary['Start Date'] == pd.Timestamp('2019-01-01')
+
+    def test_failure_does_not_stop_run(self, configs):
+        configs.insert(2, (100_000, []))
+        results = list(run_mortgages(configs, workers=2, chunksize=1, ordered=False))
+        assert len(results) == 6
+        failed = [(index, error) for index, summary, error in results if summary is None]
+        assert len(failed) == 1
+        assert failed[0][0] == 2
+        assert 'ValueError' in failed[0][1]
+
+
+class TestBoundedMap:
+
+    def test_extra_arguments(self):
+        assert list(bounded_map(pow, [1, 2, 3], 2, workers=1)) == [1, 4, 9]
+        assert sorted(bounded_map(pow, [1, 2, 3], 3, workers=2, ordered=False)) == [1, 8, 27]
@@ -0,0 +1,67 @@
+from money_tools import Mortgage
+from money_tools.portfolio import Portfolio
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def rates_configs(rate, monthly_payment, payment_day):
+    return [
+        {
+            "rate": rate,
+            "monthly_payment": monthly_payment,
+            "start_date": '2019-01-01',
+            "term": None,
+            "end_date": '2019-12-31',
+            "payment_day": payment_day
+        },
+        {
+            "rate": rate + 0.01,
+            "monthly_payment": monthly_payment,
+            "start_date": '2020-01-01',
+            "term": None,
+            "end_date": '2021-06-30',
+            "payment_day": payment_day
+        },
+    ]
+
+
+@pytest.fixture
+def loans():
+    start_balances = [100_000, 200_000.005, 150_000, 5_000]
+    rates_configs_list = [rates_configs(0.01, 1000, 1), rates_configs(0.03, 1500, 15),
+                          rates_configs(0.02, 800, 31), rates_configs(0.02, 800, 31)[:1]]
+    return start_balances, rates_configs_list
+
+
+class TestPortfolio:
+
+    def test_matches_mortgages(self, loans):
+        portfolio = Portfolio.from_configs(*loans)
+        for i, (start_balance, configs) in enumerate(zip(*loans)):
+            mortgage = Mortgage(start_balance, configs, rate_cache=None)
+            assert portfolio.end_balance[i] == mortgage.end_balance
+            assert portfolio.totals['Periods'][i] == mortgage.totals['Periods']
+            assert portfolio.totals['Total Interest'][i] == pytest.approx(mortgage.totals['Total Interest'])
+            assert portfolio.totals['Total Payments'][i] == pytest.approx(mortgage.totals['Total Payments'])
+            assert portfolio.end_date[i] == np.datetime64(mortgage.end_date.date())
+
+    def test_schedule_monthly(self, loans):
+        start_balances, rates_configs_list = loans
+        portfolio = Portfolio.from_configs(start_balances[:3], rates_configs_list[:3])
+        columns = ['Payment', 'Interest', 'End Balance']
+        expected = sum(Mortgage(start_balance, configs).schedule_monthly.set_index('Month Date')[columns]
+                       for start_balance, configs in zip(start_balances[:3], rates_configs_list[:3]))
+        monthly = portfolio.schedule_monthly.set_index('Month Date')
+        pd.testing.assert_frame_equal(monthly[columns], expected)
+        assert (monthly['Loans'] == 3).all()
+
+    def test_arrays(self):
+        portfolio = Portfolio([100_000, 200_000], [[0.01], [0.02]], 1000, '2019-01-01', '2019-12-31')
+        mortgage = Mortgage(200_000, rates_configs(0.02, 1000, 1)[:1])
+        assert len(portfolio) == 2
+        assert portfolio.end_balance[1] == mortgage.end_balance
+
+    def test_no_rates(self):
+        with pytest.raises(ValueError):
+            Portfolio([100_000], [[0.01]], 1000, np.datetime64('NaT'), '2019-12-31')
@@ -1,7 +1,11 @@
 from money_tools import amortize_table
 from money_tools import Rate
+from money_tools.calendar_index import day_range, payment_mask
+from money_tools.engine import amortize_arrays, amortize_batch, amortize_totals, divide_pence, round2
 from datetime import datetime
+import numpy as np
 import pandas as pd
+import pytest
 
 class TestAmortisation:
 
@@ -39,6 +43,28 @@ class TestAmortisation:
         assert round(amortisation_table.iloc[-1, -1], 2) == 87_736.49
         # * Google Sheet Test3 = 87,736.49
 
+    def test_amortize_table_dtypes(self):
+        amortisation_table = amortize_table(principal=100000,
+                                            interest_rate=0.01,
+                                            monthly_pmt=1000,
+                                            start_date=datetime(2019,1,1),
+                                            end_date=datetime(2019,12,31))
+        assert amortisation_table['Date'].dtype.kind == 'M'
+        assert amortisation_table['Period'].dtype == np.int32
+        assert (amortisation_table.dtypes.iloc[2:] == np.float64).all()
+
+    def test_amortize_table_as_array(self):
+        records = amortize_table(principal=100000,
+                                 interest_rate=0.01,
+                                 monthly_pmt=1000,
+                                 start_date=datetime(2019,1,1),
+                                 end_date=datetime(2019,12,31),
+                                 as_array=True)
+        assert isinstance(records, np.ndarray)
+        assert records['Date'][-1] == np.datetime64('2019-12-31')
+        assert records['Period'][-1] == 365
+        assert round(records['End Balance'][-1], 2) == 88_939.88
+
 
 class TestRate:
 
@@ -69,6 +95,27 @@ class TestRate:
                     )
         assert round(rate.end_balance, 2) == 88_939.88
 
+    def test_schedule_is_lazy(self):
+        rate = Rate(start_balance=100000,
+                    annual_interest_rate=0.01,
+                    monthly_payment=1000,
+                    start_date=datetime(2019, 1, 1),
+                    end_date=datetime(2019, 12, 31)
+                    )
+        assert round(rate.end_balance, 2) == 88_939.88
+        assert 'schedule' not in vars(rate)
+        assert rate.end_balance == rate.schedule['End Balance'].iloc[-1]
+        assert round(rate.totals['Total Interest'], 2) == round(rate.schedule['Interest'].sum(), 2)
+
+    def test_schedule_end_date_paid_off(self):
+        rate = Rate(start_balance=5000,
+                    annual_interest_rate=0.05,
+                    monthly_payment=1000,
+                    start_date='2019-01-01',
+                    end_date='2019-12-31'
+                    )
+        assert rate.schedule_end_date == rate.schedule['Date'].iloc[-1].date()
+
     def test_schedule_multi_year(self):
         rate = Rate(start_balance=100_000,
                     annual_interest_rate=0.01,
@@ -77,3 +124,139 @@ class TestRate:
                     end_date=datetime(2020,12,31)
                     )
         assert round(rate.schedule['End Balance'].iloc[-1], 2) == 75_345.60
+
+    def test_closed_form_engine(self):
+        rate = Rate(start_balance=100000,
+                    annual_interest_rate=0.01,
+                    monthly_payment=1000,
+                    start_date=datetime(2019, 1, 1),
+                    end_date=datetime(2019, 12, 31),
+                    engine='closed_form'
+                    )
+        assert len(rate.schedule) == 365
+        assert abs(rate.end_balance - 88_939.88) < 0.05
+        # Unrounded daily interest, so only close to the exact engine result
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            Rate(start_balance=100000,
+                 annual_interest_rate=0.01,
+                 monthly_payment=1000,
+                 start_date=datetime(2019, 1, 1),
+                 end_date=datetime(2019, 12, 31),
+                 engine='weekly'
+                 )
+
+
+class TestEngine:
+
+    def test_closed_form_pays_off(self):
+        days, amounts = amortize_arrays(principal=5000,
+                                        interest_rate=0.05,
+                                        monthly_pmt=1000,
+                                        start_date=datetime(2019, 1, 1),
+                                        end_date=datetime(2019, 12, 31),
+                                        engine='closed_form')
+        assert abs(amounts[-1, -1]) < 1e-9
+        assert days[-1] == np.datetime64('2019-06-01')
+        assert amounts[-1, 1] < 1000
+
+    def test_engines_agree_on_payoff_date(self):
+        exact = amortize_arrays(5000, 0.05, 1000, datetime(2019, 1, 1), datetime(2019, 12, 31))
+        closed_form = amortize_arrays(5000, 0.05, 1000, datetime(2019, 1, 1), datetime(2019, 12, 31),
+                                      engine='closed_form')
+        assert exact[0][-1] == closed_form[0][-1]
+        assert abs(exact[1][:, 2].sum() - closed_form[1][:, 2].sum()) < 0.05
+
+    def test_round2_matches_round(self):
+        values = np.array([2.675, 1.005, 0.125, 0.375, -2.675, 0.285, 1.115, 88_939.885, 12.344999])
+        assert round2(values).tolist() == [round(value, 2) for value in values.tolist()]
+
+    def test_batch_matches_arrays(self):
+        days = day_range(datetime(2019, 1, 1), datetime(2019, 12, 31))
+        totals = amortize_batch([100_000, 5_000], 0.01, 1000, payment_mask(days, 1), addl_principal=100)
+        _, amounts = amortize_arrays(100_000, 0.01, 1000, datetime(2019, 1, 1), datetime(2019, 12, 31),
+                                     addl_principal=100)
+        assert totals['End Balance'][0] == amounts[-1, -1]
+        assert totals['Periods'][0] == 365
+        assert totals['Periods'][1] < 365
+
+    def test_pence_end_balance_exact(self):
+        rate = Rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31', engine='pence')
+        assert rate.end_balance == 88_939.88
+        assert rate.schedule['End Balance'].iloc[-1] == 88_939.88
+        assert rate.totals['Total Interest'] == 939.88
+
+    @pytest.mark.parametrize('rounding, expected', [('half_even', [2, 2, 3, -2]), ('half_up', [3, 2, 3, -2]),
+                                                    ('floor', [2, 2, 2, -3]), ('ceiling', [3, 3, 3, -2])])
+    def test_divide_pence(self, rounding, expected):
+        numerators = [5, 9, 11, -9]
+        assert [divide_pence(n, 2 if n == 5 else 4, rounding) for n in numerators] == expected
+        assert divide_pence(np.array([5]), 2, rounding).tolist() == expected[:1]
+
+    @pytest.mark.parametrize('engine', ['pence', 'pence_floor'])
+    def test_pence_engines_agree(self, engine):
+        args = (250_000, 0.03, 1200, datetime(2020, 1, 1), datetime(2045, 1, 1))
+        _, amounts = amortize_arrays(*args, engine=engine)
+        totals = amortize_totals(*args, engine=engine)
+        batch = amortize_batch([250_000, 100_000], 0.03, 1200, payment_mask(day_range(*args[3:]), 1), engine=engine)
+        assert totals['End Balance'] == amounts[-1, -1] == batch['End Balance'][0]
+        assert totals['Total Interest'] == batch['Total Interest'][0]
+        assert totals['Periods'] == len(amounts) == batch['Periods'][0]
+        assert (round2(amounts) == amounts).all()
+
+    def test_monthly_interest(self):
+        days, amounts = amortize_arrays(100_000, 0.012, 1000, datetime(2019, 1, 16), datetime(2019, 12, 31),
+                                        interest_calculated='monthly')
+        assert len(days) == 12
+        assert days[0] == np.datetime64('2019-01-31')
+        # Part first month, without a payment day in it
+        assert amounts[0].tolist() == [100_000, 0, round(100_000 * 0.001 * 16 / 31, 2), 0, 100_051.61]
+        assert amounts[1, 2] == round(100_051.61 * 0.001, 2)
+        assert amounts[1, 1] == 1000
+
+    def test_monthly_interest_rate(self):
+        rate = Rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31',
+                    interest_calculated='monthly')
+        assert len(rate.schedule) == rate.totals['Periods'] == 12
+        assert rate.end_balance == rate.schedule['End Balance'].iloc[-1]
+        assert rate.schedule_end_date == datetime(2019, 12, 31).date()
+
+    def test_monthly_interest_engines(self):
+        with pytest.raises(ValueError):
+            Rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31', engine='pence',
+                 interest_calculated='monthly')
+        with pytest.raises(ValueError):
+            Rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31', interest_calculated='weekly')
+
+    def test_events_without_changes_match(self):
+        args = (123_456.78, 0.0213, 1500, datetime(2019, 3, 17), datetime(2030, 3, 1))
+        _, amounts = amortize_arrays(*args, addl_principal=100, payment_day=17)
+        _, with_events = amortize_arrays(*args, addl_principal=100, payment_day=17,
+                                         events=[{"date": '1990-01-01', "type": "lump_sum", "amount": 1}])
+        assert (amounts == with_events).all()
+
+    @pytest.mark.parametrize('engine', ['exact', 'closed_form'])
+    def test_events(self, engine):
+        events = [{"date": '2019-02-10', "type": "lump_sum", "amount": 5000},
+                  {"date": '2019-03-01', "type": "holiday", "end_date": '2019-04-30'},
+                  {"date": '2019-06-01', "type": "payment", "amount": 1500},
+                  {"date": '2019-09-01', "type": "rate", "rate": 0.05}]
+        rate = Rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31', engine=engine,
+                    events=events)
+        schedule = rate.schedule.set_index('Date')
+        assert schedule.loc['2019-02-10', 'Additional_Payment'] == 5000
+        assert schedule.loc['2019-03-01':'2019-04-30', 'Payment'].sum() == 0
+        assert schedule.loc['2019-07-01', 'Payment'] == 1500
+        assert schedule.loc['2019-09-01', 'Interest'] == pytest.approx(schedule.loc['2019-09-01', 'Begin Balance']
+                                                                       * 0.05 / 365, abs=0.005)
+        assert rate.end_balance == pytest.approx(rate.schedule['End Balance'].iloc[-1])
+        assert rate.totals['Total Additional Payments'] == pytest.approx(5000)
+
+    def test_invalid_events(self):
+        with pytest.raises(ValueError):
+            Rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31',
+                 events=[{"date": '2019-02-10', "type": "lump"}])
+        with pytest.raises(ValueError):
+            Rate(100_000, 0.01, 1000, start_date='2019-01-01', end_date='2019-12-31', engine='pence',
+                 events=[{"date": '2019-02-10', "type": "lump_sum", "amount": 10}])
@@ -0,0 +1,46 @@
+from money_tools import Mortgage
+from money_tools.scenarios import evaluate_grid
+import pandas as pd
+
+
+class TestEvaluateGrid:
+
+    def test_grid_size(self):
+        summary = evaluate_grid(270_000,
+                                rates=[0.0163, 0.0179],
+                                monthly_payments=[1167.02, 1367.02],
+                                addl_principal=[0, 100, 200],
+                                fees=[999, 299],
+                                start_date='2019-07-01',
+                                end_date='2022-06-30',
+                                payment_day=7)
+        assert type(summary) == pd.DataFrame
+        assert len(summary) == 12
+
+    def test_matches_mortgage(self):
+        summary = evaluate_grid(270_000,
+                                rates=[0.0163],
+                                monthly_payments=[1367.02],
+                                fees=[999],
+                                start_date='2019-07-01',
+                                end_date='2022-06-30',
+                                payment_day=7)
+        mortgage = Mortgage(270_000, [{"rate": 0.0163,
+                                       "monthly_payment": 1367.02,
+                                       "start_date": '2019-07-01',
+                                       "term": None,
+                                       "end_date": '2022-06-30',
+                                       "payment_day": 7}])
+        expected = mortgage.payment_summary()
+        assert summary['End Balance'].iloc[0] == expected['End Balance'].iloc[0]
+        assert round(summary['Total Interest'].iloc[0], 2) == round(expected['Total Interest'].iloc[0], 2)
+        assert round(summary['Total Interest And Fees'].iloc[0], 2) == round(expected['Total Interest'].iloc[0] + 999, 2)
+
+    def test_paid_off_scenario(self):
+        summary = evaluate_grid(5_000,
+                                rates=[0.05],
+                                monthly_payments=[1000],
+                                start_date='2019-01-01',
+                                end_date='2019-12-31')
+        assert summary['End Balance'].iloc[0] <= 0
+        assert summary['End Date'].iloc[0] == pd.Timestamp('2019-06-01')
@@ -0,0 +1,86 @@
+from money_tools import Mortgage
+from money_tools.sensitivities import SENSITIVITY_COLUMNS, batch_sensitivities, sensitivities
+import money_tools.sensitivities as sensitivities_module
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def rates_configs():
+    return [{"rate": 0.02, "monthly_payment": 1000, "start_date": '2020-01-01', "term": None,
+             "end_date": '2021-12-31', "payment_day": 1},
+            {"rate": 0.04, "monthly_payment": 1100, "start_date": '2022-01-01', "term": None,
+             "end_date": '2030-12-31', "payment_day": 15}]
+
+
+def rebuilt(mortgage, row):
+    """Mortgage with the row's bump applied by rebuilding the bumped rate"""
+    config = dict(mortgage.rates_configs[row['Rate Index']])
+    config[row['Input']] += row['Bump']
+    return mortgage.with_rate(row['Rate Index'], config)
+
+
+class TestSensitivities:
+
+    @pytest.mark.parametrize('engine', ['exact', 'pence'])
+    def test_matches_rebuilt_mortgages(self, rates_configs, engine):
+        mortgage = Mortgage(150_000, rates_configs, engine=engine)
+        table = mortgage.sensitivities()
+        assert list(table.columns) == SENSITIVITY_COLUMNS
+        assert len(table) == 2 * 2 * 2
+        for _, row in table.iterrows():
+            bumped = rebuilt(mortgage, row)
+            base_fix_end = mortgage.rates[row['Rate Index']].end_balance
+            assert row['Total Interest'] == bumped.totals['Total Interest']
+            assert row['End Balance'] == bumped.end_balance
+            assert row['Fix End Balance'] == bumped.rates[row['Rate Index']].end_balance
+            assert row['Delta Total Interest'] == pytest.approx(bumped.totals['Total Interest']
+                                                                - mortgage.totals['Total Interest'])
+            assert row['Delta Fix End Balance'] == pytest.approx(row['Fix End Balance'] - base_fix_end)
+
+    def test_closed_form(self, rates_configs):
+        mortgage = Mortgage(150_000, rates_configs, engine='closed_form')
+        for _, row in mortgage.sensitivities(bumps={'rate': [0.0025]}).iterrows():
+            assert row['End Balance'] == pytest.approx(rebuilt(mortgage, row).end_balance)
+
+    def test_events_rebuild(self, rates_configs):
+        mortgage = Mortgage(150_000, rates_configs,
+                            events=[{"date": '2020-05-01', "type": "lump_sum", "amount": 1000}])
+        for _, row in mortgage.sensitivities(bumps={'monthly_payment': [50]}).iterrows():
+            assert row['End Balance'] == rebuilt(mortgage, row).end_balance
+
+    def test_analytic(self, rates_configs):
+        table = sensitivities(Mortgage(150_000, rates_configs), analytic=True)
+        for col in ['Total Interest', 'Fix End Balance', 'End Balance']:
+            np.testing.assert_allclose(table['Analytic Delta ' + col], table['Delta ' + col], rtol=0.02)
+
+    def test_analytic_paid_off(self, rates_configs):
+        table = sensitivities(Mortgage(10_000, rates_configs), bumps={'rate': [0.0025]}, analytic=True)
+        assert table['Analytic Delta End Balance'].isna().all()
+
+    def test_invalid_bumps(self, rates_configs):
+        with pytest.raises(ValueError):
+            sensitivities(Mortgage(150_000, rates_configs), bumps={'term': [1]})
+
+    def test_batch(self, rates_configs):
+        mortgages = [Mortgage(150_000, rates_configs), Mortgage(100_000, rates_configs[1:])]
+        table = batch_sensitivities(mortgages, bumps={'rate': [-0.0025, 0.0025]})
+        assert list(table['Mortgage']) == [0, 0, 0, 0, 1, 1]
+        assert table.iloc[4:, 1:].reset_index(drop=True).equals(
+            sensitivities(mortgages[1], bumps={'rate': [-0.0025, 0.0025]}))
+
+    def test_batch_stacks_shared_windows(self, rates_configs, monkeypatch):
+        mortgages = [Mortgage(balance, [dict(rates_configs[0], rate=rate), rates_configs[1]])
+                     for balance, rate in [(150_000, 0.02), (90_000, 0.03), (20_000, 0.05)]]
+        expected = [sensitivities(mortgage) for mortgage in mortgages]
+
+        calls = []
+        amortize_batch = sensitivities_module.amortize_batch
+        monkeypatch.setattr(sensitivities_module, 'amortize_batch', lambda *args, **kwargs: calls.append(len(args[0]))
+                            or amortize_batch(*args, **kwargs))
+        table = batch_sensitivities(mortgages)
+        # One run per rate, over every mortgage's variants still running at that rate
+        assert calls == [3 * 5, 3 * 9]
+        for position, single in enumerate(expected):
+            rows = table[table['Mortgage'] == position].drop(columns='Mortgage').reset_index(drop=True)
+            assert rows.equals(single)
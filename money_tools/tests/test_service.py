@@ -0,0 +1,114 @@
+from money_tools import Mortgage
+from money_tools.service import QUOTE_FIELDS, VECTORIZE_MIN, QuoteServer, quote_batch
+import asyncio
+import json
+import pandas as pd
+import pytest
+
+
+def request(monthly_payment, request_id=None, engine=None):
+    rates_configs = [{"rate": 0.03, "monthly_payment": monthly_payment, "start_date": '2024-01-01', "term": None,
+                      "end_date": '2025-12-31', "payment_day": 1},
+                     {"rate": 0.05, "monthly_payment": monthly_payment, "start_date": '2026-01-01', "term": None,
+                      "end_date": '2029-12-31', "payment_day": 15}]
+    request = {"id": request_id, "start_balance": 100_000, "rates_configs": rates_configs}
+    if engine is not None:
+        request['engine'] = engine
+    return request
+
+
+class TestQuoteBatch:
+
+    def test_matches_mortgage(self):
+        (quote, error), = quote_batch([request(1000, engine='pence')])
+        mortgage = Mortgage(100_000, request(1000)['rates_configs'], engine='pence')
+        assert error is None
+        assert list(quote) == QUOTE_FIELDS
+        assert quote['End Balance'] == mortgage.end_balance
+        assert quote['Total Interest'] == mortgage.totals['Total Interest']
+        assert quote['End Date'] == '2029-12-31'
+
+    def test_vectorized_matches_single(self):
+        # The same request is quoted identically above and below the vectorized batch size
+        requests = [request(1000 + 10 * i) for i in range(VECTORIZE_MIN)] + [request(50_000)]
+        batch = quote_batch(requests)
+        for (quote, _), single in zip(batch, requests):
+            (expected, _), = quote_batch([single])
+            assert quote == expected
+        assert batch[-1][0]['End Date'] < '2029-12-31'
+
+    def test_duplicates_and_errors(self):
+        requests = [request(1000, 'a'), request(1000, 'b'), {"start_balance": 1}, dict(request(1000), rates_configs=[])]
+        results = quote_batch(requests)
+        assert results[0] == results[1]
+        assert 'missing' in results[2][1]
+        assert results[3][0] is None and 'ValueError' in results[3][1]
+
+
+class TestQuoteServer:
+
+    def test_coalesces_and_batches(self):
+        async def scenario():
+            server = QuoteServer(batch_window=0.05)
+            results = await asyncio.gather(*(server.quote(request(1000 + 100 * (i % 3))) for i in range(12)))
+            return server, results
+
+        server, results = asyncio.run(scenario())
+        assert server.stats() == {'requests': 12, 'coalesced': 9, 'batches': 1}
+        assert results[0] == results[3] and results[0] != results[1]
+        assert results[0] == quote_batch([request(1000)])[0]
+
+    def test_socket(self):
+        async def scenario():
+            server = QuoteServer(batch_window=0.01)
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            lines = [json.dumps(request(1000, i)) for i in range(5)] + ['not json']
+            writer.write(('\n'.join(lines) + '\n').encode())
+            writer.write_eof()
+            responses = [json.loads(line) for line in (await reader.read()).splitlines()]
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return server, responses
+
+        server, responses = asyncio.run(scenario())
+        assert sorted(response['id'] for response in responses if response['id'] is not None) == list(range(5))
+        assert sum(response['error'] is not None for response in responses) == 1
+        assert server.stats()['coalesced'] == 4
+
+    def test_long_lines(self):
+        # A 600 segment mortgage, one rate a month for 50 years, is past asyncio's default 64 KiB line limit
+        months = pd.date_range('2024-01-01', periods=601, freq='MS')
+        long_request = dict(request(1000, 'long'), rates_configs=[
+            {"rate": 0.03 + i * 1e-5, "monthly_payment": 1000, "start_date": str(start.date()), "term": None,
+             "end_date": str((end - pd.Timedelta(days=1)).date()), "payment_day": 1}
+            for i, (start, end) in enumerate(zip(months[:-1], months[1:]))])
+
+        async def scenario(max_line):
+            server = QuoteServer(batch_window=0.01, max_line=max_line)
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            lines = [json.dumps(long_request), json.dumps(request(1000, 'short'))]
+            writer.write(('\n'.join(lines) + '\n').encode())
+            writer.write_eof()
+            responses = {response['id']: response for response in map(json.loads, (await reader.read()).splitlines())}
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return responses
+
+        assert len(json.dumps(long_request)) > 2 ** 16
+        responses = asyncio.run(scenario(2 ** 23))
+        assert responses['long']['error'] is None and responses['short']['error'] is None
+
+        # Past the limit the long line is answered with an error, and the connection carries on
+        responses = asyncio.run(scenario(2 ** 12))
+        assert responses[None]['quote'] is None and 'longer than 4096 bytes' in responses[None]['error']
+        assert responses['short']['error'] is None
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            QuoteServer(max_batch=0)
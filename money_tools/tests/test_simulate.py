@@ -0,0 +1,69 @@
+from money_tools import Mortgage
+from money_tools.simulate import MeanReverting, simulate
+from datetime import date, timedelta
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def dummy_rate():
+    rate_config = {
+            "rate": 0.01,
+            "monthly_payment": 1000.00,
+            "start_date": '2019-01-15',
+            "term": None,
+            "end_date": '2019-12-31',
+            "payment_day": 15
+        }
+    return rate_config
+
+
+def monthly_rates_configs(rates, start_date, end_date, monthly_payment, payment_day):
+    """One rate config per calendar month, from start_date to end_date"""
+    configs = []
+    for rate in rates:
+        next_month = (start_date.replace(day=1) + timedelta(days=32)).replace(day=1)
+        configs.append({"rate": rate, "monthly_payment": monthly_payment, "start_date": start_date, "term": None,
+                        "end_date": min(next_month - timedelta(days=1), end_date), "payment_day": payment_day})
+        start_date = next_month
+    return configs
+
+
+class TestSimulate:
+
+    def test_paths_match_mortgages(self, dummy_rate):
+        mortgage = Mortgage(100_000, [dummy_rate])
+        result = simulate(mortgage, end_date='2021-06-10', n_paths=20, seed=0)
+        assert result['rate_paths'].shape == (20, 18)
+
+        for path in (0, 13):
+            configs = monthly_rates_configs(result['rate_paths'][path], date(2020, 1, 1), date(2021, 6, 10),
+                                            1000, 15)
+            expected = Mortgage(100_000, [dummy_rate] + configs)
+            assert result['totals']['End Balance'][path] == expected.end_balance
+            assert result['totals']['Periods'][path] == expected.totals['Periods']
+            assert result['totals']['Total Interest'][path] == pytest.approx(expected.totals['Total Interest'])
+
+    def test_paid_off(self, dummy_rate):
+        mortgage = Mortgage(20_000, [dummy_rate])
+        result = simulate(mortgage, term=5, rate_paths=np.full((3, 61), 0.05))
+        assert (result['totals']['End Balance'] <= 0).all()
+        assert (result['schedules_monthly'][50]['Payment'].iloc[-12:] == 0).all()
+
+    def test_seed_and_workers(self, dummy_rate):
+        mortgage = Mortgage(100_000, [dummy_rate])
+        model = MeanReverting(long_run_rate=0.05, volatility=0.02)
+        first = simulate(mortgage, term=2, rate_paths=model, n_paths=50, seed=1)
+        second = simulate(mortgage, term=2, rate_paths=model, n_paths=50, seed=1, workers=2)
+        np.testing.assert_array_equal(first['totals']['End Balance'], second['totals']['End Balance'])
+
+    def test_percentiles(self, dummy_rate):
+        mortgage = Mortgage(100_000, [dummy_rate])
+        schedules = simulate(mortgage, term=2, n_paths=200, seed=2)['schedules_monthly']
+        assert list(schedules) == [5, 50, 95]
+        assert (schedules[5]['Interest'] <= schedules[95]['Interest']).all()
+        assert len(schedules[50]) == 25
+
+    def test_rate_paths_shape(self, dummy_rate):
+        with pytest.raises(ValueError):
+            simulate(Mortgage(100_000, [dummy_rate]), term=1, rate_paths=np.full((10, 5), 0.03))
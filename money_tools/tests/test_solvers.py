@@ -0,0 +1,45 @@
+from money_tools import Rate
+from money_tools.engine import amortize_totals
+from money_tools.solvers import solve_monthly_payment, solve_overpayment_for_break_even, solve_payoff_date
+from datetime import date
+import pytest
+
+
+class TestSolvers:
+
+    def test_monthly_payment_clears_loan(self):
+        payment = solve_monthly_payment(0, 100_000, 0.03, start_date='2020-01-01', term=10)
+        cleared = Rate(100_000, 0.03, payment, start_date='2020-01-01', term=10)
+        short = Rate(100_000, 0.03, payment - 0.01, start_date='2020-01-01', term=10)
+        assert cleared.end_balance <= 0
+        assert short.end_balance > 0
+
+    def test_monthly_payment_target_balance(self):
+        payment = solve_monthly_payment(50_000, 100_000, 0.03, start_date='2020-01-01', term=5, payment_day=7)
+        totals = amortize_totals(100_000, 0.03, payment, date(2020, 1, 1), date(2025, 1, 1), payment_day=7)
+        assert round(totals['End Balance'], 2) <= 50_000
+        totals = amortize_totals(100_000, 0.03, payment - 0.01, date(2020, 1, 1), date(2025, 1, 1), payment_day=7)
+        assert round(totals['End Balance'], 2) > 50_000
+
+    def test_payoff_date(self):
+        payoff = solve_payoff_date(100_000, 0.01, 1000, start_date='2019-01-01')
+        rate = Rate(100_000, 0.01, 1000, start_date='2019-01-01', term=20)
+        assert payoff == rate.schedule_end_date
+        assert payoff < date(2039, 1, 1)
+
+    def test_payoff_date_never(self):
+        assert solve_payoff_date(100_000, 0.05, 100, start_date='2019-01-01', max_term=5) is None
+
+    def test_break_even_overpayment(self):
+        kwargs = dict(start_date='2019-07-01', end_date='2022-06-30', payment_day=7)
+        overpayment = solve_overpayment_for_break_even(999, 270_000, 0.0163, 1167.02, **kwargs)
+
+        def interest(addl):
+            return amortize_totals(270_000, 0.0163, 1167.02, date(2019, 7, 1), date(2022, 6, 30),
+                                   addl_principal=addl, payment_day=7)['Total Interest']
+        assert interest(0) - interest(overpayment) >= 999
+        assert interest(0) - interest(overpayment - 0.01) < 999
+
+    def test_break_even_unreachable(self):
+        with pytest.raises(ValueError):
+            solve_overpayment_for_break_even(10_000, 1_000, 0.01, 100, start_date='2019-01-01', term=1)
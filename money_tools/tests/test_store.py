@@ -0,0 +1,59 @@
+from money_tools import Mortgage
+from money_tools.store import ScheduleStore
+import numpy as np
+import os
+import pytest
+
+
+@pytest.fixture
+def dummy_rate():
+    rate_config = {
+            "rate": 0.01,
+            "monthly_payment": 1000.00,
+            "start_date": '2019-01-01',
+            "term": None,
+            "end_date": '2019-12-31',
+            "payment_day": 1
+        }
+    return rate_config
+
+
+class TestScheduleStore:
+
+    def test_mortgage_round_trip(self, tmp_path, dummy_rate):
+        store = ScheduleStore(tmp_path)
+        first = Mortgage(100_000, [dummy_rate], rate_cache=None, schedule_store=store)
+        expected = first.schedule
+        assert len(store.entries()) == 1
+
+        second = Mortgage(100_000, [dummy_rate], rate_cache=None, schedule_store=store)
+        days, periods, amounts = second.schedule_arrays
+        assert isinstance(amounts, np.memmap)
+        for stored, computed in zip(second.schedule_arrays, first.schedule_arrays):
+            assert stored.dtype == computed.dtype
+        assert days.dtype == np.dtype('datetime64[D]')
+        assert second.schedule.equals(expected)
+        assert round(second.schedule_monthly['End Balance'].iloc[-1], 2) == 88_939.88
+
+    def test_key_depends_on_inputs(self):
+        assert ScheduleStore.key([100_000, 0.01]) == ScheduleStore.key([100_000, 0.01])
+        assert ScheduleStore.key([100_000, 0.01]) != ScheduleStore.key([100_000, 0.02])
+
+    def test_put_existing_key(self, tmp_path):
+        store = ScheduleStore(tmp_path)
+        arrays = (np.arange('2019-01-01', '2019-01-11', dtype='datetime64[D]'),
+                  np.arange(1, 11, dtype=np.int32),
+                  np.zeros((10, 5)))
+        store.put('abc', *arrays)
+        store.put('abc', *arrays)
+        assert [key for _, _, key in store.entries()] == ['abc']
+
+    def test_eviction(self, tmp_path):
+        store = ScheduleStore(tmp_path)
+        for i, key in enumerate(['old', 'new']):
+            store.put(key, np.arange('2019-01-01', '2020-01-01', dtype='datetime64[D]'),
+                      np.arange(1, 366, dtype=np.int32), np.full((365, 5), i, dtype=np.float64))
+            os.utime(tmp_path / key, (i, i))
+        store.evict(store.size() - 1)
+        assert store.get('old') is None
+        assert store.get('new') is not None
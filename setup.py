@@ -7,10 +7,13 @@ with open('requirements.txt') as f:
 setup(
     name='money_tools',
     version='0.1dev',
-    packages=find_packages(exclude=["*.tests"]),
+    packages=find_packages(exclude=["*.tests", "benchmarks", "benchmarks.*"]),
     license='asdsadf',
     long_description='Money Tools',
     install_requires=REQUIREMENTS,
+    entry_points={
+        'console_scripts': ['money-tools=money_tools.cli:main'],
+    },
     setup_requires=["pytest-runner"],
     tests_require=["pytest"]
 )